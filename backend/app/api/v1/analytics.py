@@ -0,0 +1,47 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.services.analytics import lake_analytics
+
+router = APIRouter(prefix="/api/v1/analytics", tags=["analytics"])
+
+
+async def _run(fn, *args, **kwargs):
+    """在线程中执行 numpy 计算，缺少 pyarrow / numpy 时返回 503"""
+    try:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    except RuntimeError as e:
+        print("ERROR: lake analytics unavailable:", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"分析服务不可用：{e}",
+        )
+
+
+def _check_bins(bins: int) -> None:
+    if not 1 <= bins <= 200:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="bins 取值范围为 1 ~ 200")
+
+
+@router.get("/gas-fees")
+async def get_gas_fee_distribution(bins: int = 20, transaction_type: Optional[str] = None):
+    """链上交易 Gas 费分布（汇总、p50/p90/p95/p99 与直方图），数据来自列式数据湖，watermark 为已导出的区块号"""
+    _check_bins(bins)
+    return await _run(lake_analytics.gas_fees, bins, transaction_type)
+
+
+@router.get("/donation-sizes")
+async def get_donation_size_distribution(bins: int = 20, project_id: Optional[int] = None, log: bool = True):
+    """已确认捐赠金额分布（默认对数分箱），可按项目筛选"""
+    _check_bins(bins)
+    return await _run(lake_analytics.donation_sizes, bins, project_id, log)
+
+
+@router.get("/projects/{project_id}/funding-curve")
+async def get_project_funding_curve(project_id: int, window: int = 7):
+    """项目募资曲线：按天金额 / 笔数、累计金额与 window 天滑动求和"""
+    if not 1 <= window <= 365:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="window 取值范围为 1 ~ 365")
+    return await _run(lake_analytics.funding_curve, project_id, window)
@@ -1,9 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
+from app.core.pagination import encode_cursor, decode_cursor, keyset_before
+from app.core.payload_codec import payload_text
 from app.db.base import get_session as get_db
 from app.schemas.block_chain import MiningResult, TransactionPoolStatus
 from app.services.mining import MiningService
+from app.services.explorer import ExplorerService, archive_store, serialize_transaction
+from app.services.donation_trend import CN_TZ, to_cn_naive
+from app.services.chain_state import chain_tip
+from app.services.address_ledger import AddressLedgerService, serialize_ledger_entry
+from app.services.search import explorer_search
 
 router = APIRouter(prefix="/api/v1/blockchain", tags=["auth"])
 
@@ -63,26 +73,41 @@ async def get_transaction_pool_status(
 async def get_transaction_pool_list(
         page: int = 1,
         limit: int = 10,
+        cursor: Optional[str] = None,
         db: AsyncSession = Depends(get_db)
 ):
     """
     获取交易池明细列表（分页）
-    返回结构：{"items": [...], "total": int}
+    返回结构：{"items": [...], "total": int, "next_cursor": str | None}
+
+    - 推荐使用 cursor（上一页返回的 next_cursor）做 keyset 分页，按 (created_at, id) 倒序；
+    - page 仅为兼容旧前端保留（OFFSET 分页，深分页代价随页码线性增长）。
     """
     from app.db.models.block_chain import TransactionPool
 
-    # 统计总数
-    stmt_count = select(func.count()).select_from(TransactionPool)
-    result_count = await db.execute(stmt_count)
-    total = result_count.scalar() or 0
+    limit = min(max(limit, 1), 100)
+
+    # 总数取自链头状态，不再 COUNT(*)
+    tip = await chain_tip.snapshot(db)
+    total = tip["pending_pool_size"]
 
-    # 分页查询
     stmt_list = (
         select(TransactionPool)
-        .order_by(TransactionPool.created_at.desc())
-        .offset((page - 1) * limit)
+        .order_by(TransactionPool.created_at.desc(), TransactionPool.id.desc())
         .limit(limit)
     )
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor, (datetime, int))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的分页游标")
+        stmt_list = stmt_list.where(keyset_before([
+            (TransactionPool.created_at, created_at),
+            (TransactionPool.id, last_id),
+        ]))
+    elif page > 1:
+        stmt_list = stmt_list.offset((page - 1) * limit)
+
     result_list = await db.execute(stmt_list)
     items = result_list.scalars().all()
 
@@ -96,14 +121,19 @@ async def get_transaction_pool_list(
             "to_address": tx.to_address,
             "amount": tx.amount,
             "gas_fee": tx.gas_fee,
-            "data": tx.data,
+            "data": payload_text(tx.data),
             "priority_score": tx.priority_score,
             "created_at": tx.created_at.isoformat() if tx.created_at else None,
         })
 
+    next_cursor = None
+    if len(items) == limit:
+        next_cursor = encode_cursor([items[-1].created_at, items[-1].id])
+
     return {
         "items": serialized_items,
         "total": total,
+        "next_cursor": next_cursor,
     }
 
 
@@ -111,32 +141,16 @@ async def get_transaction_pool_list(
 async def get_mining_statistics(
         db: AsyncSession = Depends(get_db)
 ):
-    """获取挖矿统计信息（异步版，直接基于区块和交易表统计）"""
-    from app.db.models.block_chain import Block, Transaction
-
-    # 区块总数
-    stmt_block_count = select(func.count()).select_from(Block)
-    result_block_count = await db.execute(stmt_block_count)
-    total_blocks = result_block_count.scalar() or 0
-
-    # 交易总数
-    stmt_tx_count = select(func.count()).select_from(Transaction)
-    result_tx_count = await db.execute(stmt_tx_count)
-    total_transactions = result_tx_count.scalar() or 0
-
-    # 最新区块信息
-    stmt_last_block = select(Block).order_by(Block.block_number.desc()).limit(1)
-    result_last_block = await db.execute(stmt_last_block)
-    last_block = result_last_block.scalars().first()
-
-    latest_block_number = last_block.block_number if last_block else None
-    latest_block_hash = last_block.block_hash if last_block else None
+    """获取挖矿统计信息（读取进程内链头状态，不再逐次统计区块和交易表）"""
+    tip = await chain_tip.snapshot(db)
+    latest_block = tip["latest_block"]
 
     return {
-        "total_blocks": total_blocks,
-        "total_transactions": total_transactions,
-        "latest_block_number": latest_block_number,
-        "latest_block_hash": latest_block_hash,
+        "total_blocks": tip["total_blocks"],
+        "total_transactions": tip["total_transactions"],
+        "latest_block_number": latest_block["block_number"] if latest_block else None,
+        "latest_block_hash": latest_block["block_hash"] if latest_block else None,
+        "difficulty": tip["difficulty"],
     }
 
 
@@ -152,55 +166,21 @@ async def get_chain_info(
     - pending_pool_size: 交易池中待处理交易数量
     - latest_block: 最新区块的关键信息
     - chain_valid: 简单链校验结果（当前版本始终返回 True）
+
+    数据来自进程内链头状态（启动时预热，由交易池 / 挖矿路径增量维护），
+    仪表盘轮询不访问数据库。
     """
-    from app.db.models.block_chain import Block, Transaction, TransactionPool
-
-    # 区块总数
-    stmt_block_count = select(func.count()).select_from(Block)
-    result_block_count = await db.execute(stmt_block_count)
-    total_blocks = result_block_count.scalar() or 0
-
-    # 交易总数
-    stmt_tx_count = select(func.count()).select_from(Transaction)
-    result_tx_count = await db.execute(stmt_tx_count)
-    total_transactions = result_tx_count.scalar() or 0
-
-    # 交易池待处理数量
-    stmt_pool_count = select(func.count()).select_from(TransactionPool)
-    result_pool_count = await db.execute(stmt_pool_count)
-    pending_pool_size = result_pool_count.scalar() or 0
-
-    # 最新区块信息
-    stmt_last_block = select(Block).order_by(Block.block_number.desc()).limit(1)
-    result_last_block = await db.execute(stmt_last_block)
-    last_block = result_last_block.scalars().first()
-
-    latest_block = None
-    if last_block:
-        latest_block = {
-            "block_number": last_block.block_number,
-            "block_hash": last_block.block_hash,
-            "previous_hash": last_block.previous_hash,
-            "transactions_count": last_block.transaction_count,
-            "timestamp": last_block.timestamp.isoformat() if last_block.timestamp else None,
-            "miner_address": last_block.miner_address,
-        }
-
-    # 当前高度：如果有创世块（通常 block_number 从 0 开始），高度为 total_blocks - 1，否则为 0
-    if total_blocks > 0:
-        height = total_blocks - 1
-    else:
-        height = 0
+    tip = await chain_tip.snapshot(db)
 
     # 当前版本不做复杂链校验，先返回 True，后续可扩展为逐块校验 previous_hash / merkle_root 等
     chain_valid = True
 
     return {
-        "total_blocks": total_blocks,
-        "height": height,
-        "total_transactions": total_transactions,
-        "pending_pool_size": pending_pool_size,
-        "latest_block": latest_block,
+        "total_blocks": tip["total_blocks"],
+        "height": tip["height"],
+        "total_transactions": tip["total_transactions"],
+        "pending_pool_size": tip["pending_pool_size"],
+        "latest_block": tip["latest_block"],
         "chain_valid": chain_valid,
     }
 
@@ -232,23 +212,37 @@ async def start_auto_mining(
 async def get_blocks(
         page: int = 1,
         limit: int = 10,
+        cursor: Optional[str] = None,
         db: AsyncSession = Depends(get_db)
 ):
-    """分页获取链上区块"""
+    """分页获取链上区块
+
+    - 推荐使用 cursor（上一页返回的 next_cursor）做 keyset 分页，按 block_number 倒序；
+    - page 仅为兼容旧前端保留（OFFSET 分页）。
+    """
     from app.db.models.block_chain import Block
 
-    # 统计总数
-    stmt_count = select(func.count()).select_from(Block)
-    result_count = await db.execute(stmt_count)
-    total = result_count.scalar() or 0
+    limit = min(max(limit, 1), 100)
+
+    # 总数取自链头状态，不再 COUNT(*)
+    tip = await chain_tip.snapshot(db)
+    total = tip["total_blocks"]
 
-    # 分页查询
     stmt_list = (
         select(Block)
         .order_by(Block.block_number.desc())
-        .offset((page - 1) * limit)
         .limit(limit)
     )
+    last_block_number = None
+    if cursor:
+        try:
+            (last_block_number,) = decode_cursor(cursor, (int,))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的分页游标")
+        stmt_list = stmt_list.where(Block.block_number < last_block_number)
+    elif page > 1:
+        stmt_list = stmt_list.offset((page - 1) * limit)
+
     result_list = await db.execute(stmt_list)
     items = result_list.scalars().all()
 
@@ -264,7 +258,189 @@ async def get_blocks(
             "miner_address": b.miner_address
         })
 
+    # 热表不足一页时，从归档段继续向更早的区块取
+    if len(serialized) < limit and archive_store.archived_end >= 0:
+        skip = 0
+        if serialized:
+            below = serialized[-1]["block_number"]
+        elif last_block_number is not None:
+            below = last_block_number
+        else:
+            # OFFSET 分页越过了全部热数据：按热表行数换算为归档中的跳过数
+            below = archive_store.archived_end + 1
+            skip = max(0, (page - 1) * limit - (total - archive_store.totals()[0]))
+        for header in ExplorerService.archived_headers(below, limit - len(serialized), skip):
+            serialized.append({
+                key: header[key]
+                for key in ("block_number", "block_hash", "previous_hash",
+                            "transactions_count", "timestamp", "miner_address")
+            })
+
+    next_cursor = None
+    if len(serialized) == limit:
+        next_cursor = encode_cursor([serialized[-1]["block_number"]])
+
     return {
         "items": serialized,
-        "total": total
-    }
\ No newline at end of file
+        "total": total,
+        "next_cursor": next_cursor,
+    }
+
+@router.get("/blocks/{block_number}")
+async def get_block_detail(
+        block_number: int,
+        page: int = 1,
+        limit: int = 20,
+        db: AsyncSession = Depends(get_db)
+):
+    """获取区块详情：区块头 + 分页交易列表（已打包区块走 LRU 缓存）"""
+    if page < 1:
+        page = 1
+    limit = min(max(limit, 1), 100)
+
+    service = ExplorerService(db)
+    detail = await service.get_block_detail(block_number, page, limit)
+
+    if not detail:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="区块不存在",
+        )
+
+    return detail
+
+
+@router.get("/transactions")
+async def list_transactions(
+        transaction_type: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        from_block: Optional[int] = None,
+        to_block: Optional[int] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_db)
+):
+    """筛选链上交易（按区块号、交易 id 倒序）
+
+    - transaction_type: donation / project_creation / ...
+    - start / end: 确认时间窗口 [start, end)，只给 start 时 end 默认为当前时间
+    - min_amount / max_amount: 金额闭区间；from_block / to_block: 区块号闭区间
+    - cursor: 上一页返回的 next_cursor（keyset 分页）
+
+    返回结构：{"items": [...], "next_cursor": str | None}，items 中的 data 已解析为对象
+    """
+    limit = min(max(limit, 1), 100)
+
+    if start is not None or end is not None:
+        end = to_cn_naive(end or datetime.now(CN_TZ))
+        start = to_cn_naive(start) if start else None
+        if start is not None and start >= end:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="开始时间必须早于结束时间")
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="最小金额不能大于最大金额")
+    if from_block is not None and to_block is not None and from_block > to_block:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="起始区块号不能大于结束区块号")
+
+    if from_block is None and to_block is None:
+        # 不带区块范围时以链头为上界，查询按区块号索引定位而不是从头扫描
+        latest_block = (await chain_tip.snapshot(db))["latest_block"]
+        to_block = latest_block["block_number"] if latest_block else 0
+
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, (int, int))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的分页游标")
+
+    transactions = await ExplorerService(db).list_transactions(
+        limit,
+        transaction_type=transaction_type,
+        start=start,
+        end=end,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        from_block=from_block,
+        to_block=to_block,
+        after=after,
+    )
+    next_cursor = None
+    if len(transactions) == limit:
+        next_cursor = encode_cursor([transactions[-1].block_number, transactions[-1].id])
+
+    return {
+        "items": [serialize_transaction(tx) for tx in transactions],
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get("/search")
+async def search_explorer(
+        q: str,
+        limit: int = 20,
+        db: AsyncSession = Depends(get_db)
+):
+    """按前缀统一搜索区块哈希 / 交易哈希 / 地址 / 项目（上链地址、上链交易哈希），纯数字同时匹配区块高度
+
+    返回结构：{"query", "items": [{"type", "exact", "key", ...}], "total"}
+    - 完全匹配排在最前，其余按剩余长度排序；哈希 / 地址大小写不敏感，可带 0x 前缀
+    - 查询读取进程内前缀索引，不访问数据库（仅按间隔追加其他 worker 挖出的区块）
+    """
+    q = (q or "").strip()
+    if not q:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="搜索关键字不能为空")
+    limit = min(max(limit, 1), 100)
+
+    await explorer_search.ensure_fresh(db)
+    items = explorer_search.search(q, limit)
+    return {"query": q, "items": items, "total": len(items)}
+
+
+@router.get("/addresses/{address}")
+async def get_address_ledger(
+        address: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        db: AsyncSession = Depends(get_db)
+):
+    """获取地址余额与流水（按区块 / 交易顺序倒序）
+
+    返回结构：{"address", "balance", "total_in", "total_out", "tx_count",
+              "last_block_number", "items": [...], "next_cursor": str | None}
+    - 余额读取 address_balances 单行；流水使用 cursor（上一页返回的 next_cursor）做 keyset 分页
+    """
+    limit = min(max(limit, 1), 100)
+
+    before_id = None
+    if cursor:
+        try:
+            (before_id,) = decode_cursor(cursor, (int,))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的分页游标")
+
+    service = AddressLedgerService(db)
+    balance = await service.get_balance(address)
+    if not balance:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="地址不存在或没有链上交易",
+        )
+
+    entries = await service.get_entries(address, limit, before_id)
+    next_cursor = None
+    if len(entries) == limit:
+        next_cursor = encode_cursor([entries[-1].id])
+
+    return {
+        "address": balance.address,
+        "balance": balance.balance,
+        "total_in": balance.total_in,
+        "total_out": balance.total_out,
+        "tx_count": balance.tx_count,
+        "last_block_number": balance.last_block_number,
+        "items": [serialize_ledger_entry(entry) for entry in entries],
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from app.db.base import async_session
+from app.services.dashboard import DashboardService
+
+router = APIRouter(prefix="/api/v1/dashboard", tags=["dashboard"])
+
+
+@router.get("")
+@router.get("/")
+async def get_dashboard():
+    """驾驶舱聚合数据（链头、捐赠统计、项目状态、交易池、最新区块 / 捐赠、项目排行）
+
+    各分区并发获取，timings_ms 返回每个分区及整体耗时，errors 返回失败的分区。
+    """
+    return await DashboardService(async_session).build()
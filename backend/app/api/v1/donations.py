@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
+from datetime import date, datetime
 
+from app.core.pagination import encode_cursor, decode_cursor, keyset_before
 from app.db.base import get_session as get_db
 from app.schemas.donation import DonationCreate, DonationResponse, MyDonationItem
 from app.services.donation import DonationService
+from app.services.donor_sketch import DonorSketchService
+from app.services.donation_feed import donation_feed, feed_item
+from app.services.donation_trend import DonationTrendService, GRANULARITIES, CN_TZ, to_cn_naive
 from app.api.deps import get_current_user
 from app.db.models.user import User
 from app.db.models.donation import Donation
@@ -13,6 +18,25 @@ from app.db.models.projects import Project
 
 router = APIRouter(prefix="/api/v1/donations", tags=["donations"])
 
+# keyset 分页时下一页游标通过响应头返回，保持列表响应体结构不变
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _apply_page(stmt, page: int, limit: int, cursor: Optional[str]):
+    """按 (created_at, id) 倒序分页：有游标时走 keyset，否则兼容 OFFSET"""
+    if cursor:
+        try:
+            created_at, last_id = decode_cursor(cursor, (datetime, int))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的分页游标")
+        return stmt.where(keyset_before([
+            (Donation.created_at, created_at),
+            (Donation.id, last_id),
+        ]))
+    if page > 1:
+        return stmt.offset((page - 1) * limit)
+    return stmt
+
 
 @router.post("/", response_model=DonationResponse, status_code=status.HTTP_201_CREATED)
 async def create_donation(
@@ -34,8 +58,10 @@ async def create_donation(
 
 @router.get("/my", response_model=List[MyDonationItem])
 async def list_my_donations(
+    response: Response,
     page: int = 1,
     limit: int = 10,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -44,15 +70,14 @@ async def list_my_donations(
     - 仅返回当前用户数据
     - 关联 projects 表返回 project_title
     - 不返回 transaction_hash
+    - 推荐使用 cursor 做 keyset 分页：下一页游标在响应头 X-Next-Cursor 中返回；
+      page 仅为兼容保留（OFFSET 分页）
     """
     if page < 1:
         page = 1
     if limit < 1:
         limit = 10
 
-    offset = (page - 1) * limit
-    print(current_user.id)
-
     stmt = (
         select(
             Donation.id,
@@ -66,13 +91,15 @@ async def list_my_donations(
         )
         .join(Project, Donation.project_id == Project.id)
         .where(Donation.donor_id == current_user.id)
-        .order_by(Donation.created_at.desc())
-        .offset(offset)
+        .order_by(Donation.created_at.desc(), Donation.id.desc())
         .limit(limit)
     )
+    stmt = _apply_page(stmt, page, limit, cursor)
 
     result = await db.execute(stmt)
     rows = result.all()
+    if len(rows) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([rows[-1].created_at, rows[-1].id])
 
     items: List[MyDonationItem] = []
     for (did, pid, ptitle, amount, status_, gas_fee, created_at, confirmed_at) in rows:
@@ -94,14 +121,17 @@ async def list_my_donations(
 
 @router.get("/")
 async def list_latest_donations(
+    response: Response,
     page: int = 1,
     limit: int = 5,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
     """获取最新的捐赠记录（按时间倒序）
 
     - 默认返回最近 5 条
-    - 支持通过 page / limit 进行简单分页
+    - 推荐使用 cursor 做 keyset 分页：下一页游标在响应头 X-Next-Cursor 中返回；
+      page 仅为兼容保留（OFFSET 分页）
     - 额外返回项目名称(project_name)和捐赠人名称(donor_name)
     """
     if page < 1:
@@ -109,42 +139,119 @@ async def list_latest_donations(
     if limit < 1:
         limit = 5
 
-    offset = (page - 1) * limit
+    # 缓冲区覆盖的页直接由内存返回，更深的页回退到 keyset 查询
+    await donation_feed.ensure_fresh(db)
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor, (datetime, int))
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="无效的分页游标")
+    items = donation_feed.page(limit, page, after)
+    if items is not None:
+        if len(items) == limit:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor([items[-1]["created_at"], items[-1]["id"]])
+        return items
 
     stmt = (
         select(Donation, Project.title, User.username)
         .join(Project, Donation.project_id == Project.id)
         .join(User, Donation.donor_id == User.id)
-        .order_by(Donation.created_at.desc())
-        .offset(offset)
+        .order_by(Donation.created_at.desc(), Donation.id.desc())
         .limit(limit)
     )
+    stmt = _apply_page(stmt, page, limit, cursor)
 
     result = await db.execute(stmt)
     rows = result.all()
+    if len(rows) == limit:
+        last = rows[-1][0]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([last.created_at, last.id])
+
+    return [feed_item(donation, project_title, username) for donation, project_title, username in rows]
+
+
+@router.get("/statistics")
+async def get_donation_statistics(
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """获取捐赠统计信息（读取单行汇总表）"""
+    service = DonationService(db)
+    statistics = await service.get_donation_statistics(project_id)
+
+    return statistics
+
+
+@router.get("/unique-donors")
+async def get_unique_donors(
+    project_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """去重捐赠人数（HyperLogLog 估计，相对误差约 1.6%）
+
+    - project_id: 为空时返回全平台
+    - start / end: 可选日期区间（含首尾，北京时间），不传则返回累计值
+    """
+    if start and end and start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start 不能晚于 end",
+        )
+    try:
+        unique_donors = await DonorSketchService(db).get_unique_donors(project_id, start, end)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="日期区间过长，请缩小区间",
+        )
+
+    return {
+        "project_id": project_id,
+        "start": start,
+        "end": end,
+        "unique_donors": unique_donors,
+    }
+
+
+@router.get("/trend")
+async def get_donation_trend(
+    granularity: str = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    project_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """获取捐赠数量 / 金额 / Gas 费趋势（预聚合时间桶，返回补零后的稠密序列）
 
-    donations_with_names = []
-    for donation, project_title, username in rows:
-        donations_with_names.append(
-            {
-                "id": donation.id,
-                "amount": donation.amount,
-                "donor_id": donation.donor_id,
-                "project_id": donation.project_id,
-                "status": donation.status,
-                "transaction_hash": donation.transaction_hash,
-                "block_hash": donation.block_hash,
-                "block_number": donation.block_number,
-                "gas_fee": donation.gas_fee,
-                "is_anonymous": donation.is_anonymous,
-                "created_at": donation.created_at,
-                "confirmed_at": donation.confirmed_at,
-                "project_name": project_title,
-                "donor_name": username,
-            }
+    - granularity: minute / hour / day
+    - start / end: 时间窗口 [start, end)，默认取截至当前的 24 个点
+    - 窗口起点早于该粒度的保留期时（如 48 小时前的分钟级），按实际存放的粒度返回，clamped 为 true
+    - project_id: 为空时返回全平台趋势
+    """
+    if granularity not in GRANULARITIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="granularity 仅支持 minute / hour / day",
         )
 
-    return donations_with_names
+    end = to_cn_naive(end or datetime.now(CN_TZ))
+    start = to_cn_naive(start) if start else end - GRANULARITIES[granularity] * 24
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start 必须早于 end",
+        )
+
+    try:
+        return await DonationTrendService(db).get_series(granularity, start, end, project_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="时间窗口内的点数过多，请缩小窗口或使用更粗的粒度",
+        )
 
 
 @router.get("/{donation_id}", response_model=DonationResponse)
@@ -188,15 +295,3 @@ async def get_project_donations(
     donations, total = await service.get_project_donations(project_id, page, size)
 
     return {"donations": donations, "total": total, "page": page, "size": size}
-
-
-@router.get("/statistics")
-async def get_donation_statistics(
-    project_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_db),
-):
-    """获取捐赠统计信息"""
-    service = DonationService(db)
-    statistics = await service.get_donation_statistics(project_id)
-
-    return statistics
\ No newline at end of file
@@ -0,0 +1,60 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import TOPICS, format_sse
+from app.services.events import event_bus
+
+router = APIRouter(prefix="/api/v1/events", tags=["events"])
+
+
+@router.get("")
+@router.get("/")
+async def stream_events(request: Request, topics: Optional[str] = None):
+    """链上事件推送（Server-Sent Events）
+
+    - topics: 逗号分隔的主题过滤，可选 tx_accepted / block_mined / donation_confirmed，默认全部
+    - 每隔 event_heartbeat_seconds 发送注释行心跳；客户端消费过慢时服务端主动断开，由 EventSource 自动重连
+    """
+    selected = set(TOPICS)
+    if topics:
+        selected = {t.strip() for t in topics.split(",") if t.strip()}
+        unknown = selected - set(TOPICS)
+        if unknown or not selected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"topics 仅支持 {' / '.join(TOPICS)}",
+            )
+
+    subscription = event_bus.subscribe(selected)
+
+    async def event_stream():
+        try:
+            # 建议客户端断线 3 秒后重连
+            yield "retry: 3000\n\n"
+            while True:
+                if subscription.dropped and subscription.queue.empty():
+                    # 已被判定为慢消费者：发完积压事件后通知客户端重新拉取状态并断开
+                    yield "event: dropped\ndata: {}\n\n"
+                    break
+                event = await subscription.get(timeout=settings.event_heartbeat_seconds)
+                if event is not None:
+                    yield format_sse(event)
+                    continue
+                if await request.is_disconnected():
+                    break
+                yield ": ping\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # 关闭 Nginx 等反向代理的响应缓冲
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -0,0 +1,93 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_current_admin
+from app.db.base import async_session
+from app.db.models.user import User
+from app.services.donation_trend import CN_TZ, to_cn_naive
+from app.services.export import ExportService, FORMATS
+
+# 导出为全量数据下载（含捐赠者与金额明细），仅管理员可用
+router = APIRouter(prefix="/api/v1/export", tags=["export"])
+
+
+def _check_format(format: str) -> None:
+    if format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="format 仅支持 ndjson / csv",
+        )
+
+
+def _time_window(start: Optional[datetime], end: Optional[datetime]):
+    if start is None and end is None:
+        return None, None
+    end = to_cn_naive(end or datetime.now(CN_TZ))
+    start = to_cn_naive(start) if start else None
+    if start is not None and start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="开始时间必须早于结束时间")
+    return start, end
+
+
+def _response(body, format: str, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.now(CN_TZ):%Y%m%d%H%M%S}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            # 关闭 Nginx 等反向代理的响应缓冲
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get("/transactions")
+async def export_transactions(
+    format: str = "ndjson",
+    transaction_type: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    from_block: Optional[int] = None,
+    to_block: Optional[int] = None,
+    current_admin: User = Depends(get_current_admin),
+):
+    """导出链上交易（NDJSON / CSV 流式下载），筛选条件同 /api/v1/blockchain/transactions
+
+    只导出数据库热表中的交易：已归档到段文件的冷区块（见 app.services.archive）不包含在内，
+    更早的交易需从归档段读取（如 /api/v1/blockchain/blocks/{n}）。
+    """
+    _check_format(format)
+    start, end = _time_window(start, end)
+    body = ExportService(async_session).transactions(
+        format,
+        transaction_type=transaction_type,
+        start=start,
+        end=end,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        from_block=from_block,
+        to_block=to_block,
+    )
+    return _response(body, format, "transactions")
+
+
+@router.get("/donations")
+async def export_donations(
+    format: str = "ndjson",
+    project_id: Optional[int] = None,
+    status_: Optional[str] = Query(None, alias="status"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    current_admin: User = Depends(get_current_admin),
+):
+    """导出捐赠记录（NDJSON / CSV 流式下载），可按项目、状态、创建时间筛选；匿名捐赠不输出捐赠者"""
+    _check_format(format)
+    start, end = _time_window(start, end)
+    body = ExportService(async_session).donations(format, project_id, status_, start, end)
+    return _response(body, format, "donations")
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi import Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.core.pagination import paginate
 from app.db.base import get_session as get_db
 from app.schemas.projects import (
     ProjectCreate,
@@ -16,6 +17,8 @@ from app.db.models.projects import Project, ProjectStatus
 
 # 服务层导入
 from app.services.projects import ProjectService
+from app.services.donor_sketch import DonorSketchService
+from app.services.project_cache import get_project_snapshot, invalidate_projects
 from app.api.deps import get_current_user
 from app.db.models.user import User
 
@@ -82,6 +85,7 @@ async def update_project(
 
     await db.commit()
     await db.refresh(project)
+    invalidate_projects([project.id])
     return project
 
 
@@ -145,9 +149,8 @@ async def get_project(
     project_id: int,
     db: AsyncSession = Depends(get_db),
 ):
-    """获取项目详情"""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project: Optional[Project] = result.scalars().first()
+    """获取项目详情（读穿缓存，金额 / 状态变更时失效）"""
+    project = await get_project_snapshot(db, project_id)
 
     if not project:
         raise HTTPException(
@@ -171,19 +174,8 @@ async def get_projects(
     if status:
         stmt = stmt.where(Project.status == status.upper())
 
-    # 总数
-    result_all = await db.execute(stmt)
-    all_projects = result_all.scalars().all()
-    total = len(all_projects)
-
-    # 分页
-    stmt_page = (
-        stmt.order_by(Project.created_at.desc())
-        .offset((page - 1) * size)
-        .limit(size)
-    )
-    result_page = await db.execute(stmt_page)
-    projects = result_page.scalars().all()
+    # 总数在数据库端 COUNT(*)，只加载当前页
+    projects, total = await paginate(db, stmt, page, size, Project.created_at.desc())
 
     # 将 ORM 对象转换为 Pydantic 模型，兼容 Pydantic v2
     project_items = [
@@ -191,6 +183,11 @@ async def get_projects(
         for p in projects
     ]
 
+    # 去重捐赠人数：一次读取当前页所有项目的草图
+    unique_donors = await DonorSketchService(db).get_unique_donors_many([p.id for p in projects])
+    for item in project_items:
+        item.unique_donors = unique_donors.get(item.id, 0)
+
     return ProjectList(
         projects=project_items,
         total=total,
@@ -204,9 +201,8 @@ async def get_project_progress(
     project_id: int,
     db: AsyncSession = Depends(get_db),
 ):
-    """获取项目进度"""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project: Optional[Project] = result.scalars().first()
+    """获取项目进度（读穿缓存，金额 / 状态变更时失效）"""
+    project = await get_project_snapshot(db, project_id)
 
     if not project:
         raise HTTPException(
@@ -214,16 +210,17 @@ async def get_project_progress(
             detail="项目不存在",
         )
 
-    target = project.target_amount or 0.0
-    current = project.current_amount or 0.0
+    target = project["target_amount"] or 0.0
+    current = project["current_amount"] or 0.0
     progress = 0.0
     if target > 0:
         progress = float(current) / float(target)
 
     return {
-        "project_id": project.id,
-        "title": project.title,
-        "target_amount": project.target_amount,
-        "current_amount": project.current_amount,
+        "project_id": project["id"],
+        "title": project["title"],
+        "target_amount": project["target_amount"],
+        "current_amount": project["current_amount"],
         "progress": progress,
+        "unique_donors": project["unique_donors"],
     }
\ No newline at end of file
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import get_session as get_db
+from app.services.rankings import rankings, DONOR_ORDERS, PROJECT_ORDERS
+
+router = APIRouter(prefix="/api/v1/rankings", tags=["rankings"])
+
+
+@router.get("")
+@router.get("/")
+async def get_rankings(
+    board: str = "projects",
+    order_by: str = "amount",
+    limit: int = Query(10, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """排行榜（内存 Top-K，读取不访问数据库）
+
+    - board: donors（捐赠者，不含匿名捐赠）/ projects（项目）
+    - order_by: amount / count，项目榜另支持 progress（筹款进度）
+    - limit: 返回前 N 名，最多 settings.ranking_size
+    """
+    orders = {"donors": DONOR_ORDERS, "projects": PROJECT_ORDERS}.get(board)
+    if orders is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="board 仅支持 donors / projects")
+    if order_by not in orders:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"order_by 仅支持 {' / '.join(orders)}",
+        )
+
+    # 仅在启动预热失败或挖矿异常后才会访问数据库
+    await rankings.ensure_loaded(db)
+
+    limit = min(limit, settings.ranking_size)
+    if board == "donors":
+        items = rankings.top_donors(order_by, limit)
+    else:
+        items = rankings.top_projects(order_by, limit)
+
+    return {
+        "board": board,
+        "order_by": order_by,
+        "items": items,
+        "total": len(items),
+        "reconciled_at": rankings.reconciled_at,
+    }
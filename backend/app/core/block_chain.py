@@ -7,6 +7,7 @@ from sqlalchemy import select, desc
 from sqlalchemy.sql import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.payload_codec import decode_payload
 from app.db.models.block_chain import Block, Transaction, TransactionPool
 
 
@@ -206,7 +207,7 @@ class BlockchainDB:
         for pool_tx in pending:
             # 解析 data 字段（其中可以包含 type/payload 等业务信息）
             try:
-                data = json.loads(pool_tx.data) if pool_tx.data else {}
+                data = decode_payload(pool_tx.data) or {}
             except Exception:
                 data = {}
 
@@ -0,0 +1,121 @@
+# app/core/cache.py
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """进程内 LRU 缓存（线程安全）。
+
+    - 容量满时淘汰最久未访问的条目；
+    - 适合缓存“写入后不再变化”的数据，例如已打包的区块；
+    - maxsize <= 0 表示关闭缓存（get 永远未命中，put 不保存）。
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return self._data[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+class AsyncTTLCache:
+    """带 TTL 的异步读穿缓存（LRU 淘汰 + 并发未命中合并）。
+
+    - 条目在写入 ttl 秒后过期，容量满时按 LRU 淘汰；
+    - get_or_load：同一个 key 并发未命中时只执行一次 loader，其余请求等待同一个结果；
+    - invalidate 会作废该 key 正在进行的加载：加载结束时只有仍登记在 _inflight 中的那一次
+      才会写回缓存，避免“读到旧值 → 失效 → 旧值写回”的竞争；
+      不为每个 key 单独记录失效代数，内部状态只随缓存条目与进行中的加载增长；
+    - loader 返回 None 时不缓存（例如记录不存在）。
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0) -> None:
+        self.ttl = ttl
+        self._entries = LRUCache(maxsize)
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key)
+            return None
+        return value
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            # 没有其他等待者时避免 "Future exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            # 加载期间被 invalidate / clear 时 future 已不在 _inflight 中，结果不写回
+            if value is not None and self._inflight.get(key) is future:
+                self._entries.put(key, (value, time.monotonic() + self.ttl))
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key)
+        # 失效后的新请求不再复用失效前发出的加载，该加载的结果也不会写回
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
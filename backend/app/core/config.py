@@ -10,6 +10,74 @@ class Settings(BaseSettings):
     mining_reward: float = 10.0
     ALGORITHM: str = "HS256"
 
+    # 区块详情 LRU 缓存容量（已打包区块不可变，可长期缓存）
+    block_cache_size: int = 512
+
+    # 多 worker 共享链头状态的共享内存段名称，留空则只使用进程内缓存
+    chain_state_shm_name: str = "donate_chain_state"
+
+    # 分页总数：达到阈值的 COUNT(*) 结果缓存若干秒（大结果集总数允许短暂近似）
+    count_cache_threshold: int = 10000
+    count_cache_ttl: int = 30
+
+    # 捐赠趋势时间桶：分钟桶保留时长后并入小时桶，小时桶保留时长后并入天桶
+    trend_minute_retention_hours: int = 48
+    trend_hour_retention_days: int = 90
+    trend_compact_interval_seconds: int = 600
+    trend_max_points: int = 1500
+
+    # 排行榜：每个榜保留前 N 名，定期与数据库对账的间隔
+    ranking_size: int = 100
+    ranking_reconcile_interval_seconds: int = 300
+
+    # 项目详情 / 进度快照缓存：容量与过期时间（其他 worker 的变更最多延迟 ttl 秒可见）
+    project_cache_size: int = 1024
+    project_cache_ttl: int = 30
+
+    # SSE 事件推送：每个客户端的队列长度（写满即断开慢消费者）与心跳间隔
+    event_queue_size: int = 100
+    event_heartbeat_seconds: int = 15
+
+    # 最新捐赠流环形缓冲区：保留条数与重新预热间隔（同步其他 worker 创建的捐赠）
+    donation_feed_size: int = 200
+    donation_feed_refresh_seconds: int = 10
+
+    # 区块浏览器搜索索引：读取时追加其他 worker 新挖出区块的检查间隔
+    search_catch_up_seconds: int = 5
+    # 搜索索引预热时每批读取的行数（只读取哈希 / 地址列）
+    search_warm_batch_size: int = 5000
+
+    # 流式导出：服务端游标每批读取行数与单次输出的块大小（字节）
+    export_yield_per: int = 1000
+    export_chunk_bytes: int = 64 * 1024
+
+    # 列式数据湖：目录、文件格式（arrow / parquet）与每批导出的区块数
+    lake_dir: str = "data/lake"
+    lake_format: str = "arrow"
+    lake_export_batch_blocks: int = 1000
+    # 数据湖分析结果缓存条数（按水位失效）
+    analytics_cache_size: int = 256
+
+    # 冷区块归档：段文件目录、保留在数据库中的最近区块数、每个段的区块数
+    archive_dir: str = "data/archive"
+    archive_depth: int = 10000
+    archive_segment_blocks: int = 1000
+    # 同时保持打开（mmap）的段数上限，超出时关闭最久未用的段
+    archive_open_segments: int = 32
+
+    # 快照导出 / 导入：每批读取 / 插入的行数
+    snapshot_batch_size: int = 5000
+
+    # 派生状态回放：每个分块的交易数与并行写入影子表的任务数
+    replay_chunk_size: int = 5000
+    replay_workers: int = 4
+
+    # 交易 data 存储编码：msgpack / json（未安装 msgpack 时为 json），
+    # 不小于 payload_compress_min_bytes 字节时按 payload_compression（zlib / zstd / none）压缩
+    payload_encoding: str = "msgpack"
+    payload_compression: str = "zlib"
+    payload_compress_min_bytes: int = 256
+
     class Config:
         env_file = ".env"
 
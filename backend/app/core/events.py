@@ -0,0 +1,76 @@
+# app/core/events.py
+import asyncio
+import itertools
+import json
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+# 事件主题
+TX_ACCEPTED = "tx_accepted"
+BLOCK_MINED = "block_mined"
+DONATION_CONFIRMED = "donation_confirmed"
+TOPICS = (TX_ACCEPTED, BLOCK_MINED, DONATION_CONFIRMED)
+
+
+class Subscription:
+    """单个订阅者：有界队列 + 主题过滤"""
+
+    def __init__(self, topics: Set[str], maxsize: int) -> None:
+        self.topics = topics
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=maxsize)
+        self.dropped = False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """取下一条事件；超时返回 None（用于发送心跳）"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """进程内事件总线（发布 / 订阅）。
+
+    - publish 为同步调用，只做 put_nowait，不会阻塞交易池 / 挖矿路径；
+    - 每个订阅者一个有界队列，队列写满说明客户端消费过慢：直接断开该订阅者，
+      由客户端重连（EventSource 会自动重连），而不是让积压无限增长或拖慢发布方；
+    - 事件 id 单调递增，对应 SSE 的 id 字段；
+    - 只在当前进程内分发：多 worker 部署时客户端只能收到所连 worker 上发生的事件。
+    """
+
+    def __init__(self, queue_size: int = 100) -> None:
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None) -> Subscription:
+        subscription = Subscription(set(topics or TOPICS), self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, topic: str, data: Dict[str, Any]) -> int:
+        """发布事件，返回投递成功的订阅者数量"""
+        event = {"id": next(self._ids), "topic": topic, "data": data, "ts": time.time()}
+        delivered = 0
+        for subscription in list(self._subscribers):
+            if topic not in subscription.topics:
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+                delivered += 1
+            except asyncio.QueueFull:
+                subscription.dropped = True
+                self._subscribers.discard(subscription)
+        return delivered
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """按 text/event-stream 格式编码单条事件"""
+    payload = json.dumps(event["data"], ensure_ascii=False, default=str)
+    return f"id: {event['id']}\nevent: {event['topic']}\ndata: {payload}\n\n"
@@ -0,0 +1,62 @@
+# app/core/hex_binary.py
+import re
+from typing import Any, Optional
+
+from sqlalchemy import VARBINARY
+from sqlalchemy.types import TypeDecorator
+
+# 存储格式：1 字节标记 + 内容
+# - 0x01：偶数长度的十六进制串（区块 / 交易哈希），内容为原始字节，32 字节哈希只占 33 字节；
+# - 0x02：0x 前缀的十六进制串（项目地址、钱包地址），20 字节地址只占 21 字节；
+# - 0x00：其他字符串（如 "system"、自定义矿工地址），内容为 UTF-8 原文。
+TAG_TEXT = 0x00
+TAG_HEX = 0x01
+TAG_PREFIXED_HEX = 0x02
+
+_HEX = re.compile(r"(?:[0-9a-fA-F]{2})+")
+
+
+def encode_hex(value: str) -> bytes:
+    """十六进制串按字节存储（不区分大小写，与原先 MySQL 默认排序规则下的比较语义一致），其余按原文存储"""
+    if _HEX.fullmatch(value):
+        return bytes([TAG_HEX]) + bytes.fromhex(value)
+    if value.startswith("0x") and _HEX.fullmatch(value, 2):
+        return bytes([TAG_PREFIXED_HEX]) + bytes.fromhex(value[2:])
+    return bytes([TAG_TEXT]) + value.encode("utf-8")
+
+
+def decode_hex(raw: bytes) -> str:
+    """还原为小写十六进制串或原文"""
+    tag, body = raw[0], raw[1:]
+    if tag == TAG_HEX:
+        return body.hex()
+    if tag == TAG_PREFIXED_HEX:
+        return "0x" + body.hex()
+    return body.decode("utf-8")
+
+
+class HexBinary(TypeDecorator):
+    """哈希 / 地址列类型：库中以 VARBINARY(length + 1) 紧凑存储，对外仍是十六进制字符串。
+
+    length 为原 String 列的字符长度，保证非十六进制的原文也能无损保存；
+    查询参数按同样规则编码，等值比较、IN、唯一索引与连接的语义不变（不支持 LIKE 前缀匹配）。
+    """
+
+    impl = VARBINARY
+    cache_ok = True
+
+    def __init__(self, length: int = 64) -> None:
+        super().__init__(length + 1)
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return encode_hex(str(value))
+
+    def process_result_value(self, value: Any, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # 迁移前的 String 列
+            return value
+        return decode_hex(bytes(value))
@@ -0,0 +1,105 @@
+# app/core/hyperloglog.py
+import hashlib
+import math
+import struct
+import zlib
+from typing import Hashable, Iterable, Optional
+
+# 序列化格式：1 字节版本 + 1 字节精度 p + zlib 压缩后的寄存器
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BB")
+
+DEFAULT_PRECISION = 12
+
+
+def _hash64(value: Hashable) -> int:
+    # 不能用内置 hash()：字符串哈希每个进程随机化，草图需要跨进程 / 跨重启可合并
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """HyperLogLog 基数估计草图。
+
+    - m = 2^p 个寄存器，每个寄存器记录落入该桶的哈希值中“前导零个数 + 1”的最大值；
+    - 相对标准误差约为 1.04 / sqrt(m)：默认 p = 12（4096 个寄存器）时约 1.6%，
+      即 95% 的估计落在真实值 ±3.3% 以内；基数较小（< 2.5m）时改用线性计数，结果基本精确；
+    - 同一元素重复加入不影响结果；两个草图按寄存器取最大值即可合并（并集），
+      因此按天保存的草图可以合并出任意日期区间的去重人数；
+    - 序列化后为 2 字节头 + zlib 压缩的寄存器，稀疏草图只有几十字节，满载约 3KB。
+    """
+
+    def __init__(self, p: int = DEFAULT_PRECISION, registers: Optional[bytearray] = None) -> None:
+        if not 4 <= p <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.p = p
+        self.m = 1 << p
+        if registers is None:
+            registers = bytearray(self.m)
+        elif len(registers) != self.m:
+            raise ValueError("register size does not match precision")
+        self.registers = registers
+
+    # ---------- 写 ----------
+
+    def add(self, value: Hashable) -> bool:
+        """加入一个元素，返回寄存器是否发生变化"""
+        x = _hash64(value)
+        index = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+            return True
+        return False
+
+    def update(self, values: Iterable[Hashable]) -> bool:
+        changed = False
+        for value in values:
+            changed = self.add(value) or changed
+        return changed
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """原地合并另一个草图（并集），返回自身"""
+        if other.p != self.p:
+            raise ValueError("cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    # ---------- 读 ----------
+
+    def count(self) -> int:
+        m = self.m
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        elif m == 64:
+            alpha = 0.709
+        elif m == 32:
+            alpha = 0.697
+        else:
+            alpha = 0.673
+
+        zeros = self.registers.count(0)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        if estimate <= 2.5 * m and zeros:
+            # 小基数区间：线性计数更准确
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def __len__(self) -> int:
+        return self.count()
+
+    # ---------- 序列化 ----------
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(_FORMAT_VERSION, self.p) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, raw: Optional[bytes]) -> "HyperLogLog":
+        """反序列化；raw 为空时返回空草图"""
+        if not raw:
+            return cls()
+        version, p = _HEADER.unpack_from(raw, 0)
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"unsupported sketch version: {version}")
+        return cls(p, bytearray(zlib.decompress(raw[_HEADER.size:])))
@@ -0,0 +1,154 @@
+# app/core/lake.py
+import glob
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:  # 可选依赖：只有列式导出 / 分析功能需要
+    pa = pa_ipc = pq = None
+
+# 文件格式 -> 扩展名
+FORMATS = {"arrow": "arrow", "parquet": "parquet"}
+WATERMARK_FILE = "_watermark.json"
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("列式导出需要安装 pyarrow：pip install pyarrow")
+
+
+def _schemas() -> Dict[str, "pa.Schema"]:
+    ts = pa.timestamp("us")
+    return {
+        "blocks": pa.schema([
+            ("block_number", pa.int64()),
+            ("block_hash", pa.string()),
+            ("previous_hash", pa.string()),
+            ("miner_address", pa.string()),
+            ("difficulty", pa.int32()),
+            ("nonce", pa.int64()),
+            ("reward", pa.float64()),
+            ("transaction_count", pa.int32()),
+            ("timestamp", ts),
+        ]),
+        "transactions": pa.schema([
+            ("id", pa.int64()),
+            ("transaction_hash", pa.string()),
+            ("from_address", pa.string()),
+            ("to_address", pa.string()),
+            ("transaction_type", pa.string()),
+            ("amount", pa.float64()),
+            ("gas_fee", pa.float64()),
+            ("block_number", pa.int64()),
+            ("confirmed_at", ts),
+            ("data", pa.string()),
+        ]),
+        "donations": pa.schema([
+            ("id", pa.int64()),
+            ("project_id", pa.int64()),
+            ("donor_id", pa.int64()),
+            ("amount", pa.float64()),
+            ("gas_fee", pa.float64()),
+            ("status", pa.string()),
+            ("is_anonymous", pa.bool_()),
+            ("block_number", pa.int64()),
+            ("created_at", ts),
+            ("confirmed_at", ts),
+        ]),
+    }
+
+
+def table_schema(table: str) -> "pa.Schema":
+    require_pyarrow()
+    return _schemas()[table]
+
+
+class Lake:
+    """本地列式数据湖目录布局：
+
+        {root}/{table}/date=YYYY-MM-DD/part-{起始区块:010d}-{结束区块:010d}.{arrow|parquet}
+        {root}/_watermark.json            已导出的最大区块号
+
+    - 分区文件只追加不修改；同一起始区块的分片重写时先删除旧文件，保证重跑幂等；
+    - 文件先写临时文件再 os.replace，读取方不会看到写了一半的文件；
+    - Arrow IPC 文件可以直接内存映射读取（零拷贝），Parquet 体积更小但读取需要解码。
+    """
+
+    def __init__(self, root: str, fmt: str = "arrow") -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"unsupported lake format: {fmt}")
+        self.root = root
+        self.fmt = fmt
+
+    # ---------- 水位 ----------
+
+    def read_watermark(self) -> Dict[str, Any]:
+        path = os.path.join(self.root, WATERMARK_FILE)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"block_number": -1, "updated_at": None}
+
+    def write_watermark(self, block_number: int, **extra: Any) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        path = os.path.join(self.root, WATERMARK_FILE)
+        payload = dict(extra, block_number=block_number, updated_at=time.time())
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp, path)
+
+    # ---------- 写入 ----------
+
+    def write_partition(self, table: str, date: str, from_block: int, to_block: int,
+                        columns: Dict[str, List[Any]]) -> str:
+        require_pyarrow()
+        schema = table_schema(table)
+        arrow_table = pa.Table.from_pydict(columns, schema=schema)
+
+        directory = os.path.join(self.root, table, f"date={date}")
+        os.makedirs(directory, exist_ok=True)
+        for stale in glob.glob(os.path.join(directory, f"part-{from_block:010d}-*")):
+            os.remove(stale)
+
+        path = os.path.join(directory, f"part-{from_block:010d}-{to_block:010d}.{FORMATS[self.fmt]}")
+        tmp = path + ".tmp"
+        if self.fmt == "parquet":
+            pq.write_table(arrow_table, tmp, compression="zstd")
+        else:
+            with pa.OSFile(tmp, "wb") as sink, pa_ipc.new_file(sink, schema) as writer:
+                writer.write_table(arrow_table)
+        os.replace(tmp, path)
+        return path
+
+    # ---------- 读取 ----------
+
+    def partition_files(self, table: str) -> List[str]:
+        files = []
+        for ext in FORMATS.values():
+            files.extend(glob.glob(os.path.join(self.root, table, "date=*", f"part-*.{ext}")))
+        return sorted(files)
+
+    def read_table(self, table: str, columns: Optional[List[str]] = None) -> "pa.Table":
+        """读取某张表的全部分区；Arrow IPC 文件通过内存映射读取，不复制到进程堆"""
+        require_pyarrow()
+        parts = []
+        for path in self.partition_files(table):
+            if path.endswith(".parquet"):
+                parts.append(pq.read_table(path, columns=columns, memory_map=True))
+            else:
+                source = pa.memory_map(path, "r")
+                part = pa_ipc.open_file(source).read_all()
+                parts.append(part.select(columns) if columns else part)
+        if not parts:
+            schema = table_schema(table)
+            if columns:
+                schema = pa.schema([schema.field(name) for name in columns])
+            return schema.empty_table()
+        return pa.concat_tables(parts)
@@ -0,0 +1,79 @@
+# app/core/leaderboard.py
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Hashable, List, Mapping, Tuple
+
+
+class Leaderboard:
+    """进程内 Top-K 排行榜（有序列表 + 全量分数表，线程安全）。
+
+    - _scores 保存所有成员的当前分数，用于增量累加；
+    - _top 只保存前 capacity 名，按 (-score, key) 升序排列，读取前 K 名为 O(K) 切片；
+    - 更新时用 bisect 定位删除 / 插入，分数上升（捐赠累加）只需与第 capacity 名比较；
+    - 榜内成员分数下降导致掉出前 capacity 名时，从全量分数表重新选出前 capacity 名。
+    """
+
+    def __init__(self, capacity: int = 100) -> None:
+        self.capacity = capacity
+        self._scores: Dict[Hashable, float] = {}
+        self._top: List[Tuple[float, Hashable]] = []
+        self._members: set = set()
+        self._lock = threading.Lock()
+
+    # ---------- 写 ----------
+
+    def _rebuild_top(self) -> None:
+        self._top = heapq.nsmallest(self.capacity, ((-score, key) for key, score in self._scores.items()))
+        self._members = {key for _, key in self._top}
+
+    def _set_locked(self, key: Hashable, score: float) -> None:
+        old_score = self._scores.get(key)
+        self._scores[key] = score
+
+        if key in self._members:
+            i = bisect_left(self._top, (-old_score, key))
+            self._top.pop(i)
+            self._members.discard(key)
+            if score < old_score and len(self._scores) > self.capacity:
+                # 榜内成员分数下降，可能有榜外成员应当补位
+                self._rebuild_top()
+                return
+
+        if len(self._top) < self.capacity or (-score, key) < self._top[-1]:
+            insort(self._top, (-score, key))
+            self._members.add(key)
+            if len(self._top) > self.capacity:
+                _, dropped = self._top.pop()
+                self._members.discard(dropped)
+
+    def set(self, key: Hashable, score: float) -> None:
+        with self._lock:
+            self._set_locked(key, score)
+
+    def add(self, key: Hashable, delta: float) -> float:
+        """分数累加，返回累加后的分数"""
+        with self._lock:
+            score = self._scores.get(key, 0.0) + delta
+            self._set_locked(key, score)
+            return score
+
+    def load(self, scores: Mapping[Hashable, float]) -> None:
+        """整体替换（用于从数据库对账）"""
+        with self._lock:
+            self._scores = dict(scores)
+            self._rebuild_top()
+
+    # ---------- 读 ----------
+
+    def top(self, k: int) -> List[Tuple[Hashable, float]]:
+        """返回前 k 名 [(key, score)]，k 不超过 capacity"""
+        with self._lock:
+            return [(key, -neg_score) for neg_score, key in self._top[:k]]
+
+    def score(self, key: Hashable) -> float:
+        return self._scores.get(key, 0.0)
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
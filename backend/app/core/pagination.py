@@ -0,0 +1,102 @@
+# app/core/pagination.py
+import base64
+import json
+import time
+from datetime import datetime
+from typing import Any, List, Sequence, Tuple
+
+from sqlalchemy import and_, or_, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+
+# 大结果集的 COUNT(*) 结果短暂缓存：key 为编译后的 SQL + 参数，value 为 (total, 过期时间)
+_count_cache = LRUCache(maxsize=1024)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """把排序键编码为不透明游标（base64url(JSON)），datetime 以 ISO 格式保存"""
+    payload = []
+    for value in values:
+        if isinstance(value, datetime):
+            payload.append({"dt": value.isoformat()})
+        else:
+            payload.append(value)
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """按 types 逐位解析游标（int 或 datetime），格式或类型不符时抛出 ValueError
+
+    游标由客户端回传，解析结果会直接绑定到 keyset 条件中，必须逐位校验类型。
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("invalid cursor")
+
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise ValueError("invalid cursor")
+
+    values = []
+    for value, expected in zip(payload, types):
+        if expected is datetime:
+            if not isinstance(value, dict) or set(value) != {"dt"} or not isinstance(value["dt"], str):
+                raise ValueError("invalid cursor")
+            values.append(datetime.fromisoformat(value["dt"]))
+        elif expected is int:
+            # bool 是 int 的子类，需单独排除
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError("invalid cursor")
+            values.append(value)
+        else:
+            raise TypeError(f"unsupported cursor type: {expected!r}")
+    return values
+
+
+def keyset_before(keys: Sequence[Tuple[Any, Any]]):
+    """构造降序 keyset 条件：(c1, c2, ...) < (v1, v2, ...)
+
+    展开为 c1 < v1 OR (c1 = v1 AND c2 < v2) ...，
+    可以直接利用 (c1, c2, ...) 上的复合索引做范围扫描，深分页与首页代价相同。
+    """
+    clauses = []
+    for i, (column, value) in enumerate(keys):
+        equal_prefix = [col == val for col, val in keys[:i]]
+        clauses.append(and_(*equal_prefix, column < value))
+    return or_(*clauses)
+
+
+async def count_rows(db: AsyncSession, stmt) -> int:
+    """在数据库端对过滤后的子查询执行 COUNT(*)，不把行加载到 Python。
+
+    结果达到 settings.count_cache_threshold 时缓存 count_cache_ttl 秒：
+    大结果集的总数只用于展示页码，短时间内的近似值即可，避免每次翻页都全量计数。
+    """
+    stmt = stmt.order_by(None)
+    compiled = stmt.compile()
+    key = (str(compiled), tuple(sorted((k, str(v)) for k, v in compiled.params.items())))
+
+    cached = _count_cache.get(key)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
+    result = await db.execute(select(func.count()).select_from(stmt.subquery()))
+    total = int(result.scalar() or 0)
+
+    if total >= settings.count_cache_threshold:
+        _count_cache.put(key, (total, time.monotonic() + settings.count_cache_ttl))
+    return total
+
+
+async def paginate(db: AsyncSession, stmt, page: int, size: int, *order_by) -> Tuple[List[Any], int]:
+    """OFFSET 分页通用实现：SQL COUNT(*) 取总数 + LIMIT/OFFSET 取当前页 ORM 对象"""
+    total = await count_rows(db, stmt)
+
+    stmt_page = stmt.order_by(*order_by).offset((page - 1) * size).limit(size)
+    result = await db.execute(stmt_page)
+    return list(result.scalars().all()), total
@@ -0,0 +1,178 @@
+# app/core/payload_codec.py
+import json
+import zlib
+from functools import cached_property
+from typing import Any, Optional
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import settings
+
+try:
+    import msgpack
+except ImportError:  # 可选依赖：未安装时新写入的 payload 使用 JSON 编码
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖：未安装时压缩回退为 zlib
+    zstandard = None
+
+# 存储格式：1 字节版本号 + 编码（并可能压缩）后的内容。
+# 版本号只取 0x01 - 0x06，均小于 JSON 文本可能出现的首字符（空白符 0x09 及以上），
+# 因此首字节不在表中的内容按迁移前的 JSON 原文解析。
+CODEC_JSON = 0x01
+CODEC_JSON_ZLIB = 0x02
+CODEC_JSON_ZSTD = 0x03
+CODEC_MSGPACK = 0x04
+CODEC_MSGPACK_ZLIB = 0x05
+CODEC_MSGPACK_ZSTD = 0x06
+
+_CODECS = {
+    ("json", "none"): CODEC_JSON,
+    ("json", "zlib"): CODEC_JSON_ZLIB,
+    ("json", "zstd"): CODEC_JSON_ZSTD,
+    ("msgpack", "none"): CODEC_MSGPACK,
+    ("msgpack", "zlib"): CODEC_MSGPACK_ZLIB,
+    ("msgpack", "zstd"): CODEC_MSGPACK_ZSTD,
+}
+_FORMATS = {code: fmt for fmt, code in _CODECS.items()}
+
+
+def _encoding() -> str:
+    if settings.payload_encoding == "msgpack" and msgpack is not None:
+        return "msgpack"
+    return "json"
+
+
+def _compression() -> str:
+    if settings.payload_compression == "zstd" and zstandard is None:
+        return "zlib"
+    return settings.payload_compression if settings.payload_compression in ("zlib", "zstd") else "none"
+
+
+def _compress(body: bytes, compression: str) -> bytes:
+    if compression == "zlib":
+        return zlib.compress(body)
+    return zstandard.ZstdCompressor().compress(body)
+
+
+def _decompress(body: bytes, compression: str) -> bytes:
+    if compression == "none":
+        return body
+    if compression == "zlib":
+        return zlib.decompress(body)
+    if zstandard is None:
+        raise RuntimeError("payload 使用 zstd 压缩，需要安装 zstandard：pip install zstandard")
+    return zstandard.ZstdDecompressor().decompress(body)
+
+
+def _parse_text(text: str) -> Any:
+    """JSON 文本解析为对应的值，不是合法 JSON 的文本原样返回字符串"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def encode_payload(value: Any) -> bytes:
+    """按配置编码交易 data：msgpack / JSON，超过 payload_compress_min_bytes 时压缩（压缩后更小才保留）"""
+    if isinstance(value, str):
+        # 调用方传入的 JSON 文本，先解析再按统一格式编码；不是合法 JSON 时按原始字符串保存
+        value = _parse_text(value)
+    encoding = _encoding()
+    if encoding == "msgpack":
+        body = msgpack.packb(value, use_bin_type=True)
+    else:
+        body = json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    compression = "none"
+    if len(body) >= settings.payload_compress_min_bytes:
+        candidate = _compression()
+        if candidate != "none":
+            compressed = _compress(body, candidate)
+            if len(compressed) < len(body):
+                body, compression = compressed, candidate
+    return bytes([_CODECS[(encoding, compression)]]) + body
+
+
+class Payload(bytes):
+    """数据库中读出的交易 data 原始字节，访问 value 时才解码（结果缓存）。
+
+    只转发、复制（交易池 -> 交易表、快照）时不会解码，写回数据库时原样保存，不会重新编码。
+    """
+
+    @property
+    def codec(self) -> Optional[int]:
+        """版本号；迁移前的 JSON 原文返回 None"""
+        return self[0] if self and self[0] in _FORMATS else None
+
+    @cached_property
+    def value(self) -> Any:
+        codec = self.codec
+        if codec is None:
+            return json.loads(self.decode("utf-8"))
+        encoding, compression = _FORMATS[codec]
+        body = _decompress(bytes(self[1:]), compression)
+        if encoding == "msgpack":
+            if msgpack is None:
+                raise RuntimeError("payload 使用 msgpack 编码，需要安装 msgpack：pip install msgpack")
+            return msgpack.unpackb(body, raw=False)
+        return json.loads(body)
+
+    def json_text(self) -> str:
+        """JSON 文本形式（未压缩的 JSON 编码直接取原文，不做解析）"""
+        codec = self.codec
+        if codec is None:
+            return self.decode("utf-8")
+        if codec == CODEC_JSON:
+            return self[1:].decode("utf-8")
+        return json.dumps(self.value, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode_payload(value: Any) -> Any:
+    """统一取出交易 data 的内容：兼容 Payload、原始字节、JSON 文本与已解析的 dict"""
+    if value is None:
+        return None
+    if isinstance(value, Payload):
+        return value.value
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return Payload(bytes(value)).value
+    if isinstance(value, str):
+        return _parse_text(value) if value else None
+    return value
+
+
+def payload_text(value: Any) -> Optional[str]:
+    """交易 data 的 JSON 文本（用于导出 / 对外返回原文的接口）"""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return Payload(bytes(value)).json_text()
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class PayloadType(TypeDecorator):
+    """交易 data 列类型：写入 dict / list / JSON 文本时编码，已编码的字节（Payload）原样写入；
+    读出为 Payload，由使用方按需解码"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        return encode_payload(value)
+
+    def process_result_value(self, value: Any, dialect) -> Optional[Payload]:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # 迁移前的 Text 列
+            value = value.encode("utf-8")
+        return Payload(value)
@@ -0,0 +1,86 @@
+# app/core/prefix_index.py
+import threading
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, List, Set, Tuple
+
+
+def normalize_key(key: str) -> str:
+    """统一小写并去掉 0x 前缀（用户粘贴的地址 / 哈希可能带或不带 0x）"""
+    key = (key or "").strip().lower()
+    if key.startswith("0x"):
+        key = key[2:]
+    return key
+
+
+class PrefixIndex:
+    """前缀查找索引：按 key 排序的数组 + 二分查找（线程安全）。
+
+    - 条目为 (key, kind, ref)，同一个 key 可以对应多种类型（例如同一个地址既是项目地址又是交易地址）；
+    - search(prefix) 用 bisect 定位第一个 >= prefix 的位置，向后扫描到前缀不再匹配为止，
+      代价为 O(log n + 命中数)；
+    - 插入使用 insort，适合“批量预热 + 每个区块少量追加”的写入模式。
+    """
+
+    def __init__(self) -> None:
+        self._entries: List[Tuple[str, str, Hashable]] = []
+        self._seen: Set[Tuple[str, str, Hashable]] = set()
+        self._payloads: Dict[Tuple[str, Hashable], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, kind: str, ref: Hashable, payload: Dict[str, Any]) -> None:
+        key = normalize_key(key)
+        if not key:
+            return
+        entry = (key, kind, ref)
+        with self._lock:
+            self._payloads[(kind, ref)] = payload
+            if entry in self._seen:
+                return
+            self._seen.add(entry)
+            insort(self._entries, entry)
+
+    def load(self, entries: List[Tuple[str, str, Hashable, Dict[str, Any]]]) -> None:
+        """整体替换（预热时一次排序，避免逐条 insort）"""
+        seen = set()
+        payloads = {}
+        for key, kind, ref, payload in entries:
+            key = normalize_key(key)
+            if key:
+                seen.add((key, kind, ref))
+                payloads[(kind, ref)] = payload
+        with self._lock:
+            self._seen = seen
+            self._entries = sorted(seen)
+            self._payloads = payloads
+
+    def search(self, prefix: str, limit: int = 20, scan_limit: int = 1000) -> List[Dict[str, Any]]:
+        """返回以 prefix 开头的条目；完全匹配的排在最前，其余按 key 长度、key 升序。
+
+        scan_limit 限制单次扫描的条目数，避免极短前缀扫描整个索引。
+        """
+        prefix = normalize_key(prefix)
+        if not prefix:
+            return []
+
+        exact, partial = [], []
+        with self._lock:
+            i = bisect_left(self._entries, (prefix,))
+            end = min(len(self._entries), i + scan_limit)
+            while i < end:
+                key, kind, ref = self._entries[i]
+                if not key.startswith(prefix):
+                    break
+                hit = dict(self._payloads.get((kind, ref), {}), type=kind, exact=(key == prefix))
+                if key == prefix:
+                    exact.append(hit)
+                else:
+                    partial.append((len(key), hit))
+                if len(exact) >= limit:
+                    break
+                i += 1
+        # 部分匹配中 key 越短，剩余未匹配的字符越少，排名越靠前
+        partial.sort(key=lambda item: item[0])
+        return (exact + [hit for _, hit in partial])[:limit]
+
+    def __len__(self) -> int:
+        return len(self._entries)
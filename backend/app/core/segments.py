@@ -0,0 +1,344 @@
+# app/core/segments.py
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MANIFEST_FILE = "segments.json"
+
+# .idx：每个区块一条定长记录 (数据偏移, 压缩后长度)，按 区块号 - 段起始号 直接定位
+_IDX = struct.Struct("<QI")
+# .hsh：开放寻址哈希表，槽位为 (16 字节 key 摘要, 区块号 + 1)，区块号 + 1 == 0 表示空槽
+_HSH_HEADER = struct.Struct("<I")
+_HSH_SLOT = struct.Struct("<16sI")
+
+# .blm：布隆过滤器 (位数, 哈希个数) + 位图，按哈希查找时先在内存中排除不含该 key 的段
+_BLOOM_HEADER = struct.Struct("<II")
+_BLOOM_BITS_PER_KEY = 10
+_BLOOM_HASHES = 7
+
+KIND_BLOCK = b"b"
+KIND_TRANSACTION = b"t"
+
+
+def _hash_key(kind: bytes, value: str) -> bytes:
+    return hashlib.blake2b(kind + value.lower().encode("utf-8"), digest_size=16).digest()
+
+
+def _build_hash_table(keys: List[Tuple[bytes, int]]) -> bytes:
+    """装载因子不超过 0.5 的线性探测哈希表（容量为 2 的幂）"""
+    capacity = 8
+    while capacity < len(keys) * 2:
+        capacity *= 2
+    slots = [None] * capacity
+    mask = capacity - 1
+    for key, block_number in keys:
+        i = int.from_bytes(key[:8], "little") & mask
+        while slots[i] is not None and slots[i][0] != key:
+            i = (i + 1) & mask
+        slots[i] = (key, block_number + 1)
+
+    out = bytearray(_HSH_HEADER.pack(capacity))
+    empty = _HSH_SLOT.pack(b"\0" * 16, 0)
+    for slot in slots:
+        out += _HSH_SLOT.pack(*slot) if slot is not None else empty
+    return bytes(out)
+
+
+def _bloom_positions(key: bytes, bits: int, hashes: int) -> Iterator[int]:
+    # key 本身就是均匀的摘要，用两半做双重哈希生成 k 个位置
+    h1 = int.from_bytes(key[:8], "little")
+    h2 = int.from_bytes(key[8:], "little") | 1
+    for i in range(hashes):
+        yield (h1 + i * h2) % bits
+
+
+def _build_bloom(keys: List[Tuple[bytes, int]]) -> bytes:
+    """误判率约 1%（每个 key 10 位，7 个哈希）"""
+    bits = max(64, len(keys) * _BLOOM_BITS_PER_KEY)
+    bitmap = bytearray((bits + 7) // 8)
+    for key, _ in keys:
+        for pos in _bloom_positions(key, bits, _BLOOM_HASHES):
+            bitmap[pos >> 3] |= 1 << (pos & 7)
+    return _BLOOM_HEADER.pack(bits, _BLOOM_HASHES) + bytes(bitmap)
+
+
+def _read_hash_keys(path: str) -> List[Tuple[bytes, int]]:
+    with open(path, "rb") as f:
+        raw = f.read()
+    (capacity,) = _HSH_HEADER.unpack_from(raw, 0)
+    keys = []
+    for i in range(capacity):
+        key, value = _HSH_SLOT.unpack_from(raw, _HSH_HEADER.size + i * _HSH_SLOT.size)
+        if value:
+            keys.append((key, value - 1))
+    return keys
+
+
+class _Bloom:
+    def __init__(self, raw: bytes) -> None:
+        self.bits, self.hashes = _BLOOM_HEADER.unpack_from(raw, 0)
+        self.bitmap = raw[_BLOOM_HEADER.size:]
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(
+            self.bitmap[pos >> 3] & (1 << (pos & 7))
+            for pos in _bloom_positions(key, self.bits, self.hashes)
+        )
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class _Segment:
+    """单个段文件的内存映射（只读）"""
+
+    def __init__(self, root: str, meta: Dict[str, Any]) -> None:
+        self.start = meta["start"]
+        self.end = meta["end"]
+        base = os.path.join(root, meta["file"])
+        self._files = [open(base + ext, "rb") for ext in (".dat", ".idx", ".hsh")]
+        self.dat, self.idx, self.hsh = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) for f in self._files)
+        (self.capacity,) = _HSH_HEADER.unpack_from(self.hsh, 0)
+
+    def read(self, block_number: int) -> Optional[Dict[str, Any]]:
+        if not self.start <= block_number <= self.end:
+            return None
+        offset, length = _IDX.unpack_from(self.idx, (block_number - self.start) * _IDX.size)
+        if length == 0:
+            return None
+        return json.loads(zlib.decompress(self.dat[offset:offset + length]))
+
+    def lookup(self, key: bytes) -> Optional[int]:
+        mask = self.capacity - 1
+        i = int.from_bytes(key[:8], "little") & mask
+        while True:
+            slot_key, value = _HSH_SLOT.unpack_from(self.hsh, _HSH_HEADER.size + i * _HSH_SLOT.size)
+            if value == 0:
+                return None
+            if slot_key == key:
+                return value - 1
+            i = (i + 1) & mask
+
+    def close(self) -> None:
+        for m in (self.dat, self.idx, self.hsh):
+            m.close()
+        for f in self._files:
+            f.close()
+
+
+class SegmentStore:
+    """冷区块归档：只追加的压缩段文件 + 内存映射的定长索引。
+
+    每个段覆盖连续的区块号 [start, end]，由三个文件组成：
+    - seg-{start}.dat：每个区块一条 zlib 压缩的 JSON 记录（区块头 + 交易列表）；
+    - seg-{start}.idx：每个区块一条定长 (偏移, 长度)，按区块号 O(1) 定位；
+    - seg-{start}.hsh：区块哈希 / 交易哈希 -> 区块号 的开放寻址哈希表，O(1) 查找；
+    - seg-{start}.blm：同一批 key 的布隆过滤器，常驻内存（约每个 key 1.25 字节）。
+    segments.json 为段清单，段文件全部落盘后才原子更新清单，读取方只会看到完整的段。
+    清单文件的 mtime 变化时（其他进程完成归档）自动重新加载。
+
+    按哈希查找时先查各段的布隆过滤器（纯内存位运算），只打开可能命中的段（误判率约 1%），
+    不会逐段打开文件。打开的段（每段 3 个 mmap / 文件描述符）按 LRU 最多保留 max_open 个，
+    淘汰时关闭，文件描述符数量不随归档规模增长。
+    """
+
+    def __init__(self, root: str, max_open: int = 32) -> None:
+        self.root = root
+        self.max_open = max(1, max_open)
+        self._lock = threading.Lock()
+        self._manifest: Dict[str, Any] = {"segments": [], "blocks": 0, "transactions": 0}
+        self._manifest_mtime: Optional[float] = None
+        self._starts: List[int] = []
+        self._segments: "OrderedDict[int, _Segment]" = OrderedDict()
+        self._blooms: Dict[int, _Bloom] = {}
+
+    # ---------- 清单 ----------
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_FILE)
+
+    def manifest(self) -> Dict[str, Any]:
+        try:
+            mtime = os.stat(self._manifest_path()).st_mtime
+        except FileNotFoundError:
+            return self._manifest
+        if mtime != self._manifest_mtime:
+            with self._lock:
+                with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                    self._manifest = json.load(f)
+                self._manifest_mtime = mtime
+                self._starts = [seg["start"] for seg in self._manifest["segments"]]
+        return self._manifest
+
+    @property
+    def archived_end(self) -> int:
+        """已归档的最大区块号，未归档时为 -1"""
+        segments = self.manifest()["segments"]
+        return segments[-1]["end"] if segments else -1
+
+    @property
+    def archived_start(self) -> Optional[int]:
+        segments = self.manifest()["segments"]
+        return segments[0]["start"] if segments else None
+
+    def totals(self) -> Tuple[int, int]:
+        """(已归档区块数, 已归档交易数)"""
+        manifest = self.manifest()
+        return manifest["blocks"], manifest["transactions"]
+
+    def contains(self, block_number: int) -> bool:
+        start = self.archived_start
+        return start is not None and start <= block_number <= self.archived_end
+
+    # ---------- 写入 ----------
+
+    def write_segment(self, start: int, end: int, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """写入一个段并追加到清单；records 为按区块号升序的 {"header": {...}, "transactions": [...]}"""
+        os.makedirs(self.root, exist_ok=True)
+        if start <= self.archived_end:
+            raise ValueError(f"segment {start}-{end} overlaps archived blocks")
+
+        by_number = {record["header"]["block_number"]: record for record in records}
+        dat = bytearray()
+        idx = bytearray()
+        keys: List[Tuple[bytes, int]] = []
+        transactions = 0
+        for block_number in range(start, end + 1):
+            record = by_number.get(block_number)
+            if record is None:
+                idx += _IDX.pack(0, 0)
+                continue
+            blob = zlib.compress(
+                json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            )
+            idx += _IDX.pack(len(dat), len(blob))
+            dat += blob
+            keys.append((_hash_key(KIND_BLOCK, record["header"]["block_hash"]), block_number))
+            for tx in record["transactions"]:
+                keys.append((_hash_key(KIND_TRANSACTION, tx["transaction_hash"]), block_number))
+            transactions += len(record["transactions"])
+
+        name = f"seg-{start:010d}"
+        base = os.path.join(self.root, name)
+        _atomic_write(base + ".dat", bytes(dat))
+        _atomic_write(base + ".idx", bytes(idx))
+        _atomic_write(base + ".hsh", _build_hash_table(keys))
+        _atomic_write(base + ".blm", _build_bloom(keys))
+
+        meta = {
+            "start": start,
+            "end": end,
+            "file": name,
+            "blocks": len(records),
+            "transactions": transactions,
+            "bytes": len(dat),
+        }
+        manifest = json.loads(json.dumps(self.manifest()))
+        manifest["segments"].append(meta)
+        manifest["blocks"] += meta["blocks"]
+        manifest["transactions"] += transactions
+        _atomic_write(self._manifest_path(), json.dumps(manifest, indent=1).encode("utf-8"))
+        return meta
+
+    # ---------- 读取 ----------
+
+    def _meta_for(self, block_number: int) -> Optional[Dict[str, Any]]:
+        self.manifest()
+        i = bisect_right(self._starts, block_number) - 1
+        if i < 0:
+            return None
+        meta = self._manifest["segments"][i]
+        return meta if block_number <= meta["end"] else None
+
+    def _open_locked(self, meta: Dict[str, Any]) -> _Segment:
+        """取出（必要时打开）段并标记为最近使用，超出 max_open 时关闭最久未用的段；调用方持有 _lock"""
+        segment = self._segments.get(meta["start"])
+        if segment is None:
+            segment = _Segment(self.root, meta)
+            self._segments[meta["start"]] = segment
+            while len(self._segments) > self.max_open:
+                _, evicted = self._segments.popitem(last=False)
+                evicted.close()
+        else:
+            self._segments.move_to_end(meta["start"])
+        return segment
+
+    def _bloom(self, meta: Dict[str, Any]) -> _Bloom:
+        """段的布隆过滤器（常驻内存）；早于布隆过滤器的旧段由 .hsh 中的 key 补建 .blm"""
+        bloom = self._blooms.get(meta["start"])
+        if bloom is None:
+            base = os.path.join(self.root, meta["file"])
+            try:
+                with open(base + ".blm", "rb") as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                raw = _build_bloom(_read_hash_keys(base + ".hsh"))
+                _atomic_write(base + ".blm", raw)
+            bloom = self._blooms[meta["start"]] = _Bloom(raw)
+        return bloom
+
+    def read_block(self, block_number: int) -> Optional[Dict[str, Any]]:
+        meta = self._meta_for(block_number)
+        if meta is None:
+            return None
+        # 读取在锁内完成，避免段在读取过程中被 LRU 淘汰关闭
+        with self._lock:
+            return self._open_locked(meta).read(block_number)
+
+    def find_block_number(self, kind: bytes, value: str) -> Optional[int]:
+        """按区块哈希 / 交易哈希查找所在区块号：布隆过滤器排除后只查可能命中的段"""
+        key = _hash_key(kind, value)
+        for meta in reversed(self.manifest()["segments"]):
+            if key not in self._bloom(meta):
+                continue
+            with self._lock:
+                block_number = self._open_locked(meta).lookup(key)
+            if block_number is not None:
+                return block_number
+        return None
+
+    def find_transaction(self, transaction_hash: str) -> Optional[Dict[str, Any]]:
+        block_number = self.find_block_number(KIND_TRANSACTION, transaction_hash)
+        if block_number is None:
+            return None
+        record = self.read_block(block_number) or {"transactions": []}
+        for tx in record["transactions"]:
+            if tx["transaction_hash"].lower() == transaction_hash.lower():
+                return tx
+        return None
+
+    def iter_blocks(self, start: Optional[int] = None, end: Optional[int] = None,
+                    reverse: bool = False) -> Iterator[Dict[str, Any]]:
+        first, last = self.archived_start, self.archived_end
+        if first is None:
+            return
+        start = first if start is None else max(start, first)
+        end = last if end is None else min(end, last)
+        numbers = range(end, start - 1, -1) if reverse else range(start, end + 1)
+        for block_number in numbers:
+            record = self.read_block(block_number)
+            if record is not None:
+                yield record
+
+    @property
+    def open_segments(self) -> int:
+        return len(self._segments)
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments.values():
+                segment.close()
+            self._segments.clear()
@@ -0,0 +1,204 @@
+# app/core/shared_state.py
+import os
+import struct
+import tempfile
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Optional
+
+try:  # 仅 POSIX 提供 fcntl，用于跨进程的写者互斥
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+# 固定布局：8 字节序号 + 定长负载
+# seq 为奇数表示写入进行中；读者看到前后两次相同的偶数 seq 才认为读到了完整数据
+# 哈希 / 地址列最多 64 个字符，按 UTF-8 最坏情况每字符 4 字节留出 256 字节；时间戳为 ISO 格式
+_TEXT_SIZES = {
+    "latest_block_hash": 256,
+    "latest_previous_hash": 256,
+    "latest_miner_address": 256,
+    "latest_timestamp": 40,
+}
+_SEQ = struct.Struct("<Q")
+_PAYLOAD = struct.Struct("<qqqqqqd256s256s256s40s")
+# 布局变化时递增，拼进共享段名称，避免新旧版本 worker 挂载同一块大小不同的段
+LAYOUT_VERSION = 2
+_FIELDS = (
+    "total_blocks",
+    "total_transactions",
+    "pending_pool_size",
+    "difficulty",
+    "latest_block_number",
+    "latest_transactions_count",
+    "updated_at",
+    "latest_block_hash",
+    "latest_previous_hash",
+    "latest_miner_address",
+    "latest_timestamp",
+)
+_TEXT_FIELDS = set(_TEXT_SIZES)
+SEGMENT_SIZE = _SEQ.size + _PAYLOAD.size
+
+
+def _encode_text(field: str, value: Optional[str]) -> bytes:
+    raw = (value or "").encode("utf-8")
+    if len(raw) > _TEXT_SIZES[field]:
+        # 截断会让其他 worker 读到错误的哈希 / 地址，直接拒绝
+        raise ValueError(f"{field} is {len(raw)} bytes, limit is {_TEXT_SIZES[field]}")
+    return raw
+
+
+def _decode_text(raw: bytes) -> str:
+    return raw.rstrip(b"\x00").decode("utf-8", errors="ignore")
+
+
+class SharedChainState:
+    """跨进程共享的链头状态（multiprocessing.shared_memory + seqlock）。
+
+    多个 uvicorn worker 挂载同一块共享内存：
+    - 写者（挖矿 / 交易池路径）持有文件锁，先把 seq 置为奇数，写入负载，再置为偶数；
+    - 读者无锁：读 seq → 拷贝负载 → 再读 seq，两次相同且为偶数才返回，否则重试；
+    - seq == 0 表示尚未有任何进程写入（需要从数据库预热）。
+    """
+
+    def __init__(self, name: str, read_retries: int = 100) -> None:
+        self.name = f"{name}_v{LAYOUT_VERSION}"
+        self.read_retries = read_retries
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.name, create=True, size=SEGMENT_SIZE)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=self.name, create=False)
+        # 段的生命周期跨越单个 worker：不交给 resource_tracker 在进程退出时回收，
+        # 否则任一 worker 重启都会把其他 worker 仍在使用的段 unlink 掉
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        except Exception:
+            pass
+
+        self._buf = self._shm.buf
+        self._thread_lock = threading.Lock()
+        self._lock_path = os.path.join(tempfile.gettempdir(), f"{self.name}.lock")
+
+    # ---------- 读 ----------
+
+    @property
+    def seq(self) -> int:
+        return _SEQ.unpack_from(self._buf, 0)[0]
+
+    def _unpack(self, raw: bytes, seq: int) -> Dict[str, Any]:
+        state = dict(zip(_FIELDS, _PAYLOAD.unpack(raw)))
+        for field in _TEXT_FIELDS:
+            state[field] = _decode_text(state[field])
+        state["seq"] = seq
+        return state
+
+    def read(self) -> Optional[Dict[str, Any]]:
+        """无锁读取；未初始化或多次重试仍与写者冲突时返回 None"""
+        for _ in range(self.read_retries):
+            before = _SEQ.unpack_from(self._buf, 0)[0]
+            if before == 0:
+                return None
+            if before & 1:
+                time.sleep(0)
+                continue
+            raw = bytes(self._buf[_SEQ.size:SEGMENT_SIZE])
+            after = _SEQ.unpack_from(self._buf, 0)[0]
+            if before == after:
+                return self._unpack(raw, before)
+        return None
+
+    # ---------- 写 ----------
+
+    def _acquire(self):
+        self._thread_lock.acquire()
+        fd = None
+        if fcntl is not None:
+            fd = os.open(self._lock_path, os.O_CREAT | os.O_RDWR, 0o600)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+    def _release(self, fd) -> None:
+        try:
+            if fd is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+        finally:
+            self._thread_lock.release()
+
+    def _write_locked(self, state: Dict[str, Any]) -> int:
+        values = []
+        for field in _FIELDS:
+            value = state.get(field)
+            if field in _TEXT_FIELDS:
+                values.append(_encode_text(field, value))
+            elif field == "updated_at":
+                values.append(float(time.time()))
+            else:
+                values.append(int(value if value is not None else 0))
+        payload = _PAYLOAD.pack(*values)
+
+        seq = _SEQ.unpack_from(self._buf, 0)[0]
+        if seq & 1:
+            # 上一个写者在写入中途退出，跳过这个残留的奇数序号
+            seq += 1
+        _SEQ.pack_into(self._buf, 0, seq + 1)
+        self._buf[_SEQ.size:SEGMENT_SIZE] = payload
+        _SEQ.pack_into(self._buf, 0, seq + 2)
+        return seq + 2
+
+    def write(self, state: Dict[str, Any], expected_seq: Optional[int] = None) -> Optional[int]:
+        """整体覆盖写入，返回新的 seq。
+
+        指定 expected_seq 时为条件写入：在写者锁内确认 seq 仍等于 expected_seq 才写入，
+        否则说明期间有其他写者发布过（例如另一个 worker 的预热或增量），放弃写入并返回 None。
+        """
+        fd = self._acquire()
+        try:
+            if expected_seq is not None and _SEQ.unpack_from(self._buf, 0)[0] != expected_seq:
+                return None
+            return self._write_locked(state)
+        finally:
+            self._release(fd)
+
+    def update(self, fn: Callable[[Dict[str, Any]], None]) -> Optional[Dict[str, Any]]:
+        """在写者锁内读-改-写（用于计数增量），返回写入后的状态。
+
+        段尚未初始化（seq == 0）时不写入并返回 None，由调用方先从数据库预热。
+        """
+        fd = self._acquire()
+        try:
+            seq = _SEQ.unpack_from(self._buf, 0)[0]
+            if seq == 0:
+                return None
+            # 持有写者锁时不会有并发写入，直接读取当前负载
+            state = self._unpack(bytes(self._buf[_SEQ.size:SEGMENT_SIZE]), seq)
+            fn(state)
+            state["seq"] = self._write_locked(state)
+            return state
+        finally:
+            self._release(fd)
+
+    def reset(self) -> None:
+        """把 seq 清零，标记为未初始化（所有读者回退到数据库预热）"""
+        fd = self._acquire()
+        try:
+            _SEQ.pack_into(self._buf, 0, 0)
+        finally:
+            self._release(fd)
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        # __init__ 中已从 resource_tracker 注销，SharedMemory.unlink 会再次注销，这里先补登记
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.register(self._shm._name, "shared_memory")
+        except Exception:
+            pass
+        self._shm.unlink()
@@ -0,0 +1,19 @@
+# app/core/upsert.py
+from typing import Any, Dict, Sequence
+
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+
+def upsert(dialect_name: str, model, row: Dict[str, Any], values: Dict[str, Any], index_elements: Sequence[Any]):
+    """按唯一键 upsert：MySQL 用 INSERT ... ON DUPLICATE KEY UPDATE，SQLite（测试）用 ON CONFLICT DO UPDATE。
+
+    values 中引用模型列的表达式取的是已有行的值（如 count = count + :delta），
+    并发写入同一个唯一键时不会出现“都没更新到 → 都插入 → 唯一键冲突”。
+    upsert 不触发 ORM 的 onupdate，需要时由调用方写进 values。
+    """
+    if dialect_name == "sqlite":
+        return sqlite_insert(model).values(**row).on_conflict_do_update(
+            index_elements=list(index_elements), set_=values
+        )
+    return mysql_insert(model).values(**row).on_duplicate_key_update(**values)
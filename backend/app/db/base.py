@@ -44,6 +44,9 @@ from app.db.models.donation import Donation, TransactionStatus
 from app.db.models.projects import Project, ProjectStatus
 from app.db.models.fund_usage import FundUsage
 from app.db.models.project_update import ProjectUpdate
+from app.db.models.donation_stats import DonationStat
+from app.db.models.donation_trend import DonationTrendBucket
+from app.db.models.donor_sketch import DonorSketch
 
 
 # FastAPI dependency helper
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Index
 from sqlalchemy.sql import func
+from app.core.payload_codec import PayloadType
+from app.core.hex_binary import HexBinary
 from app.db.base import Base
 
 
@@ -8,30 +10,39 @@ class Block(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     block_number = Column(Integer, unique=True, nullable=False)
-    block_hash = Column(String(64), unique=True, nullable=False)
-    previous_hash = Column(String(64), nullable=False)
-    merkle_root = Column(String(64), nullable=False)
+    block_hash = Column(HexBinary(64), unique=True, nullable=False)
+    previous_hash = Column(HexBinary(64), nullable=False)
+    merkle_root = Column(HexBinary(64), nullable=False)
     nonce = Column(Integer, nullable=False)
     difficulty = Column(Integer, nullable=False)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
-    miner_address = Column(String(64), nullable=False)
+    miner_address = Column(HexBinary(64), nullable=False)
     reward = Column(Float, default=0.0)
     transaction_count = Column(Integer, default=0)
 
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # 区块详情：按区块号取交易并按 id 分页
+        Index("ix_transactions_block_number_id", "block_number", "id"),
+        Index("ix_transactions_block_hash", "block_hash"),
+        # 交易浏览器筛选：类型 + 区块范围 / 确认时间范围 / 金额范围
+        Index("ix_transactions_type_block_id", "transaction_type", "block_number", "id"),
+        Index("ix_transactions_confirmed_at_id", "confirmed_at", "id"),
+        Index("ix_transactions_amount_id", "amount", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    transaction_hash = Column(String(64), unique=True, nullable=False)
-    from_address = Column(String(64), nullable=False)
-    to_address = Column(String(64), nullable=False)
+    transaction_hash = Column(HexBinary(64), unique=True, nullable=False)
+    from_address = Column(HexBinary(64), nullable=False)
+    to_address = Column(HexBinary(64), nullable=False)
     amount = Column(Float, nullable=False)
     transaction_type = Column(String(64), nullable=False)  # donation, project_creation, reward
-    block_hash = Column(String(64), nullable=True)
+    block_hash = Column(HexBinary(64), nullable=True)
     block_number = Column(Integer, nullable=True)
     gas_fee = Column(Float, default=0.0)
-    data = Column(Text, nullable=True)  # JSON格式的额外数据
+    data = Column(PayloadType, nullable=True)  # 额外数据（编码存储，见 app/core/payload_codec.py）
     is_confirmed = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     confirmed_at = Column(DateTime(timezone=True), nullable=True)
@@ -39,13 +50,52 @@ class Transaction(Base):
 
 class TransactionPool(Base):
     __tablename__ = "transaction_pool"
+    __table_args__ = (
+        # 交易池明细 keyset 分页：按 (created_at, id) 倒序
+        Index("ix_transaction_pool_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    transaction_hash = Column(String(64), unique=True, nullable=False)
-    from_address = Column(String(64), nullable=False)
-    to_address = Column(String(64), nullable=False)
+    transaction_hash = Column(HexBinary(64), unique=True, nullable=False)
+    from_address = Column(HexBinary(64), nullable=False)
+    to_address = Column(HexBinary(64), nullable=False)
     amount = Column(Float, nullable=False)
     gas_fee = Column(Float, nullable=False)
-    data = Column(Text, nullable=True)
+    data = Column(PayloadType, nullable=True)
     priority_score = Column(Float, nullable=False)  # 基于gas费用的优先级分数
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class AddressLedgerEntry(Base):
+    """地址流水索引：每笔链上交易为转出方、转入方各写一行，区块提交时按交易顺序写入"""
+    __tablename__ = "address_ledger"
+    __table_args__ = (
+        # 地址流水 keyset 分页：按 (address, id) 倒序
+        Index("ix_address_ledger_address_id", "address", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    address = Column(HexBinary(64), nullable=False)
+    block_number = Column(Integer, nullable=False)
+    transaction_id = Column(Integer, nullable=False)
+    transaction_hash = Column(HexBinary(64), nullable=False)
+    transaction_type = Column(String(64), nullable=False)
+    direction = Column(String(8), nullable=False)  # in / out
+    counterparty = Column(HexBinary(64), nullable=False)
+    amount = Column(Float, nullable=False)
+    gas_fee = Column(Float, default=0.0)
+    balance_after = Column(Float, nullable=False)  # 本条流水之后的地址余额
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class AddressBalance(Base):
+    """地址当前余额（链上净流入）与流水汇总，每个地址一行"""
+    __tablename__ = "address_balances"
+
+    id = Column(Integer, primary_key=True, index=True)
+    address = Column(HexBinary(64), unique=True, nullable=False)
+    balance = Column(Float, nullable=False, default=0.0)
+    total_in = Column(Float, nullable=False, default=0.0)
+    total_out = Column(Float, nullable=False, default=0.0)
+    tx_count = Column(Integer, nullable=False, default=0)
+    last_block_number = Column(Integer, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
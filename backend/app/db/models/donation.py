@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from app.core.hex_binary import HexBinary
 from enum import Enum
 from app.db.base import Base
 
@@ -15,14 +16,19 @@ class TransactionStatus(str, Enum):
 
 class Donation(Base):
     __tablename__ = "donations"
+    __table_args__ = (
+        # 最新捐赠 / 我的捐赠 keyset 分页：按 (created_at, id) 倒序
+        Index("ix_donations_created_at_id", "created_at", "id"),
+        Index("ix_donations_donor_created_at_id", "donor_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     amount = Column(Float, nullable=False)
     donor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     status = Column(String(64), default=TransactionStatus.PENDING.value)
-    transaction_hash = Column(String(64), unique=True, nullable=True)
-    block_hash = Column(String(64), nullable=True)
+    transaction_hash = Column(HexBinary(64), unique=True, nullable=True)
+    block_hash = Column(HexBinary(64), nullable=True)
     block_number = Column(Integer, nullable=True)
     gas_fee = Column(Float, default=0.0)
     is_anonymous = Column(Boolean, default=False)
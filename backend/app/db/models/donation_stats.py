@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, DateTime, Float
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+# project_id 取 0 表示全平台汇总行
+PLATFORM_PROJECT_ID = 0
+
+
+class DonationStat(Base):
+    """已确认捐赠的汇总行（每个项目一行 + 全平台一行），在区块提交时增量维护"""
+    __tablename__ = "donation_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, unique=True, nullable=False)
+    donation_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    min_amount = Column(Float, nullable=True)
+    max_amount = Column(Float, nullable=True)
+    last_donation_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
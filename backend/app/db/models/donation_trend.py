@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, UniqueConstraint
+from app.db.base import Base
+
+
+class DonationTrendBucket(Base):
+    """捐赠时间序列预聚合桶（minute / hour / day），project_id 取 0 表示全平台"""
+    __tablename__ = "donation_trend_buckets"
+    __table_args__ = (
+        UniqueConstraint("project_id", "granularity", "bucket_start", name="uq_donation_trend_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, nullable=False)
+    granularity = Column(String(8), nullable=False)  # minute / hour / day
+    bucket_start = Column(DateTime, nullable=False)  # 北京时间，按粒度向下取整
+    donation_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    total_gas_fee = Column(Float, nullable=False, default=0.0)
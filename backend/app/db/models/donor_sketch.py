@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+# period 取值：ALL_PERIOD 表示累计，否则为北京时间日期 YYYY-MM-DD
+ALL_PERIOD = "all"
+
+
+class DonorSketch(Base):
+    """捐赠者去重 HyperLogLog 草图（project_id 取 0 表示全平台），按累计 + 按天各保存一份"""
+    __tablename__ = "donor_sketches"
+    __table_args__ = (
+        UniqueConstraint("project_id", "period", name="uq_donor_sketch"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, nullable=False)
+    period = Column(String(10), nullable=False)
+    sketch = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, ForeignKey, Numeric, String, Text, DateTime, func
+from app.core.hex_binary import HexBinary
 
 from app.db.base import Base
 class FundUsage(Base):
@@ -17,8 +18,8 @@ class FundUsage(Base):
     evidence_hash = Column(String(64), nullable=True)        # 凭证文件哈希，用于链上校验
 
     # 区块链相关
-    transaction_hash = Column(String(64), unique=True, nullable=True)
-    block_hash = Column(String(64), nullable=True)
+    transaction_hash = Column(HexBinary(64), unique=True, nullable=True)
+    block_hash = Column(HexBinary(64), nullable=True)
     block_number = Column(Integer, nullable=True)
     gas_fee = Column(Numeric(18, 8), default=0)
 
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, ForeignKey, Numeric, String, Text, DateTime, func
+from app.core.hex_binary import HexBinary
 
 from app.db.base import Base
 class ProjectUpdate(Base):
@@ -13,8 +14,8 @@ class ProjectUpdate(Base):
     attachments_hash = Column(String(64), nullable=True)# 附件打包后的哈希
 
     # 上链信息
-    transaction_hash = Column(String(64), unique=True, nullable=True)
-    block_hash = Column(String(64), nullable=True)
+    transaction_hash = Column(HexBinary(64), unique=True, nullable=True)
+    block_hash = Column(HexBinary(64), nullable=True)
     block_number = Column(Integer, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
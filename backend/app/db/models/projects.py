@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from app.core.hex_binary import HexBinary
 from enum import Enum
 from app.db.base import Base
 
@@ -24,8 +25,8 @@ class Project(Base):
     current_amount = Column(Float, default=0.0)
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     status = Column(String(64), default=ProjectStatus.PENDING.value)
-    blockchain_address = Column(String(64), unique=True, nullable=True)
-    blockchain_tx_hash = Column(String(64), unique=True, nullable=True)
+    blockchain_address = Column(HexBinary(64), unique=True, nullable=True)
+    blockchain_tx_hash = Column(HexBinary(64), unique=True, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     approved_at = Column(DateTime(timezone=True), nullable=True)
     on_chain_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,5 +1,6 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Numeric
 from sqlalchemy.sql import func
+from app.core.hex_binary import HexBinary
 from app.db.base import Base
 
 
@@ -12,7 +13,7 @@ class User(Base):
     hash_passwd = Column(String(255), nullable=False)
 
     # 区块链钱包地址
-    wallet_address = Column(String(64), unique=True, index=True, nullable=False)
+    wallet_address = Column(HexBinary(64), unique=True, index=True, nullable=False)
 
     # 状态 & 权限
     is_active = Column(Boolean, default=True)
@@ -1,8 +1,17 @@
+import asyncio
+
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import auth, block_chain,donations, projects
-from app.db.base import get_session
+from app.api.v1 import auth, block_chain,donations, projects, rankings as rankings_api, events, dashboard, export, analytics
+from app.db.base import get_session, async_session
 from app.services.block_chain import BlockchainService
+from app.core.config import settings
+from app.core.shared_state import SharedChainState
+from app.services.chain_state import chain_tip
+from app.services.rankings import rankings, reconcile_periodically
+from app.services.donation_feed import donation_feed
+from app.services.donation_trend import compact_periodically
+from app.services.search import explorer_search
 
 app = FastAPI(title="Donate Chain API", version="0.1.0")
 
@@ -13,6 +22,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # keyset 分页的下一页游标放在响应头中，需显式暴露给浏览器
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -23,11 +34,70 @@ app.include_router(auth.router)
 app.include_router(block_chain.router)
 app.include_router(donations.router)
 app.include_router(projects.router)
+app.include_router(rankings_api.router)
+app.include_router(events.router)
+app.include_router(dashboard.router)
+app.include_router(export.router)
+app.include_router(analytics.router)
 # app.include_router(apps.router)
 # app.include_router(compare.router)
 # app.include_router(predict.router)
 # app.include_router(ads_hive.router)
 
+@app.on_event("startup")
+async def warm_chain_state():
+    """启动时预热链头状态，失败时不阻塞启动（首次读取时会再次尝试）"""
+    if settings.chain_state_shm_name:
+        try:
+            chain_tip.attach_shared(SharedChainState(settings.chain_state_shm_name))
+        except Exception as e:
+            print("ERROR: attach shared chain state failed:", e)
+
+    try:
+        async with async_session() as db:
+            await chain_tip.warm(db)
+    except Exception as e:
+        print("ERROR: warm chain state failed:", e)
+
+
+@app.on_event("startup")
+async def warm_rankings():
+    """启动时从数据库加载排行榜，并启动定期对账任务"""
+    try:
+        async with async_session() as db:
+            await rankings.reconcile(db)
+    except Exception as e:
+        print("ERROR: warm rankings failed:", e)
+
+    asyncio.create_task(reconcile_periodically(async_session))
+
+
+@app.on_event("startup")
+async def start_trend_compaction():
+    """启动趋势桶的后台压缩任务（不在出块事务中压缩）"""
+    asyncio.create_task(compact_periodically(async_session))
+
+
+@app.on_event("startup")
+async def warm_donation_feed():
+    """启动时加载最新捐赠流缓冲区，失败时由首次读取重新加载"""
+    try:
+        async with async_session() as db:
+            await donation_feed.warm(db)
+    except Exception as e:
+        print("ERROR: warm donation feed failed:", e)
+
+
+@app.on_event("startup")
+async def warm_explorer_search():
+    """启动时加载区块浏览器搜索索引，失败时由首次搜索重新加载"""
+    try:
+        async with async_session() as db:
+            await explorer_search.warm(db)
+    except Exception as e:
+        print("ERROR: warm explorer search failed:", e)
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
@@ -38,6 +38,8 @@ class ProjectResponse(ProjectBase):
     created_at: datetime
     approved_at: Optional[datetime] = None
     on_chain_at: Optional[datetime] = None
+    # 去重捐赠人数（HyperLogLog 估计值，列表与详情接口填充）
+    unique_donors: Optional[int] = None
 
     class Config:
         orm_mode = True
@@ -0,0 +1,204 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.block_chain import AddressBalance, AddressLedgerEntry, Transaction
+from app.services.explorer import archive_store
+
+# 全量重建时每批处理的交易数
+REBUILD_BATCH_SIZE = 1000
+
+
+def serialize_ledger_entry(entry: AddressLedgerEntry) -> Dict[str, Any]:
+    return {
+        "id": entry.id,
+        "block_number": entry.block_number,
+        "transaction_hash": entry.transaction_hash,
+        "transaction_type": entry.transaction_type,
+        "direction": entry.direction,
+        "counterparty": entry.counterparty,
+        "amount": entry.amount,
+        "gas_fee": entry.gas_fee,
+        "balance_after": entry.balance_after,
+        "created_at": entry.created_at.isoformat() if entry.created_at else None,
+    }
+
+
+class AddressLedgerService:
+    """地址流水索引与余额（address_ledger / address_balances）。
+
+    - 区块提交时按交易顺序为转出方写一条 out（金额 + Gas 费）、为转入方写一条 in（金额），
+      并记录每条流水之后的余额，与区块同一事务提交；
+    - 余额为链上净流入（本链没有铸币交易，捐赠地址的余额为负数表示累计转出）；
+    - 当前余额读取 address_balances 单行，流水按 (address, id) 索引 keyset 分页，
+      不再扫描 transactions 的 from_address / to_address。
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _load_balances(self, addresses: Iterable[str]) -> Dict[str, AddressBalance]:
+        addresses = set(addresses)
+        if not addresses:
+            return {}
+        result = await self.db.execute(
+            select(AddressBalance)
+            .where(AddressBalance.address.in_(addresses))
+            # 并发出块时串行化同一地址的余额更新
+            .with_for_update()
+        )
+        return {row.address: row for row in result.scalars().all()}
+
+    def _post(self, balances: Dict[str, AddressBalance], tx: Transaction, address: str,
+              direction: str, counterparty: str) -> AddressLedgerEntry:
+        balance = balances.get(address)
+        if balance is None:
+            balance = AddressBalance(address=address, balance=0.0, total_in=0.0, total_out=0.0, tx_count=0)
+            balances[address] = balance
+            self.db.add(balance)
+
+        amount = float(tx.amount or 0)
+        gas_fee = float(tx.gas_fee or 0)
+        if direction == "in":
+            balance.balance = (balance.balance or 0.0) + amount
+            balance.total_in = (balance.total_in or 0.0) + amount
+        else:
+            balance.balance = (balance.balance or 0.0) - amount - gas_fee
+            balance.total_out = (balance.total_out or 0.0) + amount + gas_fee
+        balance.tx_count = (balance.tx_count or 0) + 1
+        balance.last_block_number = tx.block_number
+
+        entry = AddressLedgerEntry(
+            address=address,
+            block_number=tx.block_number,
+            transaction_id=tx.id,
+            transaction_hash=tx.transaction_hash,
+            transaction_type=tx.transaction_type,
+            direction=direction,
+            counterparty=counterparty,
+            amount=amount,
+            gas_fee=gas_fee if direction == "out" else 0.0,
+            balance_after=balance.balance,
+        )
+        self.db.add(entry)
+        return entry
+
+    def _post_transactions(self, balances: Dict[str, AddressBalance],
+                           transactions: List[Transaction]) -> List[AddressLedgerEntry]:
+        entries = []
+        for tx in transactions:
+            entries.append(self._post(balances, tx, tx.from_address, "out", tx.to_address))
+            entries.append(self._post(balances, tx, tx.to_address, "in", tx.from_address))
+        return entries
+
+    async def apply_block(self, transactions: List[Transaction]) -> None:
+        """写入本区块交易的地址流水（交易须已 flush 拿到 id；不提交，由区块提交统一 commit）"""
+        if not transactions:
+            return
+        addresses = {tx.from_address for tx in transactions} | {tx.to_address for tx in transactions}
+        balances = await self._load_balances(addresses)
+        self._post_transactions(balances, transactions)
+        await self.db.flush()
+
+    # ---------- 读取 ----------
+
+    async def get_balance(self, address: str) -> Optional[AddressBalance]:
+        result = await self.db.execute(select(AddressBalance).where(AddressBalance.address == address))
+        return result.scalars().first()
+
+    async def get_entries(self, address: str, limit: int = 20,
+                          before_id: Optional[int] = None) -> List[AddressLedgerEntry]:
+        """按流水 id 倒序（即区块 / 交易顺序倒序）分页"""
+        stmt = (
+            select(AddressLedgerEntry)
+            .where(AddressLedgerEntry.address == address)
+            .order_by(AddressLedgerEntry.id.desc())
+            .limit(limit)
+        )
+        if before_id is not None:
+            stmt = stmt.where(AddressLedgerEntry.id < before_id)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    # ---------- 重建 ----------
+
+    async def _flush_entries(self, entries: List[AddressLedgerEntry]) -> None:
+        await self.db.flush()
+        for entry in entries:
+            self.db.expunge(entry)
+
+    async def _rebuild_archived(self, balances: Dict[str, AddressBalance]) -> int:
+        """先按区块顺序回放已归档段中的交易（构造不入会话的 Transaction 对象）"""
+        processed = 0
+        pending: List[AddressLedgerEntry] = []
+        for record in archive_store.iter_blocks():
+            batch = [
+                Transaction(
+                    id=tx["id"],
+                    transaction_hash=tx["transaction_hash"],
+                    from_address=tx["from_address"],
+                    to_address=tx["to_address"],
+                    amount=tx["amount"],
+                    transaction_type=tx["transaction_type"],
+                    block_number=tx["block_number"],
+                    gas_fee=tx["gas_fee"],
+                )
+                for tx in record["transactions"]
+            ]
+            pending.extend(self._post_transactions(balances, batch))
+            processed += len(batch)
+            if len(pending) >= REBUILD_BATCH_SIZE:
+                await self._flush_entries(pending)
+                pending = []
+        await self._flush_entries(pending)
+        return processed
+
+    async def rebuild(self) -> int:
+        """按 (block_number, id) 顺序从归档段与 transactions 全量重建流水与余额，返回处理的交易数"""
+        await self.db.execute(delete(AddressLedgerEntry))
+        await self.db.execute(delete(AddressBalance))
+
+        balances: Dict[str, AddressBalance] = {}
+        processed = await self._rebuild_archived(balances)
+        last_key = None
+        while True:
+            stmt = (
+                select(Transaction)
+                .where(Transaction.block_number.is_not(None))
+                .order_by(Transaction.block_number, Transaction.id)
+                .limit(REBUILD_BATCH_SIZE)
+            )
+            if last_key is not None:
+                block_number, tx_id = last_key
+                stmt = stmt.where(
+                    (Transaction.block_number > block_number)
+                    | ((Transaction.block_number == block_number) & (Transaction.id > tx_id))
+                )
+            batch = list((await self.db.execute(stmt)).scalars().all())
+            if not batch:
+                break
+            entries = self._post_transactions(balances, batch)
+            await self.db.flush()
+            # 已写出的交易与流水不再需要跟踪，只保留余额行，避免会话随历史长度膨胀
+            for obj in batch + entries:
+                self.db.expunge(obj)
+            processed += len(batch)
+            last_key = (batch[-1].block_number, batch[-1].id)
+
+        await self.db.commit()
+        return processed
+
+
+async def _rebuild() -> None:
+    from app.db.base import async_session
+
+    async with async_session() as db:
+        count = await AddressLedgerService(db).rebuild()
+    print(f"address_ledger rebuilt: {count} transactions")
+
+
+if __name__ == "__main__":
+    # 全量重建：python -m app.services.address_ledger
+    asyncio.run(_rebuild())
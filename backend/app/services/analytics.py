@@ -0,0 +1,152 @@
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖：只有分析接口需要
+    np = None
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.lake import Lake, require_pyarrow
+from app.services.lake_export import default_lake
+
+PERCENTILES = (50, 90, 95, 99)
+
+# 分析结果缓存：key 带上数据湖水位，水位推进后旧结果自然不再命中，由 LRU 淘汰
+_result_cache = LRUCache(maxsize=settings.analytics_cache_size)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("分析接口需要安装 numpy：pip install numpy")
+
+
+def _column(table, name: str) -> "np.ndarray":
+    """取出一列为 numpy 数组（单个 chunk 且无空值时为零拷贝视图）"""
+    column = table.column(name)
+    if column.num_chunks == 1:
+        column = column.chunk(0)
+    else:
+        column = column.combine_chunks()
+    return column.to_numpy(zero_copy_only=False)
+
+
+def _summary(values: "np.ndarray") -> Dict[str, Any]:
+    if values.size == 0:
+        return {"count": 0, "sum": 0.0, "mean": None, "min": None, "max": None,
+                "percentiles": {f"p{p}": None for p in PERCENTILES}}
+    quantiles = np.percentile(values, PERCENTILES)
+    return {
+        "count": int(values.size),
+        "sum": float(values.sum()),
+        "mean": float(values.mean()),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "percentiles": {f"p{p}": float(q) for p, q in zip(PERCENTILES, quantiles)},
+    }
+
+
+def _histogram(values: "np.ndarray", bins: int, log: bool = False) -> Dict[str, Any]:
+    if values.size == 0:
+        return {"edges": [], "counts": []}
+    low, high = float(values.min()), float(values.max())
+    if log and low > 0 and high > low:
+        edges = np.geomspace(low, high, bins + 1)
+    else:
+        edges = np.linspace(low, high if high > low else low + 1, bins + 1)
+    counts, edges = np.histogram(values, bins=edges)
+    return {"edges": edges.round(8).tolist(), "counts": counts.tolist()}
+
+
+class LakeAnalytics:
+    """基于列式数据湖（见 app.services.lake_export）的分析计算，不访问 MySQL。
+
+    - Arrow IPC 分区文件通过内存映射读取，只加载用到的列；
+    - 直方图、分位数、累计 / 滑动求和全部是 numpy 向量化运算，不逐行循环；
+    - 结果按 (水位, 指标, 参数) 缓存，数据湖导出推进水位后自动重新计算。
+    计算为 CPU 密集型同步代码，路由中通过 asyncio.to_thread 调用。
+    """
+
+    def __init__(self, lake: Optional[Lake] = None):
+        self.lake = lake or default_lake()
+
+    def watermark(self) -> int:
+        return int(self.lake.read_watermark().get("block_number", -1))
+
+    def _cached(self, name: str, params: Tuple, compute) -> Dict[str, Any]:
+        require_pyarrow()
+        _require_numpy()
+        watermark = self.watermark()
+        key = (self.lake.root, watermark, name, params)
+        cached = _result_cache.get(key)
+        if cached is not None:
+            return cached
+        result = dict(compute(), watermark=watermark)
+        _result_cache.put(key, result)
+        return result
+
+    # ---------- 指标 ----------
+
+    def gas_fees(self, bins: int = 20, transaction_type: Optional[str] = None) -> Dict[str, Any]:
+        """链上交易 Gas 费分布：汇总、分位数与等宽直方图"""
+        def compute():
+            table = self.lake.read_table("transactions", ["gas_fee", "transaction_type"])
+            fees = _column(table, "gas_fee").astype(np.float64, copy=False)
+            if transaction_type:
+                types = _column(table, "transaction_type")
+                fees = fees[types == transaction_type]
+            fees = fees[~np.isnan(fees)]
+            return {**_summary(fees), "histogram": _histogram(fees, bins)}
+
+        return self._cached("gas_fees", (bins, transaction_type), compute)
+
+    def donation_sizes(self, bins: int = 20, project_id: Optional[int] = None,
+                       log: bool = True) -> Dict[str, Any]:
+        """已确认捐赠金额分布；捐赠金额长尾明显，默认使用对数分箱"""
+        def compute():
+            table = self.lake.read_table("donations", ["amount", "project_id"])
+            amounts = _column(table, "amount").astype(np.float64, copy=False)
+            if project_id is not None:
+                amounts = amounts[_column(table, "project_id") == project_id]
+            return {**_summary(amounts), "histogram": _histogram(amounts, bins, log)}
+
+        return self._cached("donation_sizes", (bins, project_id, log), compute)
+
+    def funding_curve(self, project_id: int, window: int = 7) -> Dict[str, Any]:
+        """项目按天的已确认捐赠金额、累计金额与 window 天滑动求和（补零后的稠密序列）"""
+        def compute():
+            table = self.lake.read_table("donations", ["project_id", "amount", "confirmed_at"])
+            mask = _column(table, "project_id") == project_id
+            amounts = _column(table, "amount")[mask].astype(np.float64, copy=False)
+            days = _column(table, "confirmed_at")[mask].astype("datetime64[D]")
+            valid = ~np.isnat(days)
+            amounts, days = amounts[valid], days[valid]
+            if days.size == 0:
+                return {"project_id": project_id, "window": window, "dates": [],
+                        "amounts": [], "counts": [], "cumulative": [], "rolling": []}
+
+            first = days.min()
+            offsets = (days - first).astype(np.int64)
+            length = int(offsets.max()) + 1
+            daily = np.bincount(offsets, weights=amounts, minlength=length)
+            counts = np.bincount(offsets, minlength=length)
+            cumulative = np.cumsum(daily)
+            # 滑动窗口求和：cumulative[i] - cumulative[i - window]
+            rolling = cumulative.copy()
+            rolling[window:] -= cumulative[:-window]
+            dates = first + np.arange(length)
+            return {
+                "project_id": project_id,
+                "window": window,
+                "dates": [str(d) for d in dates],
+                "amounts": daily.round(8).tolist(),
+                "counts": counts.tolist(),
+                "cumulative": cumulative.round(8).tolist(),
+                "rolling": rolling.round(8).tolist(),
+            }
+
+        return self._cached("funding_curve", (project_id, window), compute)
+
+
+# 进程级单例
+lake_analytics = LakeAnalytics()
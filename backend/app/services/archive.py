@@ -0,0 +1,103 @@
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.lake import WATERMARK_FILE, Lake
+from app.core.segments import SegmentStore
+from app.db.models.block_chain import Block, Transaction
+from app.services.explorer import archive_store, serialize_block, serialize_transaction
+
+
+class BlockArchiveService:
+    """冷区块归档：把距链头超过 archive_depth 的区块及其交易移出 blocks / transactions 表，
+    写入 SegmentStore 的压缩段文件（每段 archive_segment_blocks 个区块）。
+
+    - 只归档完整的段；段文件与清单落盘后才删除数据库中的行，中途失败时
+      下次运行会先清理已归档但未删除的行，不会重复归档；
+    - 启用列式数据湖导出时，不归档水位之后的区块，避免导出方读不到数据；
+    - 归档后区块详情、区块列表、按哈希搜索与地址流水重建透明读取段文件。
+    """
+
+    def __init__(self, db: AsyncSession, store: Optional[SegmentStore] = None):
+        self.db = db
+        self.store = store or archive_store
+
+    async def _purge_archived(self) -> None:
+        """删除已归档区块在热表中残留的行"""
+        archived_end = self.store.archived_end
+        if archived_end < 0:
+            return
+        await self.db.execute(delete(Transaction).where(Transaction.block_number <= archived_end))
+        await self.db.execute(delete(Block).where(Block.block_number <= archived_end))
+        await self.db.commit()
+
+    def _cutoff(self, tip: int) -> int:
+        cutoff = tip - max(settings.archive_depth, 1)
+        if os.path.exists(os.path.join(settings.lake_dir, WATERMARK_FILE)):
+            lake_watermark = int(Lake(settings.lake_dir).read_watermark().get("block_number", -1))
+            cutoff = min(cutoff, lake_watermark)
+        return cutoff
+
+    async def _load_records(self, start: int, end: int) -> List[Dict[str, Any]]:
+        blocks = (await self.db.execute(
+            select(Block).where(Block.block_number.between(start, end)).order_by(Block.block_number)
+        )).scalars().all()
+        transactions = (await self.db.execute(
+            select(Transaction)
+            .where(Transaction.block_number.between(start, end))
+            .order_by(Transaction.block_number, Transaction.id)
+        )).scalars().all()
+
+        records = {block.block_number: {"header": serialize_block(block), "transactions": []} for block in blocks}
+        for tx in transactions:
+            record = records.get(tx.block_number)
+            if record is not None:
+                record["transactions"].append(serialize_transaction(tx))
+        return [records[number] for number in sorted(records)]
+
+    async def archive(self, max_segments: Optional[int] = None) -> Dict[str, Any]:
+        """归档所有满足深度要求的完整段，返回归档统计"""
+        await self._purge_archived()
+
+        tip = (await self.db.execute(select(func.max(Block.block_number)))).scalar()
+        first_hot = (await self.db.execute(select(func.min(Block.block_number)))).scalar()
+        if tip is None:
+            return {"segments": 0, "blocks": 0, "transactions": 0, "archived_end": self.store.archived_end}
+
+        cutoff = self._cutoff(tip)
+        size = settings.archive_segment_blocks
+        written = {"segments": 0, "blocks": 0, "transactions": 0}
+        while max_segments is None or written["segments"] < max_segments:
+            start = max(self.store.archived_end + 1, first_hot)
+            end = start + size - 1
+            if end > cutoff:
+                break
+            records = await self._load_records(start, end)
+            meta = self.store.write_segment(start, end, records)
+            await self._purge_archived()
+            # 已写出的区块与交易不再需要跟踪
+            self.db.expunge_all()
+
+            written["segments"] += 1
+            written["blocks"] += meta["blocks"]
+            written["transactions"] += meta["transactions"]
+
+        written["archived_end"] = self.store.archived_end
+        return written
+
+
+async def _archive() -> None:
+    from app.db.base import async_session
+
+    async with async_session() as db:
+        stats = await BlockArchiveService(db).archive()
+    print(f"block archive: {stats}")
+
+
+if __name__ == "__main__":
+    # 归档冷区块：python -m app.services.archive（可由 cron 定时执行）
+    asyncio.run(_archive())
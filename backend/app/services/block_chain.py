@@ -10,6 +10,9 @@ from app.db.models.block_chain import Block, Transaction, TransactionPool
 from app.db.models.donation import Donation, TransactionStatus
 from app.schemas.block_chain import TransactionData, BlockData, MiningResult
 from app.core.config import settings   # 这里的settings 是
+from app.core.payload_codec import decode_payload
+from app.services.chain_state import chain_tip
+from app.services.events import publish_tx_accepted
 import uuid
 
 
@@ -154,12 +157,14 @@ class BlockchainService:
                 to_address=transaction_data.to_address,
                 amount=transaction_data.amount,
                 gas_fee=transaction_data.gas_fee,
-                data=json.dumps(transaction_data.data) if transaction_data.data else None,
+                data=transaction_data.data if transaction_data.data else None,
                 priority_score=priority_score
             )
 
             self.db.add(pool_transaction)
             await self.db.commit()
+            chain_tip.on_pool_added()
+            publish_tx_accepted(pool_transaction, transaction_data.transaction_type)
             print("DEBUG: add_transaction_to_pool success:", transaction_data.transaction_hash)
             return True
         except Exception as e:
@@ -182,7 +187,7 @@ class BlockchainService:
         for row in pool_transactions:
             pool_tx = row[0] if isinstance(row, tuple) else row
             # data 中可以包含 tx_type / transaction_type 等字段
-            data = json.loads(pool_tx.data) if pool_tx.data else {}
+            data = decode_payload(pool_tx.data) or {}
             if not isinstance(data, dict):
                 data = {}
 
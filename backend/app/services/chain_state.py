@@ -0,0 +1,196 @@
+import asyncio
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.shared_state import SharedChainState
+from app.db.models.block_chain import Block, Transaction, TransactionPool
+from app.services.explorer import archive_store
+
+
+def _empty_state() -> Dict[str, Any]:
+    return {
+        "total_blocks": 0,
+        "total_transactions": 0,
+        "pending_pool_size": 0,
+        "difficulty": 0,
+        "latest_block_number": -1,
+        "latest_transactions_count": 0,
+        "latest_block_hash": "",
+        "latest_previous_hash": "",
+        "latest_miner_address": "",
+        "latest_timestamp": "",
+    }
+
+
+def _set_latest_block(state: Dict[str, Any], block: Block) -> None:
+    state["latest_block_number"] = block.block_number
+    state["latest_transactions_count"] = block.transaction_count or 0
+    state["latest_block_hash"] = block.block_hash
+    state["latest_previous_hash"] = block.previous_hash
+    state["latest_miner_address"] = block.miner_address
+    state["latest_timestamp"] = block.timestamp.isoformat() if block.timestamp else ""
+    state["difficulty"] = block.difficulty or 0
+
+
+class ChainTipState:
+    """链头状态（进程内缓存，可选挂载跨进程共享内存）。
+
+    **设计要点：**
+    - 启动时从数据库预热一次（区块数、交易数、交易池大小、最新区块头）；
+    - 之后由交易池写入 / 挖矿路径增量维护，仪表盘轮询不再访问数据库；
+    - 每次变更递增 version；预热期间如发生变更，则保持 stale，下次读取时重新预热，
+      避免预热结果覆盖掉并发写入的增量；
+    - 挂载 SharedChainState 后，增量在写者锁内作用于共享段，读取时以共享段为准，
+      多个 worker 看到同一个链头，version 即共享段的 seq。
+    """
+
+    def __init__(self) -> None:
+        self.state: Dict[str, Any] = _empty_state()
+        self.version = 0
+        self.stale = True
+        self.shared: Optional[SharedChainState] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    def attach_shared(self, shared: SharedChainState) -> None:
+        self.shared = shared
+
+    # ---------- 预热 / 失效 ----------
+
+    async def warm(self, db: AsyncSession) -> None:
+        """从数据库全量加载链头状态（挂载共享段时同时发布给其他 worker）"""
+        started_version = self.version
+        # 共享段的 seq 在读取数据库之前取出，发布时据此判断期间是否有其他写者
+        started_seq = self.shared.seq if self.shared is not None else None
+
+        state = _empty_state()
+        # 总数 = 热表行数 + 已归档到段文件的数量
+        archived_blocks, archived_transactions = archive_store.totals()
+        state["total_blocks"] = archived_blocks + (
+            (await db.execute(select(func.count()).select_from(Block))).scalar() or 0
+        )
+        state["total_transactions"] = archived_transactions + (
+            (await db.execute(select(func.count()).select_from(Transaction))).scalar() or 0
+        )
+        state["pending_pool_size"] = (await db.execute(select(func.count()).select_from(TransactionPool))).scalar() or 0
+        result_last_block = await db.execute(
+            select(Block).order_by(Block.block_number.desc()).limit(1)
+        )
+        last_block = result_last_block.scalars().first()
+        if last_block:
+            _set_latest_block(state, last_block)
+
+        if self.shared is not None:
+            seq = self.shared.write(state, expected_seq=started_seq)
+            if seq is not None:
+                self.state = state
+                self.version = seq
+                self.stale = False
+                return
+            # 读取数据库期间其他 worker 已发布：数据库结果可能不含其增量，
+            # 不覆盖共享段，改用共享段中的最新状态；段已被清零时保持 stale，下次读取重新预热
+            shared_state = self.shared.read()
+            if shared_state is not None:
+                self.state = shared_state
+                self.version = shared_state["seq"]
+                self.stale = False
+            else:
+                self.stale = True
+            return
+
+        self.state = state
+
+        # 预热过程中有增量写入时，本次结果可能已经过期，下次读取再重新加载
+        self.stale = self.version != started_version
+        self.version += 1
+
+    def invalidate(self) -> None:
+        """标记状态失效，下次读取时从数据库重新加载"""
+        self.stale = True
+        self.version += 1
+        if self.shared is not None:
+            # 共享段中的计数同样不可信，清零 seq 让所有 worker 重新预热
+            self.shared.reset()
+
+    # ---------- 增量维护 ----------
+
+    def _mutate(self, fn: Callable[[Dict[str, Any]], None]) -> None:
+        if self.shared is None:
+            fn(self.state)
+            self.version += 1
+            return
+
+        state = self.shared.update(fn)
+        if state is None:
+            # 共享段尚未预热，留给下次读取时从数据库加载
+            self.stale = True
+            return
+        self.state = state
+        self.version = state["seq"]
+
+    def on_pool_added(self, count: int = 1) -> None:
+        def apply(state: Dict[str, Any]) -> None:
+            state["pending_pool_size"] += count
+
+        self._mutate(apply)
+
+    def on_pool_removed(self, count: int = 1) -> None:
+        def apply(state: Dict[str, Any]) -> None:
+            state["pending_pool_size"] = max(0, state["pending_pool_size"] - count)
+
+        self._mutate(apply)
+
+    def on_block_mined(self, block: Block, transactions_count: int = 0) -> None:
+        def apply(state: Dict[str, Any]) -> None:
+            state["total_blocks"] += 1
+            state["total_transactions"] += transactions_count
+            _set_latest_block(state, block)
+
+        self._mutate(apply)
+
+    # ---------- 读取 ----------
+
+    async def snapshot(self, db: AsyncSession) -> Dict[str, Any]:
+        """返回当前链头状态；仅在未预热 / stale 时访问数据库（并发读取合并为一次预热）"""
+        shared_state = self.shared.read() if self.shared is not None else None
+        if shared_state is not None:
+            self.state = shared_state
+            self.version = shared_state["seq"]
+            self.stale = False
+        elif self.stale or self.shared is not None:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if self.stale or (self.shared is not None and self.shared.read() is None):
+                    await self.warm(db)
+
+        state = self.state
+        total_blocks = state["total_blocks"]
+        # 当前高度：如果有创世块，高度为 total_blocks - 1，否则为 0
+        height = total_blocks - 1 if total_blocks > 0 else 0
+
+        latest_block = None
+        if state["latest_block_number"] >= 0:
+            latest_block = {
+                "block_number": state["latest_block_number"],
+                "block_hash": state["latest_block_hash"],
+                "previous_hash": state["latest_previous_hash"],
+                "transactions_count": state["latest_transactions_count"],
+                "timestamp": state["latest_timestamp"] or None,
+                "miner_address": state["latest_miner_address"],
+            }
+
+        return {
+            "total_blocks": total_blocks,
+            "height": height,
+            "total_transactions": state["total_transactions"],
+            "pending_pool_size": state["pending_pool_size"],
+            "difficulty": state["difficulty"],
+            "latest_block": latest_block,
+            "version": self.version,
+        }
+
+
+# 进程级单例：API 路由、交易池与挖矿路径共享
+chain_tip = ChainTipState()
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from sqlalchemy import select, func
+
+from app.db.models.block_chain import Block, TransactionPool
+from app.db.models.projects import Project
+from app.services.chain_state import chain_tip
+from app.services.donation_feed import donation_feed
+from app.services.donation_stats import DonationStatsService
+from app.services.donation_trend import DonationTrendService, CN_TZ, floor_time
+from app.services.explorer import serialize_block
+from app.services.rankings import rankings
+
+
+class DashboardService:
+    """驾驶舱聚合数据：各分区并发获取，整体耗时取决于最慢的分区而不是所有分区之和。
+
+    - 需要访问数据库的分区各自从连接池取一个会话（AsyncSession 不支持同一会话上的并发查询）；
+    - 链头、最新捐赠、排行榜优先读取进程内状态；
+    - 单个分区失败不影响其他分区，失败原因记录在 errors 中。
+    """
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def _with_session(self, fn: Callable[[Any], Awaitable[Any]]) -> Any:
+        async with self.session_factory() as db:
+            return await fn(db)
+
+    # ---------- 分区 ----------
+
+    async def chain(self) -> Dict[str, Any]:
+        return await self._with_session(chain_tip.snapshot)
+
+    async def statistics(self) -> Dict[str, Any]:
+        async def load(db):
+            stats = await DonationStatsService(db).get_statistics()
+            today = floor_time(datetime.now(CN_TZ), "day")
+            series = await DonationTrendService(db).get_series("day", today, today + timedelta(days=1))
+            stats["today_amount"] = series["amounts"][0] if series["amounts"] else 0.0
+            stats["today_count"] = series["counts"][0] if series["counts"] else 0
+            return stats
+
+        return await self._with_session(load)
+
+    async def projects(self) -> Dict[str, Any]:
+        async def load(db):
+            result = await db.execute(
+                select(Project.status, func.count(Project.id)).group_by(Project.status)
+            )
+            by_status = {str(status_): count for status_, count in result.all()}
+            return {
+                "by_status": by_status,
+                "total": sum(by_status.values()),
+            }
+
+        return await self._with_session(load)
+
+    async def transaction_pool(self) -> Dict[str, Any]:
+        async def load(db):
+            result = await db.execute(
+                select(
+                    func.count(TransactionPool.id),
+                    func.coalesce(func.sum(TransactionPool.amount), 0),
+                    func.coalesce(func.avg(TransactionPool.gas_fee), 0),
+                )
+            )
+            count, total_value, avg_gas_fee = result.one()
+            return {
+                "pending_transactions": count or 0,
+                "total_value": float(total_value or 0),
+                "average_gas_fee": float(avg_gas_fee or 0),
+            }
+
+        return await self._with_session(load)
+
+    async def latest_blocks(self, limit: int = 5):
+        async def load(db):
+            result = await db.execute(select(Block).order_by(Block.block_number.desc()).limit(limit))
+            return [serialize_block(block) for block in result.scalars().all()]
+
+        return await self._with_session(load)
+
+    async def latest_donations(self, limit: int = 5):
+        async def load(db):
+            await donation_feed.ensure_fresh(db)
+            return donation_feed.page(limit) or []
+
+        return await self._with_session(load)
+
+    async def top_projects(self, limit: int = 5):
+        async def load(db):
+            await rankings.ensure_loaded(db)
+            return rankings.top_projects("amount", limit)
+
+        return await self._with_session(load)
+
+    # ---------- 聚合 ----------
+
+    async def _timed(self, name: str, awaitable: Awaitable[Any]) -> Tuple[str, Any, float, str]:
+        started = time.perf_counter()
+        try:
+            value, error = await awaitable, None
+        except Exception as e:
+            print(f"ERROR: dashboard section {name} failed:", e)
+            value, error = None, str(e)
+        return name, value, round((time.perf_counter() - started) * 1000, 2), error
+
+    async def build(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        sections = {
+            "chain": self.chain(),
+            "statistics": self.statistics(),
+            "projects": self.projects(),
+            "transaction_pool": self.transaction_pool(),
+            "latest_blocks": self.latest_blocks(),
+            "latest_donations": self.latest_donations(),
+            "top_projects": self.top_projects(),
+        }
+        results = await asyncio.gather(*(self._timed(name, aw) for name, aw in sections.items()))
+
+        payload: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+        for name, value, elapsed_ms, error in results:
+            payload[name] = value
+            timings[name] = elapsed_ms
+            if error is not None:
+                errors[name] = error
+
+        timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+        payload["timings_ms"] = timings
+        payload["errors"] = errors
+        return payload
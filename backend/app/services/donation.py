@@ -1,11 +1,14 @@
 from typing import List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func, case, and_
 from app.db.models.donation import Donation, TransactionStatus
 from app.db.models.block_chain import TransactionPool
 from app.db.models.projects import Project, ProjectStatus
 from app.db.models.user import User
 from app.schemas.donation import DonationCreate
+from app.core.pagination import paginate
+from app.services.donation_stats import DonationStatsService
+from app.services.donation_feed import donation_feed, feed_item
 from app.services.block_chain import BlockchainService, TransactionData
 from decimal import Decimal
 import time
@@ -107,6 +110,7 @@ class DonationService:
                 await self.db.commit()
                 await self.db.refresh(donation)
                 await self.db.refresh(donor)
+                donation_feed.append(feed_item(donation, project.title, donor.username))
                 print("DEBUG: donation created =", donation)
                 return donation
             else:
@@ -125,101 +129,95 @@ class DonationService:
 
     async def get_user_donations(self, user_id: int, page: int = 1, size: int = 10):
         stmt = select(Donation).where(Donation.donor_id == user_id)
-        result = await self.db.execute(stmt)
-        all_rows = result.scalars().all()
-        total = len(all_rows)
-
-        stmt = stmt.order_by(Donation.created_at.desc()).offset((page - 1) * size).limit(size)
-        result = await self.db.execute(stmt)
-        donations = result.scalars().all()
-
-        return donations, total
+        return await paginate(
+            self.db, stmt, page, size, Donation.created_at.desc(), Donation.id.desc()
+        )
 
     async def get_project_donations(self, project_id: int, page: int = 1, size: int = 10):
         stmt = select(Donation).where(
             Donation.project_id == project_id,
             Donation.status == TransactionStatus.CONFIRMED
         )
-        result = await self.db.execute(stmt)
-        all_rows = result.scalars().all()
-        total = len(all_rows)
-
-        stmt = stmt.order_by(Donation.created_at.desc()).offset((page - 1) * size).limit(size)
-        result = await self.db.execute(stmt)
-        donations = result.scalars().all()
-
-        return donations, total
-
-    async def confirm_donation(self, transaction_hash: str, block_hash: str, block_number: int) -> bool:
-        print("DEBUG: confirm_donation called with tx =", transaction_hash)
-        result = await self.db.execute(
-            select(Donation).where(Donation.transaction_hash == transaction_hash)
+        return await paginate(
+            self.db, stmt, page, size, Donation.created_at.desc(), Donation.id.desc()
         )
-        donation = result.scalars().first()
-        if not donation:
-            print("DEBUG: confirm_donation donation not found for tx =", transaction_hash)
-            return False
 
+    async def confirm_donation(self, transaction_hash: str, block_hash: str, block_number: int) -> bool:
+        """确认单笔捐赠（保留的单笔接口，挖矿路径使用 confirm_block_donations 按区块批量确认）"""
         try:
-            donation.status = TransactionStatus.CONFIRMED
-            donation.block_hash = block_hash
-            donation.block_number = block_number
-            donation.confirmed_at = datetime.now(CN_TZ)
-
-            # 更新项目已筹金额
-            result = await self.db.execute(
-                select(Project).where(Project.id == donation.project_id)
-            )
-            project = result.scalars().first()
-            if project:
-                print(
-                    "DEBUG: before update project.current_amount =",
-                    project.current_amount,
-                    "donation.amount =",
-                    donation.amount,
-                )
-                current = project.current_amount
-
-                # 统一成 Decimal 处理，避免 Decimal 与 float 混算报错
-                if current is None:
-                    current = Decimal("0")
-
-                if isinstance(current, Decimal):
-                    add_value = (
-                        donation.amount
-                        if isinstance(donation.amount, Decimal)
-                        else Decimal(str(donation.amount))
-                    )
-                    project.current_amount = current + add_value
-                else:
-                    # 如果 current 不是 Decimal（例如 float），退化为 float 计算
-                    project.current_amount = float(current or 0) + float(donation.amount)
-
-                print(
-                    "DEBUG: after update project.current_amount =",
-                    project.current_amount,
-                )
-
+            confirmed = await self.confirm_block_donations([transaction_hash], block_hash, block_number)
             await self.db.commit()
-            return True
-
+            return bool(confirmed)
         except Exception as e:
             print("ERROR in confirm_donation:", e)
             await self.db.rollback()
             return False
 
-    async def get_donation_statistics(self, project_id: Optional[int] = None) -> dict:
-        stmt = select(Donation).where(Donation.status == TransactionStatus.CONFIRMED)
-        if project_id:
-            stmt = stmt.where(Donation.project_id == project_id)
+    async def confirm_block_donations(self, transaction_hashes: List[str], block_hash: str,
+                                      block_number: int) -> List[Donation]:
+        """按区块批量确认捐赠，返回本块确认的捐赠（不提交，由区块提交统一 commit）。
+
+        - 一条 UPDATE 把本块的捐赠标记为已确认（已确认的不会被重复计入）；
+        - 按项目聚合金额，每个项目一条 UPDATE current_amount = current_amount + :delta，
+          由数据库原子累加，不再在 Python 中读-改-写，热门项目不会丢失更新；
+        - 同一条语句中达到目标金额的已上链项目切换为 COMPLETED。
+        """
+        if not transaction_hashes:
+            return []
+
+        await self.db.execute(
+            update(Donation)
+            .where(
+                Donation.transaction_hash.in_(transaction_hashes),
+                Donation.status != TransactionStatus.CONFIRMED,
+            )
+            .values(
+                status=TransactionStatus.CONFIRMED,
+                block_hash=block_hash,
+                block_number=block_number,
+                confirmed_at=datetime.now(CN_TZ),
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-        result = await self.db.execute(stmt)
-        rows = result.scalars().all()
-        total_count = len(rows)
-        total_amount = sum([d.amount for d in rows]) if total_count > 0 else 0
-
-        return {
-            "total_amount": total_amount,
-            "total_count": total_count,
-            "average_amount": total_amount / total_count if total_count > 0 else 0
-        }
\ No newline at end of file
+        result = await self.db.execute(
+            select(Donation)
+            .where(
+                Donation.transaction_hash.in_(transaction_hashes),
+                Donation.block_number == block_number,
+                Donation.status == TransactionStatus.CONFIRMED,
+            )
+            .execution_options(populate_existing=True)
+        )
+        donations = list(result.scalars().all())
+
+        # 用 Decimal 累加并绑定（Float 列的金额先经 str 转换，避免二进制浮点误差逐块累积）
+        deltas: Dict[int, Decimal] = {}
+        for donation in donations:
+            amount = Decimal(str(donation.amount or 0))
+            deltas[donation.project_id] = deltas.get(donation.project_id, Decimal(0)) + amount
+
+        for project_id, delta in deltas.items():
+            new_amount = func.coalesce(Project.current_amount, 0) + delta
+            await self.db.execute(
+                update(Project)
+                .where(Project.id == project_id)
+                # MySQL 按书写顺序求值 SET 子句：status 必须写在 current_amount 之前，
+                # 这样两列引用的都是累加前的 current_amount
+                .ordered_values(
+                    (Project.status, case(
+                        (and_(Project.status == ProjectStatus.ON_CHAIN.value,
+                              new_amount >= Project.target_amount),
+                         ProjectStatus.COMPLETED.value),
+                        else_=Project.status,
+                    )),
+                    (Project.current_amount, new_amount),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        return donations
+
+    async def get_donation_statistics(self, project_id: Optional[int] = None) -> dict:
+        # 读取区块提交时增量维护的汇总行，不再扫描全部已确认捐赠
+        return await DonationStatsService(self.db).get_statistics(project_id)
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.donation import Donation
+from app.db.models.projects import Project
+from app.db.models.user import User
+
+
+def feed_item(donation: Donation, project_title: Optional[str], donor_name: Optional[str]) -> Dict[str, Any]:
+    """最新捐赠流的单条记录（与 GET /api/v1/donations/ 的返回结构一致）"""
+    return {
+        "id": donation.id,
+        "amount": donation.amount,
+        "donor_id": donation.donor_id,
+        "project_id": donation.project_id,
+        "status": donation.status,
+        "transaction_hash": donation.transaction_hash,
+        "block_hash": donation.block_hash,
+        "block_number": donation.block_number,
+        "gas_fee": donation.gas_fee,
+        "is_anonymous": donation.is_anonymous,
+        "created_at": donation.created_at,
+        "confirmed_at": donation.confirmed_at,
+        "project_name": project_title,
+        "donor_name": donor_name,
+    }
+
+
+def _sort_key(item: Dict[str, Any]) -> Tuple[Any, int]:
+    return item["created_at"], item["id"]
+
+
+class DonationFeed:
+    """最新捐赠流的环形缓冲区（最新 N 条，已关联项目名称与捐赠人名称）。
+
+    - 按 (created_at, id) 倒序保存，容量满时自动丢弃最旧的记录；
+    - 创建捐赠成功后追加，区块确认后原地更新状态 / 区块字段；
+    - 启动时从数据库预热；其他 worker 写入的捐赠不会推送到本进程，
+      因此每隔 donation_feed_refresh_seconds 在读取时重新预热一次；
+    - 首页及缓冲区覆盖范围内的分页直接由内存返回，超出范围时返回 None，由调用方回退到 keyset 查询。
+    """
+
+    def __init__(self, capacity: int = 200) -> None:
+        self.capacity = capacity
+        self._items: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self.loaded = False
+        self.warmed_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    # ---------- 预热 ----------
+
+    async def warm(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(Donation, Project.title, User.username)
+            .join(Project, Donation.project_id == Project.id)
+            .join(User, Donation.donor_id == User.id)
+            .order_by(Donation.created_at.desc(), Donation.id.desc())
+            .limit(self.capacity)
+        )
+        items = [feed_item(donation, title, username) for donation, title, username in result.all()]
+
+        self._items = deque(items, maxlen=self.capacity)
+        self._by_id = {item["id"]: item for item in items}
+        self.loaded = True
+        self.warmed_at = time.monotonic()
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        """未加载或超过刷新间隔时重新预热（并发读取合并为一次查询）"""
+        if self.loaded and time.monotonic() - self.warmed_at < settings.donation_feed_refresh_seconds:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.loaded and time.monotonic() - self.warmed_at < settings.donation_feed_refresh_seconds:
+                return
+            await self.warm(db)
+
+    # ---------- 增量维护 ----------
+
+    def append(self, item: Dict[str, Any]) -> None:
+        if not self.loaded or item["id"] in self._by_id:
+            return
+
+        # 并发创建的捐赠可能乱序到达，从最新端向后找到插入位置（通常就是 0）
+        key = _sort_key(item)
+        position = 0
+        while position < len(self._items) and _sort_key(self._items[position]) > key:
+            position += 1
+        if position >= self.capacity:
+            return
+
+        if len(self._items) == self.capacity:
+            dropped = self._items.pop()
+            self._by_id.pop(dropped["id"], None)
+        self._items.insert(position, item)
+        self._by_id[item["id"]] = item
+
+    def on_confirmed(self, donations: Iterable[Donation]) -> None:
+        for donation in donations:
+            item = self._by_id.get(donation.id)
+            if item is None:
+                continue
+            item.update(
+                status=donation.status,
+                block_hash=donation.block_hash,
+                block_number=donation.block_number,
+                confirmed_at=donation.confirmed_at,
+            )
+
+    def invalidate(self) -> None:
+        """标记缓冲区过期（例如增量更新失败），下次读取时重新预热"""
+        self.warmed_at = 0.0
+
+    # ---------- 读取 ----------
+
+    def page(self, limit: int, page: int = 1,
+             after: Optional[Tuple[Any, int]] = None) -> Optional[List[Dict[str, Any]]]:
+        """从缓冲区取一页；after 为 keyset 游标 (created_at, id)。
+
+        缓冲区无法完整覆盖该页时返回 None（缓冲区未满说明已包含全部捐赠，此时总能覆盖）。
+        """
+        if not self.loaded:
+            return None
+
+        items = list(self._items)
+        if after is not None:
+            start = 0
+            try:
+                while start < len(items) and _sort_key(items[start]) >= tuple(after):
+                    start += 1
+            except TypeError:
+                # 游标时间与缓冲区时间无法比较（如时区不一致），交给数据库查询
+                return None
+            if start == len(items) and len(items) == self.capacity:
+                # 游标比缓冲区中最旧的记录还旧
+                return None
+        else:
+            start = (page - 1) * limit
+
+        end = start + limit
+        if end > len(items) and len(items) == self.capacity:
+            return None
+        return [dict(item) for item in items[start:end]]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# 进程级单例：最新捐赠列表路由读取，创建捐赠 / 挖矿路径维护
+donation_feed = DonationFeed(settings.donation_feed_size)
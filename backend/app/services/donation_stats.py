@@ -0,0 +1,171 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select, delete, func, case, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.upsert import upsert
+from app.db.models.donation import Donation, TransactionStatus
+from app.db.models.donation_stats import DonationStat, PLATFORM_PROJECT_ID
+
+
+@dataclass
+class _Rollup:
+    count: int = 0
+    total: float = 0.0
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    last_at: Optional[datetime] = None
+
+    def add(self, amount: float, at: Optional[datetime]) -> None:
+        self.count += 1
+        self.total += amount
+        self.min_amount = amount if self.min_amount is None else min(self.min_amount, amount)
+        self.max_amount = amount if self.max_amount is None else max(self.max_amount, amount)
+        if at is not None and (self.last_at is None or at > self.last_at):
+            self.last_at = at
+
+
+class DonationStatsService:
+    """捐赠统计汇总表（donation_stats）的增量维护与读取。
+
+    - 区块提交时按项目聚合本块确认的捐赠，每个项目 + 全平台各执行一次 upsert 累加
+      （INSERT ... ON DUPLICATE KEY UPDATE，首次确认的项目与并发出块不会互相覆盖）；
+    - 统计接口只读一行，不再扫描 donations；
+    - rebuild() 用 GROUP BY 从 donations 全量重算，用于初始化或修复漂移。
+
+    写入顺序约定：总是先写全平台行，再按 project_id 升序写项目行。
+    rebuild() 先锁住全平台行，因此与出块事务互斥，重算期间不会丢失增量。
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply_confirmed(self, donations: Iterable[Donation]) -> None:
+        """把本区块确认的捐赠累加进汇总行（不提交，由区块提交统一 commit）"""
+        rollups: Dict[int, _Rollup] = {}
+        for donation in donations:
+            amount = float(donation.amount or 0)
+            at = donation.confirmed_at
+            rollups.setdefault(donation.project_id, _Rollup()).add(amount, at)
+            rollups.setdefault(PLATFORM_PROJECT_ID, _Rollup()).add(amount, at)
+
+        # PLATFORM_PROJECT_ID 为 0，升序即先写全平台行（与 rebuild 的加锁顺序一致）
+        for project_id in sorted(rollups):
+            await self._apply_rollup(project_id, rollups[project_id])
+
+    def _upsert(self, row: dict, values: dict):
+        """按 project_id 唯一键 upsert（见 app.core.upsert）"""
+        return upsert(self.db.get_bind().dialect.name, DonationStat, row, values, [DonationStat.project_id])
+
+    async def _apply_rollup(self, project_id: int, rollup: _Rollup) -> None:
+        values = {
+            "donation_count": DonationStat.donation_count + rollup.count,
+            "total_amount": DonationStat.total_amount + rollup.total,
+            "min_amount": case(
+                (or_(DonationStat.min_amount.is_(None), DonationStat.min_amount > rollup.min_amount),
+                 rollup.min_amount),
+                else_=DonationStat.min_amount,
+            ),
+            "max_amount": case(
+                (or_(DonationStat.max_amount.is_(None), DonationStat.max_amount < rollup.max_amount),
+                 rollup.max_amount),
+                else_=DonationStat.max_amount,
+            ),
+        }
+        if rollup.last_at is not None:
+            values["last_donation_at"] = case(
+                (or_(DonationStat.last_donation_at.is_(None), DonationStat.last_donation_at < rollup.last_at),
+                 rollup.last_at),
+                else_=DonationStat.last_donation_at,
+            )
+
+        # upsert 不会触发 ORM 的 onupdate，显式刷新更新时间
+        values["updated_at"] = func.now()
+
+        row = {
+            "project_id": project_id,
+            "donation_count": rollup.count,
+            "total_amount": rollup.total,
+            "min_amount": rollup.min_amount,
+            "max_amount": rollup.max_amount,
+            "last_donation_at": rollup.last_at,
+        }
+        await self.db.execute(self._upsert(row, values))
+
+    async def get_statistics(self, project_id: Optional[int] = None) -> dict:
+        """读取单行汇总；project_id 为空时返回全平台汇总"""
+        key = project_id if project_id else PLATFORM_PROJECT_ID
+        result = await self.db.execute(select(DonationStat).where(DonationStat.project_id == key))
+        stat = result.scalars().first()
+
+        total_count = stat.donation_count if stat else 0
+        total_amount = stat.total_amount if stat else 0
+
+        return {
+            "total_amount": total_amount,
+            "total_count": total_count,
+            "average_amount": total_amount / total_count if total_count > 0 else 0,
+            "min_amount": stat.min_amount if stat else None,
+            "max_amount": stat.max_amount if stat else None,
+            "last_donation_at": stat.last_donation_at if stat else None,
+        }
+
+    async def rebuild(self) -> int:
+        """从 donations 全量重算汇总表，返回写入的汇总行数
+
+        先锁住全平台行（行不存在时 InnoDB 锁住对应的唯一索引间隙）再读取 donations：
+        已写入汇总的出块事务提交后才能拿到锁，其确认结果会被本次 GROUP BY 读到；
+        拿到锁之后才写汇总的出块事务会等到重算提交，再在新汇总上累加本块增量。
+        """
+        await self.db.execute(
+            select(DonationStat.id)
+            .where(DonationStat.project_id == PLATFORM_PROJECT_ID)
+            .with_for_update()
+        )
+
+        confirmed = Donation.status == TransactionStatus.CONFIRMED
+        aggregates = (
+            func.count(Donation.id),
+            func.coalesce(func.sum(Donation.amount), 0),
+            func.min(Donation.amount),
+            func.max(Donation.amount),
+            func.max(Donation.confirmed_at),
+        )
+
+        per_project = (await self.db.execute(
+            select(Donation.project_id, *aggregates).where(confirmed).group_by(Donation.project_id)
+        )).all()
+        platform = (await self.db.execute(select(*aggregates).where(confirmed))).one()
+
+        await self.db.execute(delete(DonationStat))
+        rows = [(project_id, *values) for project_id, *values in per_project]
+        if platform[0]:
+            rows.append((PLATFORM_PROJECT_ID, *platform))
+
+        for project_id, count, total, min_amount, max_amount, last_at in rows:
+            self.db.add(DonationStat(
+                project_id=project_id,
+                donation_count=count,
+                total_amount=float(total or 0),
+                min_amount=min_amount,
+                max_amount=max_amount,
+                last_donation_at=last_at,
+            ))
+        await self.db.commit()
+        return len(rows)
+
+
+async def _rebuild() -> None:
+    from app.db.base import async_session
+
+    async with async_session() as db:
+        count = await DonationStatsService(db).rebuild()
+    print(f"donation_stats rebuilt: {count} rows")
+
+
+if __name__ == "__main__":
+    # 全量重算：python -m app.services.donation_stats
+    asyncio.run(_rebuild())
@@ -0,0 +1,247 @@
+import asyncio
+import math
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.upsert import upsert
+from app.db.models.donation import Donation
+from app.db.models.donation_stats import PLATFORM_PROJECT_ID
+from app.db.models.donation_trend import DonationTrendBucket
+
+CN_TZ = timezone(timedelta(hours=8))
+
+GRANULARITIES: Dict[str, timedelta] = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+# 由细到粗
+_ORDER = ["minute", "hour", "day"]
+
+
+def to_cn_naive(dt: datetime) -> datetime:
+    """统一为北京时间的 naive datetime（桶边界按北京时间对齐）"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(CN_TZ).replace(tzinfo=None)
+    return dt
+
+
+def floor_time(dt: datetime, granularity: str) -> datetime:
+    dt = to_cn_naive(dt)
+    if granularity == "minute":
+        return dt.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return dt.replace(minute=0, second=0, microsecond=0)
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def retention_cutoffs(now: datetime) -> Tuple[datetime, datetime]:
+    """(分钟桶保留起点, 小时桶保留起点)：更早的数据只保证以小时 / 天粒度存在"""
+    now = to_cn_naive(now)
+    minute_cutoff = floor_time(now - timedelta(hours=settings.trend_minute_retention_hours), "hour")
+    hour_cutoff = floor_time(now - timedelta(days=settings.trend_hour_retention_days), "day")
+    return minute_cutoff, hour_cutoff
+
+
+def stored_granularity(at: datetime, now: datetime) -> str:
+    """时间点 at 处按保留期可能存放的最粗粒度"""
+    minute_cutoff, hour_cutoff = retention_cutoffs(now)
+    at = to_cn_naive(at)
+    if at < hour_cutoff:
+        return "day"
+    if at < minute_cutoff:
+        return "hour"
+    return "minute"
+
+
+BucketKey = Tuple[int, datetime]
+
+
+class DonationTrendService:
+    """捐赠 / Gas 趋势时间序列（donation_trend_buckets）。
+
+    - 区块提交时把本块确认的捐赠累加进分钟桶（项目 + 全平台）；
+    - 超过保留期的分钟桶并入小时桶、小时桶并入天桶（移动而非复制，每笔捐赠只计一次）；
+      压缩由后台任务（compact_periodically）或命令行执行，不在出块事务中进行，
+      避免压缩失败或行锁等待拖住出块；
+    - 查询某个窗口时读取窗口内所有粒度的桶，按请求粒度对齐后补零成稠密序列，
+      代价只与窗口内桶数有关，与捐赠总量无关；窗口起点已超出请求粒度的保留期时，
+      粒度提升为该处实际存放的粒度（响应中 clamped 为 true），不会把整小时 / 整天的量堆到一个点上。
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ---------- 写入 ----------
+
+    async def _add_to_bucket(self, project_id: int, granularity: str, bucket_start: datetime,
+                             count: int, amount: float, gas_fee: float) -> None:
+        # 多 worker 同时出块、或出块与压缩同时写入同一个桶时，由唯一键 upsert 合并累加
+        await self.db.execute(upsert(
+            self.db.get_bind().dialect.name,
+            DonationTrendBucket,
+            {
+                "project_id": project_id,
+                "granularity": granularity,
+                "bucket_start": bucket_start,
+                "donation_count": count,
+                "total_amount": amount,
+                "total_gas_fee": gas_fee,
+            },
+            {
+                "donation_count": DonationTrendBucket.donation_count + count,
+                "total_amount": DonationTrendBucket.total_amount + amount,
+                "total_gas_fee": DonationTrendBucket.total_gas_fee + gas_fee,
+            },
+            [DonationTrendBucket.project_id, DonationTrendBucket.granularity, DonationTrendBucket.bucket_start],
+        ))
+
+    async def _add_all(self, granularity: str, totals: Dict[BucketKey, List[float]]) -> None:
+        # 按键排序写入，并发事务以相同顺序锁桶，避免互相等待成死锁
+        for project_id, bucket_start in sorted(totals):
+            count, amount, gas_fee = totals[(project_id, bucket_start)]
+            await self._add_to_bucket(project_id, granularity, bucket_start, int(count), amount, gas_fee)
+
+    async def apply_confirmed(self, donations: Iterable[Donation]) -> None:
+        """把本区块确认的捐赠写入分钟桶（不提交，由区块提交统一 commit）"""
+        totals: Dict[BucketKey, List[float]] = {}
+        for donation in donations:
+            at = donation.confirmed_at or datetime.now(CN_TZ)
+            minute = floor_time(at, "minute")
+            for project_id in (donation.project_id, PLATFORM_PROJECT_ID):
+                bucket = totals.setdefault((project_id, minute), [0, 0.0, 0.0])
+                bucket[0] += 1
+                bucket[1] += float(donation.amount or 0)
+                bucket[2] += float(donation.gas_fee or 0)
+
+        await self._add_all("minute", totals)
+
+    # ---------- 压缩 ----------
+
+    async def _roll_up(self, source: str, target: str, cutoff: datetime) -> int:
+        """把 cutoff 之前的 source 粒度桶并入 target 粒度桶，返回移动的桶数"""
+        result = await self.db.execute(
+            select(DonationTrendBucket)
+            .where(
+                DonationTrendBucket.granularity == source,
+                DonationTrendBucket.bucket_start < cutoff,
+            )
+            # 多 worker 同时压缩时串行化，避免同一批桶被重复并入
+            .with_for_update()
+        )
+        rows = result.scalars().all()
+        if not rows:
+            return 0
+
+        totals: Dict[BucketKey, List[float]] = {}
+        for row in rows:
+            bucket = totals.setdefault((row.project_id, floor_time(row.bucket_start, target)), [0, 0.0, 0.0])
+            bucket[0] += row.donation_count or 0
+            bucket[1] += row.total_amount or 0.0
+            bucket[2] += row.total_gas_fee or 0.0
+
+        await self._add_all(target, totals)
+        await self.db.execute(
+            delete(DonationTrendBucket)
+            .where(DonationTrendBucket.id.in_([row.id for row in rows]))
+            .execution_options(synchronize_session=False)
+        )
+        return len(rows)
+
+    async def compact(self, now: Optional[datetime] = None) -> int:
+        """按保留期把旧的分钟桶并入小时桶、旧的小时桶并入天桶（只移动完整的整点 / 整天）"""
+        minute_cutoff, hour_cutoff = retention_cutoffs(now or datetime.now(CN_TZ))
+
+        moved = await self._roll_up("minute", "hour", minute_cutoff)
+        moved += await self._roll_up("hour", "day", hour_cutoff)
+        return moved
+
+    # ---------- 查询 ----------
+
+    async def get_series(self, granularity: str, start: datetime, end: datetime,
+                         project_id: Optional[int] = None) -> dict:
+        """返回 [start, end) 窗口内按 granularity 对齐的稠密序列；点数超限时抛出 ValueError"""
+        requested = granularity
+        stored = stored_granularity(start, datetime.now(CN_TZ))
+        if _ORDER.index(stored) > _ORDER.index(granularity):
+            granularity = stored
+        step = GRANULARITIES[granularity]
+        first = floor_time(start, granularity)
+        end = to_cn_naive(end)
+        points = max(0, math.ceil((end - first) / step))
+        if points > settings.trend_max_points:
+            raise ValueError(f"too many points: {points}")
+
+        key = project_id if project_id else PLATFORM_PROJECT_ID
+        result = await self.db.execute(
+            select(
+                DonationTrendBucket.bucket_start,
+                DonationTrendBucket.donation_count,
+                DonationTrendBucket.total_amount,
+                DonationTrendBucket.total_gas_fee,
+            ).where(
+                DonationTrendBucket.project_id == key,
+                DonationTrendBucket.bucket_start >= first,
+                DonationTrendBucket.bucket_start < end,
+            )
+        )
+
+        starts = [first + step * i for i in range(points)]
+        index = {bucket_start: i for i, bucket_start in enumerate(starts)}
+        counts = [0] * points
+        amounts = [0.0] * points
+        gas_fees = [0.0] * points
+        # 窗口内可能同时存在分钟 / 小时 / 天桶（压缩进度不同），统一对齐到请求粒度
+        for bucket_start, count, amount, gas_fee in result.all():
+            i = index.get(floor_time(bucket_start, granularity))
+            if i is None:
+                continue
+            counts[i] += count or 0
+            amounts[i] += amount or 0.0
+            gas_fees[i] += gas_fee or 0.0
+
+        return {
+            "granularity": granularity,
+            "requested_granularity": requested,
+            "clamped": granularity != requested,
+            "project_id": project_id,
+            "labels": [s.isoformat() for s in starts],
+            "counts": counts,
+            "amounts": [round(a, 8) for a in amounts],
+            "gas_fees": [round(g, 8) for g in gas_fees],
+        }
+
+
+async def compact_periodically(session_factory) -> None:
+    """后台定期压缩趋势桶（由应用启动时创建任务，与出块事务互不影响）"""
+    while True:
+        await asyncio.sleep(settings.trend_compact_interval_seconds)
+        try:
+            async with session_factory() as db:
+                await DonationTrendService(db).compact()
+                await db.commit()
+        except Exception as e:
+            print("ERROR: compact donation trend failed:", e)
+
+
+async def _compact() -> None:
+    from app.db.base import async_session
+
+    async with async_session() as db:
+        moved = await DonationTrendService(db).compact()
+        await db.commit()
+    print(f"donation_trend_buckets compacted: {moved} buckets moved")
+
+
+if __name__ == "__main__":
+    # 手动压缩：python -m app.services.donation_trend compact
+    if len(sys.argv) > 1 and sys.argv[1] == "compact":
+        asyncio.run(_compact())
+    else:
+        print("usage: python -m app.services.donation_trend compact")
@@ -0,0 +1,45 @@
+from typing import Iterable
+
+from app.core.config import settings
+from app.core.events import EventBus, TX_ACCEPTED, BLOCK_MINED, DONATION_CONFIRMED
+from app.db.models.block_chain import Block, TransactionPool
+from app.db.models.donation import Donation
+
+# 进程级单例：交易池 / 挖矿路径发布，/api/v1/events 订阅
+event_bus = EventBus(settings.event_queue_size)
+
+
+def publish_tx_accepted(pool_tx: TransactionPool, transaction_type: str) -> None:
+    event_bus.publish(TX_ACCEPTED, {
+        "transaction_hash": pool_tx.transaction_hash,
+        "transaction_type": transaction_type,
+        "from_address": pool_tx.from_address,
+        "to_address": pool_tx.to_address,
+        "amount": pool_tx.amount,
+        "gas_fee": pool_tx.gas_fee,
+    })
+
+
+def publish_block_mined(block: Block) -> None:
+    event_bus.publish(BLOCK_MINED, {
+        "block_number": block.block_number,
+        "block_hash": block.block_hash,
+        "previous_hash": block.previous_hash,
+        "transactions_count": block.transaction_count or 0,
+        "miner_address": block.miner_address,
+        "timestamp": block.timestamp.isoformat() if block.timestamp else None,
+    })
+
+
+def publish_donations_confirmed(donations: Iterable[Donation]) -> None:
+    for donation in donations:
+        event_bus.publish(DONATION_CONFIRMED, {
+            "donation_id": donation.id,
+            "project_id": donation.project_id,
+            # 匿名捐赠不对外暴露捐赠者
+            "donor_id": None if donation.is_anonymous else donation.donor_id,
+            "amount": donation.amount,
+            "transaction_hash": donation.transaction_hash,
+            "block_number": donation.block_number,
+            "block_hash": donation.block_hash,
+        })
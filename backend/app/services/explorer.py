@@ -0,0 +1,210 @@
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.pagination import keyset_before
+from app.core.payload_codec import decode_payload
+from app.core.segments import SegmentStore
+from app.db.models.block_chain import Block, Transaction
+
+
+# 已打包的区块不会再变化，区块头与交易分页结果可以放心长期缓存
+block_cache = LRUCache(maxsize=settings.block_cache_size)
+
+# 冷区块归档段文件（归档命令写入，见 app.services.archive）；不在热表中的区块从这里读取
+archive_store = SegmentStore(settings.archive_dir, max_open=settings.archive_open_segments)
+
+# 时间 / 金额只给单侧边界时补齐的另一侧（不改变筛选结果，只让查询能按索引范围定位）
+_EARLIEST = datetime(1970, 1, 1)
+_LATEST = datetime(9999, 12, 31)
+_MAX_AMOUNT = sys.float_info.max
+
+
+def serialize_block(block: Block) -> Dict[str, Any]:
+    """区块头序列化（与 /blocks 列表保持一致的字段命名）"""
+    return {
+        "block_number": block.block_number,
+        "block_hash": block.block_hash,
+        "previous_hash": block.previous_hash,
+        "merkle_root": block.merkle_root,
+        "nonce": block.nonce,
+        "difficulty": block.difficulty,
+        "transactions_count": block.transaction_count,
+        "timestamp": block.timestamp.isoformat() if block.timestamp else None,
+        "miner_address": block.miner_address,
+        "reward": block.reward,
+    }
+
+
+def serialize_transaction(tx: Transaction) -> Dict[str, Any]:
+    """链上交易序列化，data 字段解析为 dict 便于前端直接展示"""
+    try:
+        data = decode_payload(tx.data)
+    except Exception:
+        data = None
+
+    return {
+        "id": tx.id,
+        "transaction_hash": tx.transaction_hash,
+        "from_address": tx.from_address,
+        "to_address": tx.to_address,
+        "amount": tx.amount,
+        "transaction_type": tx.transaction_type,
+        "block_hash": tx.block_hash,
+        "block_number": tx.block_number,
+        "gas_fee": tx.gas_fee,
+        "data": data,
+        "created_at": tx.created_at.isoformat() if tx.created_at else None,
+        "confirmed_at": tx.confirmed_at.isoformat() if tx.confirmed_at else None,
+    }
+
+
+def transaction_query(
+    transaction_type: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    from_block: Optional[int] = None,
+    to_block: Optional[int] = None,
+    after: Optional[Sequence[int]] = None,
+):
+    """链上交易筛选查询，按 (block_number, id) 倒序。
+
+    每种筛选条件都有对应的索引，任意组合都不会退化为全表扫描：
+    - transaction_type（可叠加区块范围）：ix_transactions_type_block_id
+    - 区块范围：ix_transactions_block_number_id
+    - 确认时间范围 [start, end)：ix_transactions_confirmed_at_id
+    - 金额范围 [min_amount, max_amount]：ix_transactions_amount_id
+    时间 / 金额只给一侧时补齐另一侧：单侧范围在规划器看来选择性太低，会改为沿区块号索引扫描并逐行过滤，
+    条件很少命中（如 min_amount=1e6）时等于全表扫描。
+    完全不带筛选时只能按区块号索引顺序读取，调用方应至少给出 to_block（路由默认取链头区块号）。
+    after 为上一页最后一条的 (block_number, id)，用于 keyset 分页。
+    transactions 表中的交易都由挖矿写入，均带有 block_number。
+    """
+    if (start is None) != (end is None):
+        start = start if start is not None else _EARLIEST
+        end = end if end is not None else _LATEST
+    if (min_amount is None) != (max_amount is None):
+        min_amount = min_amount if min_amount is not None else -_MAX_AMOUNT
+        max_amount = max_amount if max_amount is not None else _MAX_AMOUNT
+    stmt = select(Transaction)
+    if transaction_type:
+        stmt = stmt.where(Transaction.transaction_type == transaction_type)
+    if start is not None:
+        stmt = stmt.where(Transaction.confirmed_at >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.confirmed_at < end)
+    if min_amount is not None:
+        stmt = stmt.where(Transaction.amount >= min_amount)
+    if max_amount is not None:
+        stmt = stmt.where(Transaction.amount <= max_amount)
+    if from_block is not None:
+        stmt = stmt.where(Transaction.block_number >= from_block)
+    if to_block is not None:
+        stmt = stmt.where(Transaction.block_number <= to_block)
+    if after is not None:
+        block_number, tx_id = after
+        stmt = stmt.where(keyset_before([
+            (Transaction.block_number, block_number),
+            (Transaction.id, tx_id),
+        ]))
+    return stmt.order_by(Transaction.block_number.desc(), Transaction.id.desc())
+
+
+class ExplorerService:
+    """区块浏览器查询服务"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_block_header(self, block_number: int) -> Optional[Dict[str, Any]]:
+        """按高度获取区块头（命中缓存时不访问数据库）"""
+        key = ("header", block_number)
+        cached = block_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if archive_store.contains(block_number):
+            record = archive_store.read_block(block_number)
+            header = record["header"] if record else None
+        else:
+            result = await self.db.execute(
+                select(Block).where(Block.block_number == block_number)
+            )
+            block = result.scalars().first()
+            header = serialize_block(block) if block else None
+        if header is None:
+            # 不缓存未命中：该高度之后可能被挖出
+            return None
+
+        block_cache.put(key, header)
+        return header
+
+    async def get_block_transactions(
+        self, block_number: int, page: int = 1, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """按区块号分页获取交易（走 ix_transactions_block_number_id 索引，已归档的区块读取段文件）"""
+        key = ("txs", block_number, page, limit)
+        cached = block_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if archive_store.contains(block_number):
+            record = archive_store.read_block(block_number) or {"transactions": []}
+            items = record["transactions"][(page - 1) * limit:page * limit]
+            block_cache.put(key, items)
+            return items
+
+        stmt = (
+            select(Transaction)
+            .where(Transaction.block_number == block_number)
+            .order_by(Transaction.id.asc())
+            .offset((page - 1) * limit)
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        items = [serialize_transaction(tx) for tx in result.scalars().all()]
+
+        block_cache.put(key, items)
+        return items
+
+    async def get_block_detail(
+        self, block_number: int, page: int = 1, limit: int = 20
+    ) -> Optional[Dict[str, Any]]:
+        """区块详情：区块头 + 分页交易列表"""
+        header = await self.get_block_header(block_number)
+        if header is None:
+            return None
+
+        items = await self.get_block_transactions(block_number, page, limit)
+        return {
+            **header,
+            "transactions": {
+                "items": items,
+                "total": header["transactions_count"] or 0,
+                "page": page,
+                "limit": limit,
+            },
+        }
+
+    @staticmethod
+    def archived_headers(below: int, limit: int, skip: int = 0) -> List[Dict[str, Any]]:
+        """从归档段中按区块号倒序取区块头：区块号小于 below，跳过前 skip 个"""
+        end = min(below - 1, archive_store.archived_end) - skip
+        headers = []
+        for record in archive_store.iter_blocks(end=end, reverse=True):
+            headers.append(record["header"])
+            if len(headers) >= limit:
+                break
+        return headers
+
+    async def list_transactions(self, limit: int = 20, **filters) -> List[Transaction]:
+        """按条件筛选链上交易（筛选参数见 transaction_query）"""
+        result = await self.db.execute(transaction_query(**filters).limit(limit))
+        return list(result.scalars().all())
@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.payload_codec import payload_text
+from app.db.models.block_chain import Transaction
+from app.db.models.donation import Donation
+from app.services.explorer import transaction_query
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# data 输出为 JSON 文本（未压缩的 JSON 编码直接取原文，不逐行解析）
+TRANSACTION_FIELDS = [
+    "id", "transaction_hash", "from_address", "to_address", "amount", "transaction_type",
+    "block_hash", "block_number", "gas_fee", "data", "created_at", "confirmed_at",
+]
+DONATION_FIELDS = [
+    "id", "project_id", "donor_id", "amount", "status", "transaction_hash",
+    "block_hash", "block_number", "gas_fee", "is_anonymous", "created_at", "confirmed_at",
+]
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _transaction_record(row) -> Dict[str, Any]:
+    record = {field: _plain(row[field]) for field in TRANSACTION_FIELDS}
+    record["data"] = payload_text(record["data"])
+    return record
+
+
+def _donation_record(row) -> Dict[str, Any]:
+    record = {field: _plain(row[field]) for field in DONATION_FIELDS}
+    if record["is_anonymous"]:
+        # 匿名捐赠不对外暴露捐赠者
+        record["donor_id"] = None
+    return record
+
+
+class _Encoder:
+    """逐行编码为 NDJSON / CSV 文本（CSV 首行为表头）"""
+
+    def __init__(self, fmt: str, fields: Sequence[str]) -> None:
+        self.fmt = fmt
+        self.fields = list(fields)
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer, lineterminator="\n") if fmt == "csv" else None
+
+    def header(self) -> str:
+        if self._writer is None:
+            return ""
+        return self._write(self.fields)
+
+    def encode(self, record: Dict[str, Any]) -> str:
+        if self._writer is None:
+            return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        return self._write(["" if record[f] is None else record[f] for f in self.fields])
+
+    def _write(self, values: List[Any]) -> str:
+        self._writer.writerow(values)
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+
+class ExportService:
+    """交易 / 捐赠全量导出（NDJSON 或 CSV 流式输出）。
+
+    - 每次导出从连接池单独取一个会话：StreamingResponse 在路由返回后才开始迭代，
+      路由依赖注入的会话此时已经关闭；
+    - 通过 db.stream + yield_per 使用服务端游标逐批读取，只查询列而不构造 ORM 对象；
+    - 编码后的文本累积到 export_chunk_bytes 再交给响应输出，内存占用与导出行数无关。
+    """
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    async def _stream(self, stmt, fmt: str, fields: Sequence[str], to_record) -> AsyncIterator[bytes]:
+        encoder = _Encoder(fmt, fields)
+        chunk: List[str] = [encoder.header()]
+        size = len(chunk[0])
+
+        async with self.session_factory() as db:
+            result = await db.stream(stmt.execution_options(yield_per=settings.export_yield_per))
+            async for partition in result.mappings().partitions():
+                for row in partition:
+                    line = encoder.encode(to_record(row))
+                    chunk.append(line)
+                    size += len(line)
+                    if size >= settings.export_chunk_bytes:
+                        yield "".join(chunk).encode("utf-8")
+                        chunk, size = [], 0
+
+        if chunk:
+            yield "".join(chunk).encode("utf-8")
+
+    def transactions(self, fmt: str, **filters) -> AsyncIterator[bytes]:
+        """链上交易导出，筛选参数与 /api/v1/blockchain/transactions 相同（见 transaction_query）
+
+        只读取 transactions 热表，已归档冷区块中的交易不会输出
+        """
+        stmt = transaction_query(**filters).with_only_columns(
+            *(getattr(Transaction, field) for field in TRANSACTION_FIELDS)
+        )
+        return self._stream(stmt, fmt, TRANSACTION_FIELDS, _transaction_record)
+
+    def donations(self, fmt: str, project_id: Optional[int] = None, status: Optional[str] = None,
+                  start: Optional[datetime] = None, end: Optional[datetime] = None) -> AsyncIterator[bytes]:
+        """捐赠导出（按 created_at、id 倒序），可按项目、状态、创建时间窗口 [start, end) 筛选"""
+        stmt = select(*(getattr(Donation, field) for field in DONATION_FIELDS))
+        if project_id is not None:
+            stmt = stmt.where(Donation.project_id == project_id)
+        if status:
+            stmt = stmt.where(Donation.status == status)
+        if start is not None:
+            stmt = stmt.where(Donation.created_at >= start)
+        if end is not None:
+            stmt = stmt.where(Donation.created_at < end)
+        stmt = stmt.order_by(Donation.created_at.desc(), Donation.id.desc())
+        return self._stream(stmt, fmt, DONATION_FIELDS, _donation_record)
@@ -1,6 +1,6 @@
 import time
 import threading
-from typing import List, Optional
+from typing import Callable, List, Optional
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.block_chain import Block, Transaction, TransactionPool
@@ -8,12 +8,32 @@ from app.db.models.donation import Donation, TransactionStatus
 from app.schemas.block_chain import TransactionData, BlockData, MiningResult
 from app.services.block_chain import BlockchainService
 from app.services.donation import DonationService
+from app.services.donation_stats import DonationStatsService
+from app.services.donation_trend import DonationTrendService
+from app.services.donor_sketch import DonorSketchService
+from app.services.address_ledger import AddressLedgerService
+from app.services.chain_state import chain_tip
+from app.services.events import publish_block_mined, publish_donations_confirmed
+from app.services.rankings import rankings
+from app.services.donation_feed import donation_feed
+from app.services.project_cache import project_cache, invalidate_projects
+from app.services.search import explorer_search
 from app.core.config import settings
-import json
+from app.core.payload_codec import decode_payload
 from datetime import datetime, timedelta, timezone
 CN_TZ = timezone(timedelta(hours=8))
 
 
+def _after_commit(label: str, action: Callable[[], None], on_error: Optional[Callable[[], None]] = None) -> None:
+    """区块提交后的进程内更新 / 事件推送：失败只记录日志并让对应缓存失效，挖矿结果只由提交决定"""
+    try:
+        action()
+    except Exception as e:
+        print(f"ERROR: {label} failed:", e)
+        if on_error is not None:
+            on_error()
+
+
 class MiningService:
     def __init__(self, db: AsyncSession):
         # 使用异步会话进行所有数据库操作
@@ -47,11 +67,12 @@ class MiningService:
 
             if not pool_transactions:
                 return MiningResult(success=False)
+            pool_payloads = {pool_tx.transaction_hash: pool_tx.data for pool_tx in pool_transactions}
 
             # 将 TransactionPool 记录转换为 TransactionData
             pending_transactions: List[TransactionData] = []
             for pool_tx in pool_transactions:
-                data = json.loads(pool_tx.data) if pool_tx.data else {}
+                data = decode_payload(pool_tx.data) or {}
                 if not isinstance(data, dict):
                     data = {}
                 tx_type = data.get("tx_type") or data.get("transaction_type") or "donation"
@@ -101,7 +122,15 @@ class MiningService:
                 )
                 self.db.add(genesis_block)
                 await self.db.commit()
-                await self.db.refresh(genesis_block)
+                try:
+                    await self.db.refresh(genesis_block)
+                    chain_tip.on_block_mined(genesis_block, 0)
+                except Exception as e:
+                    print("ERROR: update chain tip failed:", e)
+                    chain_tip.invalidate()
+                _after_commit("publish block event", lambda: publish_block_mined(genesis_block))
+                _after_commit("update search index", lambda: explorer_search.on_block_mined(genesis_block, []),
+                              explorer_search.invalidate)
                 latest_block = genesis_block
 
             # 3. 准备新区块数据
@@ -147,6 +176,8 @@ class MiningService:
             self.db.add(new_block)
 
             # 7. 处理区块中的交易
+            onchain_projects = []
+            block_transactions: List[Transaction] = []
             for tx_data in pending_transactions:
                 # 创建确认的交易记录
                 transaction = Transaction(
@@ -158,19 +189,13 @@ class MiningService:
                     block_hash=block_hash,
                     block_number=new_block_number,
                     gas_fee=tx_data.gas_fee,
-                    data=json.dumps(tx_data.data) if tx_data.data else None,
+                    # 直接沿用交易池中已编码的 data，不重新编码
+                    data=pool_payloads.get(tx_data.transaction_hash),
                     is_confirmed=True,
                     confirmed_at=datetime.now(CN_TZ),
                 )
                 self.db.add(transaction)
-
-                # 确认对应的捐赠交易
-                if tx_data.transaction_type == "donation":
-                    await self.donation_service.confirm_donation(
-                        tx_data.transaction_hash,
-                        block_hash,
-                        new_block_number,
-                    )
+                block_transactions.append(transaction)
 
                 # 处理项目创世交易（项目上链）
                 if tx_data.transaction_type == "project_creation":
@@ -184,6 +209,7 @@ class MiningService:
                             result_project = await self.db.execute(stmt_project)
                             project = result_project.scalars().first()
                             if project:
+                                onchain_projects.append(project)
                                 project.status = "on_chain"
                                 project.blockchain_tx_hash = tx_data.transaction_hash
                                 project.on_chain_at = datetime.now(CN_TZ)
@@ -199,11 +225,62 @@ class MiningService:
                     )
                 )
 
-            # 8. 给矿工发放奖励（占位实现）
+            # 8. 按区块批量确认捐赠并原子累加项目已筹金额，
+            #    同时维护捐赠统计汇总、趋势时间桶与去重捐赠人数草图（与区块同一事务提交）
+            donation_hashes = [
+                tx.transaction_hash for tx in pending_transactions
+                if tx.transaction_type == "donation"
+            ]
+            confirmed_donations = await self.donation_service.confirm_block_donations(
+                donation_hashes, block_hash, new_block_number
+            )
+            await DonationStatsService(self.db).apply_confirmed(confirmed_donations)
+            await DonationTrendService(self.db).apply_confirmed(confirmed_donations)
+            await DonorSketchService(self.db).apply_confirmed(confirmed_donations)
+
+            # 9. 写入地址流水索引与余额（需要交易 id，先 flush）
+            await self.db.flush()
+            await AddressLedgerService(self.db).apply_block(block_transactions)
+
+            # 给矿工发放奖励（占位实现）
             await self._reward_miner(miner_address, settings.mining_reward)
 
             await self.db.commit()
 
+            # 10. 区块已提交，以下均为进程内状态与事件推送：任何一步失败都只记录日志并让对应缓存失效，
+            #     不能落入下面的 except 把已提交的区块报告为挖矿失败
+            try:
+                # 增量更新链头状态（需要回读 server_default 生成的区块时间戳）
+                await self.db.refresh(new_block)
+                chain_tip.on_block_mined(new_block, len(pending_transactions))
+                chain_tip.on_pool_removed(len(pending_transactions))
+            except Exception as e:
+                print("ERROR: update chain tip failed:", e)
+                chain_tip.invalidate()
+            _after_commit("publish block event", lambda: publish_block_mined(new_block))
+            _after_commit("publish donation events", lambda: publish_donations_confirmed(confirmed_donations))
+            _after_commit("update donation feed", lambda: donation_feed.on_confirmed(confirmed_donations),
+                          donation_feed.invalidate)
+            # 已筹金额或状态发生变化的项目，失效其详情 / 进度缓存
+            _after_commit(
+                "invalidate project cache",
+                lambda: invalidate_projects(
+                    [d.project_id for d in confirmed_donations] + [p.id for p in onchain_projects]
+                ),
+                project_cache.clear,
+            )
+            _after_commit(
+                "update search index",
+                lambda: explorer_search.on_block_mined(new_block, block_transactions, onchain_projects),
+                explorer_search.invalidate,
+            )
+            try:
+                await rankings.apply_confirmed(self.db, confirmed_donations)
+            except Exception as e:
+                # 区块已提交，排行榜更新失败只需等待对账修正
+                print("ERROR: update rankings failed:", e)
+                rankings.invalidate()
+
             mining_time = time.time() - start_time
 
             return MiningResult(
@@ -217,6 +294,10 @@ class MiningService:
 
         except Exception:
             await self.db.rollback()
+            # 挖矿中途失败时部分写入可能已提交（如创世区块），链头状态交由下次读取重新加载
+            chain_tip.invalidate()
+            rankings.invalidate()
+            project_cache.clear()
             return MiningResult(success=False)
 
         finally:
@@ -0,0 +1,37 @@
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import AsyncTTLCache
+from app.core.config import settings
+from app.db.models.projects import Project
+from app.schemas.projects import ProjectResponse
+from app.services.donor_sketch import DonorSketchService
+
+# 进程级单例：项目详情 / 进度路由读取，挖矿与项目状态变更路径失效
+project_cache = AsyncTTLCache(settings.project_cache_size, settings.project_cache_ttl)
+
+
+async def get_project_snapshot(db: AsyncSession, project_id: int) -> Optional[Dict[str, Any]]:
+    """读取项目快照（ProjectResponse 字段 + unique_donors），未命中时读库并缓存。
+
+    缓存的是与会话无关的 dict，而不是 ORM 对象；项目不存在时返回 None 且不缓存。
+    """
+
+    async def load() -> Optional[Dict[str, Any]]:
+        result = await db.execute(select(Project).where(Project.id == project_id))
+        project = result.scalars().first()
+        if not project:
+            return None
+        snapshot = ProjectResponse.model_validate(project, from_attributes=True).model_dump()
+        snapshot["unique_donors"] = await DonorSketchService(db).get_unique_donors(project_id)
+        return snapshot
+
+    return await project_cache.get_or_load(project_id, load)
+
+
+def invalidate_projects(project_ids: Iterable[int]) -> None:
+    """项目已筹金额 / 状态 / 基础信息变更后调用（须在事务提交之后）"""
+    for project_id in set(project_ids):
+        project_cache.invalidate(project_id)
@@ -1,13 +1,15 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 from app.db.models.projects import Project, ProjectStatus
 from app.db.models.user import User
 from app.schemas.projects import ProjectCreate, ProjectApprove
+from app.core.pagination import paginate
 from app.services.block_chain import ProjectBlockchainService, BlockchainService
+from app.services.project_cache import invalidate_projects
 import datetime
 from app.db.models.block_chain import TransactionPool
-import json
+from app.core.payload_codec import decode_payload
 
 from datetime import datetime, timedelta, timezone
 CN_TZ = timezone(timedelta(hours=8))
@@ -63,6 +65,7 @@ class ProjectService:
         try:
             await self.db.commit()
             await self.db.refresh(project)
+            invalidate_projects([project.id])
             return project
         except Exception:
             await self.db.rollback()
@@ -90,7 +93,7 @@ class ProjectService:
         existing_result = await self.db.execute(existing_stmt)
         for pool_tx in existing_result.scalars().all():
             try:
-                data = json.loads(pool_tx.data) if pool_tx.data else {}
+                data = decode_payload(pool_tx.data) or {}
             except Exception:
                 data = {}
             if not isinstance(data, dict):
@@ -121,6 +124,7 @@ class ProjectService:
         try:
             await self.db.commit()
             await self.db.refresh(project)
+            invalidate_projects([project.id])
             return project
         except Exception:
             await self.db.rollback()
@@ -139,21 +143,7 @@ class ProjectService:
         if status:
             stmt = stmt.where(Project.status == status)
 
-        total_stmt = select(func.count()).select_from(stmt.subquery())
-        total_result = await self.db.execute(total_stmt)
-        total = total_result.scalar_one()
-
-        # pagination
-        stmt = (
-            stmt.order_by(Project.created_at.desc())
-                .offset((page - 1) * size)
-                .limit(size)
-        )
-
-        result = await self.db.execute(stmt)
-        projects = result.scalars().all()
-
-        return projects, total
+        return await paginate(self.db, stmt, page, size, Project.created_at.desc())
 
     def get_project_progress(self, project_id: int) -> Optional[dict]:
         """获取项目进度"""
@@ -0,0 +1,233 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.leaderboard import Leaderboard
+from app.db.models.donation import Donation, TransactionStatus
+from app.db.models.projects import Project, ProjectStatus
+from app.db.models.user import User
+
+# 可用的排行维度
+DONOR_ORDERS = ("amount", "count")
+PROJECT_ORDERS = ("amount", "count", "progress")
+
+# 参与项目榜的项目状态（已上链可接受捐赠 / 已完成）
+_RANKED_PROJECT_STATUSES = (ProjectStatus.ON_CHAIN.value, ProjectStatus.COMPLETED.value)
+
+
+def _progress(current_amount: Optional[float], target_amount: Optional[float]) -> float:
+    if not target_amount:
+        return 0.0
+    return float(current_amount or 0) / float(target_amount)
+
+
+class RankingState:
+    """捐赠者 / 项目排行榜（进程内 Top-K 有序结构）。
+
+    **设计要点：**
+    - 捐赠者按累计金额、捐赠次数各一个榜；项目按已筹金额、捐赠次数、筹款进度各一个榜；
+    - 区块提交成功后由挖矿路径按本块确认的捐赠增量更新，读取只切片前 K 名，不访问数据库；
+    - 匿名捐赠不进入捐赠者榜，但计入项目榜；
+    - 启动时及每隔 ranking_reconcile_interval_seconds 用 GROUP BY 从数据库对账，
+      修正漂移并同步其他 worker 挖出的区块；对账期间如有增量写入则放弃本次结果，下次读取再对账。
+    """
+
+    def __init__(self, capacity: int = 100) -> None:
+        self.capacity = capacity
+        self.boards: Dict[str, Leaderboard] = {}
+        self.donor_names: Dict[int, str] = {}
+        self.projects: Dict[int, Dict[str, Any]] = {}
+        self.version = 0
+        self.stale = True
+        self.reconciled_at: Optional[float] = None
+        self._applying = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._reset_boards()
+
+    def _reset_boards(self) -> None:
+        self.boards = {
+            f"donors:{order}": Leaderboard(self.capacity) for order in DONOR_ORDERS
+        }
+        self.boards.update({
+            f"projects:{order}": Leaderboard(self.capacity) for order in PROJECT_ORDERS
+        })
+
+    # ---------- 对账 ----------
+
+    async def reconcile(self, db: AsyncSession) -> bool:
+        """从数据库全量重算排行榜；期间发生增量写入时放弃结果并返回 False"""
+        started_version = self.version
+        confirmed = Donation.status == TransactionStatus.CONFIRMED
+
+        donor_rows = (await db.execute(
+            select(
+                Donation.donor_id,
+                User.username,
+                func.coalesce(func.sum(Donation.amount), 0),
+                func.count(Donation.id),
+            )
+            .join(User, User.id == Donation.donor_id)
+            .where(confirmed, Donation.is_anonymous.is_not(True))
+            .group_by(Donation.donor_id, User.username)
+        )).all()
+
+        project_counts = dict((await db.execute(
+            select(Donation.project_id, func.count(Donation.id))
+            .where(confirmed)
+            .group_by(Donation.project_id)
+        )).all())
+
+        project_rows = (await db.execute(
+            select(Project.id, Project.title, Project.current_amount, Project.target_amount, Project.status)
+            .where(Project.status.in_(_RANKED_PROJECT_STATUSES))
+        )).all()
+
+        if self.version != started_version or self._applying:
+            return False
+
+        donor_names = {}
+        donor_amounts, donor_counts = {}, {}
+        for donor_id, username, total, count in donor_rows:
+            donor_names[donor_id] = username
+            donor_amounts[donor_id] = float(total or 0)
+            donor_counts[donor_id] = count
+
+        projects = {}
+        project_amounts, project_donation_counts, project_progress = {}, {}, {}
+        for project_id, title, current_amount, target_amount, status in project_rows:
+            projects[project_id] = {
+                "title": title,
+                "current_amount": float(current_amount or 0),
+                "target_amount": float(target_amount or 0),
+                "status": status,
+            }
+            project_amounts[project_id] = float(current_amount or 0)
+            project_donation_counts[project_id] = project_counts.get(project_id, 0)
+            project_progress[project_id] = _progress(current_amount, target_amount)
+
+        self.boards["donors:amount"].load(donor_amounts)
+        self.boards["donors:count"].load(donor_counts)
+        self.boards["projects:amount"].load(project_amounts)
+        self.boards["projects:count"].load(project_donation_counts)
+        self.boards["projects:progress"].load(project_progress)
+        self.donor_names = donor_names
+        self.projects = projects
+        self.version += 1
+        self.stale = False
+        self.reconciled_at = time.time()
+        return True
+
+    def invalidate(self) -> None:
+        """标记需要对账（例如挖矿中途失败，无法确定哪些捐赠已提交）"""
+        self.stale = True
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """仅在未加载 / stale 时访问数据库（并发读取合并为一次对账）"""
+        if not self.stale:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.stale:
+                await self.reconcile(db)
+
+    # ---------- 增量维护 ----------
+
+    async def apply_confirmed(self, db: AsyncSession, donations: Iterable[Donation]) -> None:
+        """区块提交后按本块确认的捐赠更新排行榜。
+
+        只补查榜单展示所需的标签：新出现的捐赠者用户名、本块涉及项目的最新金额与目标
+        （项目金额以数据库为准，不在内存中累加）。
+        """
+        donations = list(donations)
+        if not donations:
+            return
+
+        # 补查标签期间让并发的对账放弃结果，避免对账读到本块后又被增量重复累加
+        self._applying += 1
+        try:
+            await self._apply_confirmed(db, donations)
+        finally:
+            self._applying -= 1
+            self.version += 1
+
+    async def _apply_confirmed(self, db: AsyncSession, donations: List[Donation]) -> None:
+        donor_ids = {d.donor_id for d in donations if not d.is_anonymous}
+        missing = donor_ids - set(self.donor_names)
+        if missing:
+            rows = (await db.execute(select(User.id, User.username).where(User.id.in_(missing)))).all()
+            for user_id, username in rows:
+                self.donor_names[user_id] = username
+
+        project_ids = {d.project_id for d in donations}
+        project_rows = (await db.execute(
+            select(Project.id, Project.title, Project.current_amount, Project.target_amount, Project.status)
+            .where(Project.id.in_(project_ids))
+        )).all()
+
+        for donation in donations:
+            if not donation.is_anonymous:
+                self.boards["donors:amount"].add(donation.donor_id, float(donation.amount or 0))
+                self.boards["donors:count"].add(donation.donor_id, 1)
+            self.boards["projects:count"].add(donation.project_id, 1)
+
+        for project_id, title, current_amount, target_amount, status in project_rows:
+            self.projects[project_id] = {
+                "title": title,
+                "current_amount": float(current_amount or 0),
+                "target_amount": float(target_amount or 0),
+                "status": status,
+            }
+            self.boards["projects:amount"].set(project_id, float(current_amount or 0))
+            self.boards["projects:progress"].set(project_id, _progress(current_amount, target_amount))
+
+    # ---------- 读取 ----------
+
+    def top_donors(self, order: str = "amount", limit: int = 10) -> List[Dict[str, Any]]:
+        amounts, counts = self.boards["donors:amount"], self.boards["donors:count"]
+        items = []
+        for rank, (donor_id, _) in enumerate(self.boards[f"donors:{order}"].top(limit), start=1):
+            items.append({
+                "rank": rank,
+                "donor_id": donor_id,
+                "username": self.donor_names.get(donor_id),
+                "total_amount": round(amounts.score(donor_id), 8),
+                "donation_count": int(counts.score(donor_id)),
+            })
+        return items
+
+    def top_projects(self, order: str = "amount", limit: int = 10) -> List[Dict[str, Any]]:
+        counts = self.boards["projects:count"]
+        items = []
+        for rank, (project_id, _) in enumerate(self.boards[f"projects:{order}"].top(limit), start=1):
+            info = self.projects.get(project_id, {})
+            items.append({
+                "rank": rank,
+                "project_id": project_id,
+                "title": info.get("title"),
+                "current_amount": info.get("current_amount", 0.0),
+                "target_amount": info.get("target_amount", 0.0),
+                "progress": round(_progress(info.get("current_amount"), info.get("target_amount")) * 100, 2),
+                "donation_count": int(counts.score(project_id)),
+            })
+        return items
+
+
+async def reconcile_periodically(session_factory) -> None:
+    """后台定期对账（由应用启动时创建任务）"""
+    while True:
+        await asyncio.sleep(settings.ranking_reconcile_interval_seconds)
+        try:
+            async with session_factory() as db:
+                if not await rankings.reconcile(db):
+                    rankings.invalidate()
+        except Exception as e:
+            print("ERROR: reconcile rankings failed:", e)
+
+
+# 进程级单例：排行榜路由与挖矿路径共享
+rankings = RankingState(settings.ranking_size)
@@ -0,0 +1,414 @@
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    Column, DateTime, Float, Integer, MetaData, String, Table,
+    and_, case, exists, func, insert, or_, select, update,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, AsyncSession
+
+from app.core.config import settings
+from app.core.hex_binary import HexBinary
+from app.core.payload_codec import decode_payload
+from app.db.models.block_chain import Transaction, TransactionPool
+from app.db.models.donation import Donation, TransactionStatus
+from app.db.models.projects import Project, ProjectStatus
+from app.services.explorer import archive_store
+
+# 影子表不属于业务模型（不进 Base.metadata，不参与迁移 / 快照），每次回放时重建
+shadow_metadata = MetaData()
+
+chain_donations = Table(
+    "replay_chain_donations", shadow_metadata,
+    Column("transaction_hash", HexBinary(64), primary_key=True),
+    Column("block_hash", HexBinary(64), nullable=False),
+    Column("block_number", Integer, nullable=False),
+    Column("confirmed_at", DateTime, nullable=True),
+)
+project_creations = Table(
+    "replay_project_creations", shadow_metadata,
+    Column("project_id", Integer, primary_key=True),
+    Column("transaction_hash", HexBinary(64), nullable=False),
+    Column("to_address", HexBinary(64), nullable=False),
+    Column("block_number", Integer, nullable=False),
+)
+replay_projects = Table(
+    "replay_projects", shadow_metadata,
+    Column("project_id", Integer, primary_key=True),
+    Column("current_amount", Float, nullable=False),
+    Column("status", String(64), nullable=False),
+)
+
+# 只有这两类交易会派生业务状态
+REPLAYED_TYPES = ("donation", "project_creation")
+DIFF_SAMPLE_SIZE = 20
+
+
+def _payload(data: Any) -> Dict[str, Any]:
+    try:
+        value = decode_payload(data)
+    except Exception:
+        return {}
+    return value if isinstance(value, dict) else {}
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class ReplayService:
+    """按区块顺序从链上交易（归档段 + transactions 表）重放派生状态：
+
+    - Donation.status / block_hash / block_number / confirmed_at：捐赠交易已上链即为 confirmed；
+      标记为 confirmed 但链上没有对应交易的，按是否仍在交易池改回 in_pool / failed；
+    - Project.current_amount：交易已上链的捐赠金额之和（与出块时的累加口径一致）；
+    - Project.status：有上链的项目创世交易为 on_chain，筹满目标金额为 completed；
+      没有创世交易却处于 on_chain / completed 的改回 approved。
+
+    流程：
+    1. 读取方按区块顺序分块读取交易，写入有界队列；replay_workers 个写入任务各用一个连接
+       把分块写入影子表。派生状态只依赖“交易是否上链”与按项目求和，与分块处理顺序无关，
+       各项目互不影响，因此分块可以并行写入；
+    2. 由影子表计算每个项目的期望状态写入 replay_projects，再与现有数据对比得到差异；
+    3. apply 时在一个事务中按影子表批量更新 donations / projects（不是整表替换：
+       业务表上的外键与回放期间的新写入都需要保留），之后重算捐赠统计与去重草图。
+    User.balance 包含链下充值，无法从链上交易推出，只在报告中给出链上扣款合计。
+
+    回放期间仍可能出块：扫描前记录链头区块号 scan_tip，只读取 scan_tip 及之前的交易。
+    区块号大于 scan_tip 的捐赠不按“链上无交易”改回，项目的期望金额 / 状态在对比与更新时
+    加上这些区块已确认的捐赠（关联子查询在 UPDATE 执行时求值），由出块逻辑维护的增量不会被覆盖。
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+        # 扫描的区块高水位，run() 开始时确定
+        self.scan_tip = -1
+
+    # ---------- 影子表 ----------
+
+    async def _reset_shadow(self) -> None:
+        async with self.engine.begin() as conn:
+            await conn.run_sync(shadow_metadata.drop_all)
+            await conn.run_sync(shadow_metadata.create_all)
+
+    async def _drop_shadow(self) -> None:
+        async with self.engine.begin() as conn:
+            await conn.run_sync(shadow_metadata.drop_all)
+
+    # ---------- 读取 ----------
+
+    async def _read_scan_tip(self) -> int:
+        async with self.engine.connect() as conn:
+            hot_tip = (await conn.execute(select(func.max(Transaction.block_number)))).scalar()
+        return max(hot_tip if hot_tip is not None else -1, archive_store.archived_end)
+
+    async def _read_chunks(self, queue: "asyncio.Queue[Optional[List[Dict[str, Any]]]]", stats: Dict[str, int]) -> None:
+        size = settings.replay_chunk_size
+        chunk: List[Dict[str, Any]] = []
+
+        async def emit(tx: Dict[str, Any]) -> None:
+            nonlocal chunk
+            stats["transactions"] += 1
+            if tx["transaction_type"] not in REPLAYED_TYPES:
+                return
+            chunk.append(tx)
+            if len(chunk) >= size:
+                await queue.put(chunk)
+                chunk = []
+
+        for record in archive_store.iter_blocks():
+            for tx in record["transactions"]:
+                await emit(tx)
+
+        columns = [
+            Transaction.transaction_hash, Transaction.transaction_type, Transaction.to_address,
+            Transaction.amount, Transaction.block_hash, Transaction.block_number,
+            Transaction.confirmed_at, Transaction.data,
+        ]
+        async with self.engine.connect() as conn:
+            result = await conn.stream(
+                select(*columns)
+                .where(
+                    Transaction.block_number > archive_store.archived_end,
+                    Transaction.block_number <= self.scan_tip,
+                )
+                .order_by(Transaction.block_number, Transaction.id)
+                .execution_options(yield_per=size)
+            )
+            async for partition in result.mappings().partitions():
+                for row in partition:
+                    await emit(dict(row))
+
+        if chunk:
+            await queue.put(chunk)
+
+    # ---------- 写入影子表 ----------
+
+    async def _write_chunks(self, queue: "asyncio.Queue[Optional[List[Dict[str, Any]]]]") -> None:
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                return
+            donations, creations = [], []
+            for tx in chunk:
+                if tx["transaction_type"] == "donation":
+                    donations.append({
+                        "transaction_hash": tx["transaction_hash"],
+                        "block_hash": tx["block_hash"],
+                        "block_number": tx["block_number"],
+                        "confirmed_at": _timestamp(tx.get("confirmed_at")),
+                    })
+                    continue
+                project_id = _payload(tx.get("data")).get("project_id")
+                if project_id:
+                    creations.append({
+                        "project_id": int(project_id),
+                        "transaction_hash": tx["transaction_hash"],
+                        "to_address": tx["to_address"],
+                        "block_number": tx["block_number"],
+                    })
+            async with self.engine.begin() as conn:
+                if donations:
+                    await conn.execute(insert(chain_donations), donations)
+                if creations:
+                    await conn.execute(insert(project_creations), creations)
+
+    # ---------- 计算期望状态 ----------
+
+    async def _build_projects(self, db: AsyncSession) -> None:
+        amounts = dict((await db.execute(
+            select(Donation.project_id, func.sum(Donation.amount))
+            .join(chain_donations, chain_donations.c.transaction_hash == Donation.transaction_hash)
+            .group_by(Donation.project_id)
+        )).all())
+        created = set((await db.execute(select(project_creations.c.project_id))).scalars().all())
+
+        rows = []
+        for project_id, target, status in (await db.execute(
+            select(Project.id, Project.target_amount, Project.status)
+        )).all():
+            amount = float(amounts.get(project_id) or 0.0)
+            if project_id in created:
+                expected = ProjectStatus.COMPLETED.value if amount >= (target or 0) else ProjectStatus.ON_CHAIN.value
+            elif status in (ProjectStatus.ON_CHAIN.value, ProjectStatus.COMPLETED.value):
+                expected = ProjectStatus.APPROVED.value
+            else:
+                expected = status
+            rows.append({"project_id": project_id, "current_amount": amount, "status": expected})
+        if rows:
+            await db.execute(insert(replay_projects), rows)
+        await db.commit()
+
+    # ---------- 差异 ----------
+
+    @staticmethod
+    def _donation_drift():
+        """已上链但状态 / 区块字段不一致的捐赠"""
+        return and_(
+            Donation.transaction_hash == chain_donations.c.transaction_hash,
+            or_(
+                Donation.status != TransactionStatus.CONFIRMED.value,
+                Donation.block_number.is_distinct_from(chain_donations.c.block_number),
+                Donation.block_hash.is_distinct_from(chain_donations.c.block_hash),
+            ),
+        )
+
+    def _donation_phantom(self):
+        """标记为已确认但链上没有对应交易的捐赠（scan_tip 之后的区块确认的不在此列）"""
+        return and_(
+            Donation.status == TransactionStatus.CONFIRMED.value,
+            or_(Donation.block_number.is_(None), Donation.block_number <= self.scan_tip),
+            ~exists().where(chain_donations.c.transaction_hash == Donation.transaction_hash),
+        )
+
+    def _expected_amount(self):
+        """期望的已筹金额：扫描到的链上捐赠 + scan_tip 之后的区块确认的捐赠"""
+        late = (
+            select(func.coalesce(func.sum(Donation.amount), 0))
+            .where(
+                Donation.project_id == Project.id,
+                Donation.status == TransactionStatus.CONFIRMED.value,
+                Donation.block_number > self.scan_tip,
+            )
+            .scalar_subquery()
+        )
+        return replay_projects.c.current_amount + late
+
+    def _expected_status(self):
+        """期望的项目状态：scan_tip 之后才上链的项目保持现状，之后的捐赠可能把项目推到筹满"""
+        created_late = exists().where(
+            Transaction.transaction_hash == Project.blockchain_tx_hash,
+            Transaction.block_number > self.scan_tip,
+        )
+        return case(
+            (created_late, Project.status),
+            (and_(replay_projects.c.status == ProjectStatus.ON_CHAIN.value,
+                  self._expected_amount() >= Project.target_amount),
+             ProjectStatus.COMPLETED.value),
+            else_=replay_projects.c.status,
+        )
+
+    def _project_drift(self):
+        return and_(
+            Project.id == replay_projects.c.project_id,
+            or_(
+                func.abs(func.coalesce(Project.current_amount, 0) - self._expected_amount()) > 1e-6,
+                Project.status.is_distinct_from(self._expected_status()),
+            ),
+        )
+
+    async def _diff(self, db: AsyncSession) -> Dict[str, Any]:
+        drift = (await db.execute(
+            select(Donation.id, Donation.status, Donation.block_number, chain_donations.c.block_number)
+            .select_from(Donation).join(chain_donations, self._donation_drift())
+            .order_by(Donation.id)
+        )).all()
+        phantom = (await db.execute(
+            select(Donation.id, Donation.status, Donation.block_number)
+            .where(self._donation_phantom()).order_by(Donation.id)
+        )).all()
+        projects = (await db.execute(
+            select(Project.id, Project.current_amount, Project.status,
+                   self._expected_amount(), self._expected_status())
+            .select_from(Project).join(replay_projects, self._project_drift())
+            .order_by(Project.id)
+        )).all()
+        orphans = (await db.execute(
+            select(func.count()).select_from(chain_donations).where(
+                ~exists().where(Donation.transaction_hash == chain_donations.c.transaction_hash)
+            )
+        )).scalar() or 0
+
+        return {
+            "donations_unconfirmed": len(drift),
+            "donations_phantom": len(phantom),
+            "projects": len(projects),
+            "orphan_chain_donations": orphans,
+            "samples": {
+                "donations": [
+                    {"id": id_, "status": status, "block_number": block, "chain_block_number": chain_block}
+                    for id_, status, block, chain_block in drift[:DIFF_SAMPLE_SIZE]
+                ] + [
+                    {"id": id_, "status": status, "block_number": block, "chain_block_number": None}
+                    for id_, status, block in phantom[:DIFF_SAMPLE_SIZE]
+                ],
+                "projects": [
+                    {"id": id_, "current_amount": amount, "status": status,
+                     "expected_amount": expected_amount, "expected_status": expected_status}
+                    for id_, amount, status, expected_amount, expected_status in projects[:DIFF_SAMPLE_SIZE]
+                ],
+            },
+        }
+
+    async def _user_debits(self, db: AsyncSession) -> int:
+        """有链上捐赠扣款的用户数（User.balance 含链下充值，不重放）"""
+        return (await db.execute(
+            select(func.count(func.distinct(Donation.donor_id)))
+            .join(chain_donations, chain_donations.c.transaction_hash == Donation.transaction_hash)
+        )).scalar() or 0
+
+    # ---------- 应用 ----------
+
+    async def _apply(self, db: AsyncSession) -> None:
+        in_pool = exists().where(TransactionPool.transaction_hash == Donation.transaction_hash)
+        await db.execute(
+            update(Donation)
+            .where(self._donation_drift())
+            .values(
+                status=TransactionStatus.CONFIRMED.value,
+                block_hash=chain_donations.c.block_hash,
+                block_number=chain_donations.c.block_number,
+                confirmed_at=func.coalesce(Donation.confirmed_at, chain_donations.c.confirmed_at),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        for status, condition in (
+            (TransactionStatus.IN_POOL.value, in_pool),
+            (TransactionStatus.FAILED.value, ~in_pool),
+        ):
+            await db.execute(
+                update(Donation)
+                .where(self._donation_phantom(), condition)
+                .values(status=status, block_hash=None, block_number=None, confirmed_at=None)
+                .execution_options(synchronize_session=False)
+            )
+        await db.execute(
+            update(Project)
+            .where(self._project_drift())
+            .values(current_amount=self._expected_amount(), status=self._expected_status())
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    async def _rebuild_rollups(self, db: AsyncSession) -> None:
+        from app.services.donation_stats import DonationStatsService
+        from app.services.donor_sketch import DonorSketchService
+
+        await DonationStatsService(db).rebuild()
+        await DonorSketchService(db).rebuild()
+
+    # ---------- 入口 ----------
+
+    async def run(self, apply: bool = False) -> Dict[str, Any]:
+        started = time.perf_counter()
+        stats = {"transactions": 0}
+        await self._reset_shadow()
+        self.scan_tip = await self._read_scan_tip()
+        try:
+            queue: "asyncio.Queue[Optional[List[Dict[str, Any]]]]" = asyncio.Queue(
+                maxsize=settings.replay_workers * 2
+            )
+            workers = [asyncio.create_task(self._write_chunks(queue)) for _ in range(settings.replay_workers)]
+            try:
+                await self._read_chunks(queue, stats)
+                for _ in workers:
+                    await queue.put(None)
+                await asyncio.gather(*workers)
+            except BaseException:
+                for worker in workers:
+                    worker.cancel()
+                raise
+            scanned = time.perf_counter() - started
+
+            async with self.session_factory() as db:
+                await self._build_projects(db)
+                diff = await self._diff(db)
+                diff["users_with_chain_debits"] = await self._user_debits(db)
+                changed = diff["donations_unconfirmed"] + diff["donations_phantom"] + diff["projects"]
+                if apply and changed:
+                    await self._apply(db)
+                    if diff["donations_unconfirmed"] + diff["donations_phantom"]:
+                        await self._rebuild_rollups(db)
+        finally:
+            await self._drop_shadow()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "applied": bool(apply and changed),
+            "scan_tip": self.scan_tip,
+            "transactions": stats["transactions"],
+            "scan_seconds": round(scanned, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "transactions_per_second": round(stats["transactions"] / scanned, 1) if scanned > 0 else None,
+            "diff": diff,
+        }
+
+
+async def _main(args: List[str]) -> None:
+    from app.db.base import engine
+
+    report = await ReplayService(engine).run(apply="--apply" in args)
+    print(json.dumps(report, ensure_ascii=False, indent=1, default=str))
+
+
+if __name__ == "__main__":
+    # 只报告差异：python -m app.services.replay
+    # 报告并修正：python -m app.services.replay --apply
+    asyncio.run(_main(sys.argv[1:]))
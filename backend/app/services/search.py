@@ -0,0 +1,192 @@
+import asyncio
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.prefix_index import PrefixIndex, normalize_key
+from app.core.segments import KIND_BLOCK, KIND_TRANSACTION
+from app.db.models.block_chain import Block, Transaction
+from app.db.models.projects import Project
+from app.services.explorer import archive_store
+
+BLOCK = "block"
+TRANSACTION = "transaction"
+ADDRESS = "address"
+PROJECT = "project"
+
+
+def _block_entry(block: Block):
+    return block.block_hash, BLOCK, block.block_number, {
+        "key": block.block_hash,
+        "block_number": block.block_number,
+    }
+
+
+def _transaction_entries(tx: Transaction):
+    yield tx.transaction_hash, TRANSACTION, tx.transaction_hash, {
+        "key": tx.transaction_hash,
+        "block_number": tx.block_number,
+        "transaction_type": tx.transaction_type,
+    }
+    for address in (tx.from_address, tx.to_address):
+        yield address, ADDRESS, address, {"key": address}
+
+
+def _project_entries(project_id: int, title: str, address: Optional[str], tx_hash: Optional[str]):
+    payload = {"project_id": project_id, "title": title}
+    if address:
+        yield address, PROJECT, project_id, dict(payload, key=address)
+    if tx_hash:
+        yield tx_hash, PROJECT, ("tx", project_id), dict(payload, key=tx_hash)
+
+
+class ExplorerSearch:
+    """区块浏览器统一搜索：区块哈希 / 交易哈希 / 地址 / 项目地址与上链交易哈希的前缀查找。
+
+    - 启动时从数据库加载到 PrefixIndex（有序数组 + 二分查找），查询不访问数据库；
+    - 挖矿路径在区块提交后把新区块、交易、地址与上链项目追加进索引；
+    - 其他 worker 挖出的区块不会推送到本进程：读取时每隔 search_catch_up_seconds
+      查询一次 block_number 大于已索引高度的区块并追加。
+    """
+
+    def __init__(self) -> None:
+        self.index = PrefixIndex()
+        self.last_block_number = -1
+        self.loaded = False
+        self.checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    # ---------- 预热 / 追赶 ----------
+
+    @staticmethod
+    async def _batches(db: AsyncSession, columns, id_column, *where):
+        """按 id 分批读取指定列（keyset，不构造 ORM 对象，不读取 data 等大字段）"""
+        last_id = 0
+        while True:
+            rows = (await db.execute(
+                select(id_column, *columns)
+                .where(id_column > last_id, *where)
+                .order_by(id_column)
+                .limit(settings.search_warm_batch_size)
+            )).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    async def _load_since(self, db: AsyncSession, after_block: int) -> Tuple[List[tuple], int]:
+        entries: List[tuple] = []
+        last_block_number = after_block
+
+        async for rows in self._batches(
+            db, (Block.block_hash, Block.block_number, Block.miner_address),
+            Block.id, Block.block_number > after_block,
+        ):
+            for block in rows:
+                entries.append(_block_entry(block))
+                entries.append((block.miner_address, ADDRESS, block.miner_address, {"key": block.miner_address}))
+                last_block_number = max(last_block_number, block.block_number)
+
+        project_tx_hashes = []
+        async for rows in self._batches(
+            db,
+            (Transaction.transaction_hash, Transaction.block_number, Transaction.transaction_type,
+             Transaction.from_address, Transaction.to_address),
+            Transaction.id, Transaction.block_number > after_block,
+        ):
+            for tx in rows:
+                entries.extend(_transaction_entries(tx))
+                if tx.transaction_type == "project_creation":
+                    project_tx_hashes.append(tx.transaction_hash)
+
+        project_stmt = select(Project.id, Project.title, Project.blockchain_address, Project.blockchain_tx_hash)
+        if after_block >= 0:
+            project_stmt = project_stmt.where(Project.blockchain_tx_hash.in_(project_tx_hashes))
+        else:
+            project_stmt = project_stmt.where(Project.blockchain_address.is_not(None))
+        if after_block < 0 or project_tx_hashes:
+            for project_id, title, address, tx_hash in (await db.execute(project_stmt)).all():
+                entries.extend(_project_entries(project_id, title, address, tx_hash))
+
+        return entries, last_block_number
+
+    async def warm(self, db: AsyncSession) -> None:
+        entries, last_block_number = await self._load_since(db, -1)
+        self.index.load(entries)
+        self.last_block_number = last_block_number
+        self.loaded = True
+        self.checked_at = time.monotonic()
+
+    async def ensure_fresh(self, db: AsyncSession) -> None:
+        """未加载时全量预热；否则按间隔追加其他 worker 挖出的新区块（并发读取合并为一次查询）"""
+        if self.loaded and time.monotonic() - self.checked_at < settings.search_catch_up_seconds:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self.loaded:
+                await self.warm(db)
+                return
+            if time.monotonic() - self.checked_at < settings.search_catch_up_seconds:
+                return
+            entries, last_block_number = await self._load_since(db, self.last_block_number)
+            for key, kind, ref, payload in entries:
+                self.index.add(key, kind, ref, payload)
+            self.last_block_number = max(self.last_block_number, last_block_number)
+            self.checked_at = time.monotonic()
+
+    # ---------- 增量维护 ----------
+
+    def on_block_mined(self, block: Block, transactions: Iterable[Transaction],
+                       projects: Iterable[Project] = ()) -> None:
+        if not self.loaded:
+            return
+        self.index.add(*_block_entry(block))
+        self.index.add(block.miner_address, ADDRESS, block.miner_address, {"key": block.miner_address})
+        for tx in transactions:
+            for entry in _transaction_entries(tx):
+                self.index.add(*entry)
+        for project in projects:
+            for entry in _project_entries(project.id, project.title, project.blockchain_address,
+                                          project.blockchain_tx_hash):
+                self.index.add(*entry)
+        self.last_block_number = max(self.last_block_number, block.block_number)
+
+    def invalidate(self) -> None:
+        """增量追加失败时调用：下次读取立即从已索引高度之后追赶（重复追加的条目会覆盖）"""
+        self.checked_at = 0.0
+
+    # ---------- 查询 ----------
+
+    def search(self, q: str, limit: int = 20) -> List[Dict[str, Any]]:
+        hits: List[Dict[str, Any]] = []
+        q = (q or "").strip()
+        # 纯数字同时按区块高度精确匹配
+        if q.isdigit() and 0 <= int(q) <= self.last_block_number:
+            hits.append({"type": BLOCK, "exact": True, "key": q, "block_number": int(q)})
+        hits.extend(self.index.search(q, limit))
+        if not any(hit["exact"] for hit in hits):
+            hits[:0] = self._search_archive(q)
+        return hits[:limit]
+
+    @staticmethod
+    def _search_archive(q: str) -> List[Dict[str, Any]]:
+        """索引只包含热表数据：完整哈希未命中时再到归档段的哈希表中精确查找"""
+        key = normalize_key(q)
+        if len(key) != 64:
+            return []
+        block_number = archive_store.find_block_number(KIND_BLOCK, key)
+        if block_number is not None:
+            return [{"type": BLOCK, "exact": True, "key": key, "block_number": block_number}]
+        tx = archive_store.find_transaction(key)
+        if tx is not None:
+            return [{"type": TRANSACTION, "exact": True, "key": key,
+                     "block_number": tx["block_number"], "transaction_type": tx["transaction_type"]}]
+        return []
+
+
+# 进程级单例：搜索路由读取，挖矿路径追加
+explorer_search = ExplorerSearch()
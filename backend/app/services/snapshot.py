@@ -0,0 +1,268 @@
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Date, DateTime, Index, LargeBinary, Numeric, Table, delete, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+from app.db.base import Base
+from app.services.explorer import archive_store
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # 保留精度，按字符串保存
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"$b64": base64.b64encode(bytes(value)).decode("ascii")}
+    return value
+
+
+def _decoder(table: Table):
+    """按列类型把 NDJSON 中的值还原为数据库驱动接受的 Python 类型"""
+    datetimes = {c.name for c in table.columns if isinstance(c.type, DateTime)}
+    dates = {c.name for c in table.columns if isinstance(c.type, Date) and c.name not in datetimes}
+    # 含以 LargeBinary 存储的自定义列类型（如交易 data），写回时原样保存
+    binaries = {
+        c.name for c in table.columns
+        if isinstance(c.type, LargeBinary) or isinstance(getattr(c.type, "impl", None), LargeBinary)
+    }
+    decimals = {c.name for c in table.columns if isinstance(c.type, Numeric) and c.type.asdecimal}
+
+    def decode(row: Dict[str, Any]) -> Dict[str, Any]:
+        for name in datetimes:
+            if row.get(name) is not None:
+                row[name] = datetime.fromisoformat(row[name])
+        for name in dates:
+            if row.get(name) is not None:
+                row[name] = date.fromisoformat(row[name])
+        for name in decimals:
+            if isinstance(row.get(name), str):
+                row[name] = Decimal(row[name])
+        for name in binaries:
+            if isinstance(row.get(name), dict):
+                row[name] = base64.b64decode(row[name]["$b64"])
+        return row
+
+    return decode
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SnapshotService:
+    """整库快照导出 / 导入，用于快速搭建新节点或预发环境。
+
+    快照目录：每张表一个 {table}.ndjson.gz（逐行 JSON，datetime 为 ISO 字符串，二进制为 base64），
+    加上 manifest.json 记录每个文件的行数与 sha256、链头区块以及已归档的区块范围。
+
+    - 导出在同一个只读事务中完成（MySQL 为 REPEATABLE READ 一致性快照），各表处于同一时间点；
+      以服务端游标流式读取，内存占用与表大小无关；
+    - 导入前先校验全部文件的 sha256；按外键依赖顺序用 Core insert() 分批写入，
+      写入前删除普通二级索引、写完后统一重建（比逐行维护索引快得多），MySQL 上同时关闭外键 / 唯一性检查；
+      唯一索引与外键依赖的索引（首列为外键列）保留不动：MySQL 不允许删除外键所需的索引（错误 1553）；
+    - 导入在一个事务中执行，但 MySQL 上的 DDL（删除 / 重建索引）会隐式提交，因此 MySQL 上导入不是原子的：
+      --replace 清空的数据会先提交，中途失败会留下部分写入的表（索引总会在 finally 中重建），
+      需要修正问题后以 --replace 重新导入；
+    - 冷区块归档段文件（archive_dir）不在快照内，需要与快照一起复制。
+    """
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+
+    @staticmethod
+    def tables() -> List[Table]:
+        return list(Base.metadata.sorted_tables)
+
+    def _is_mysql(self) -> bool:
+        return self.engine.dialect.name == "mysql"
+
+    # ---------- 导出 ----------
+
+    async def dump(self, directory: str) -> Dict[str, Any]:
+        os.makedirs(directory, exist_ok=True)
+        started = time.perf_counter()
+        manifest: Dict[str, Any] = {
+            "format_version": FORMAT_VERSION,
+            "created_at": datetime.now().isoformat(),
+            "tables": {},
+        }
+
+        async with self.engine.connect() as conn:
+            if self._is_mysql():
+                conn = await conn.execution_options(isolation_level="REPEATABLE READ")
+            async with conn.begin():
+                if self._is_mysql():
+                    await conn.execute(text("START TRANSACTION WITH CONSISTENT SNAPSHOT"))
+                for table in self.tables():
+                    manifest["tables"][table.name] = await self._dump_table(conn, table, directory)
+                manifest["chain"] = await self._chain_tip(conn)
+
+        archived_blocks, archived_transactions = archive_store.totals()
+        manifest["archive"] = {
+            "archived_end": archive_store.archived_end,
+            "blocks": archived_blocks,
+            "transactions": archived_transactions,
+        }
+        manifest["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+
+        with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        return manifest
+
+    async def _dump_table(self, conn: AsyncConnection, table: Table, directory: str) -> Dict[str, Any]:
+        filename = f"{table.name}.ndjson.gz"
+        path = os.path.join(directory, filename)
+        rows = 0
+        order = list(table.primary_key.columns)
+        result = await conn.stream(
+            select(table).order_by(*order).execution_options(yield_per=settings.snapshot_batch_size)
+        )
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            async for partition in result.mappings().partitions():
+                lines = [
+                    json.dumps({key: _encode(value) for key, value in row.items()},
+                               ensure_ascii=False, separators=(",", ":"))
+                    for row in partition
+                ]
+                f.write("\n".join(lines) + "\n")
+                rows += len(lines)
+        return {"file": filename, "rows": rows, "sha256": _sha256(path)}
+
+    @staticmethod
+    async def _chain_tip(conn: AsyncConnection) -> Dict[str, Any]:
+        blocks = Base.metadata.tables["blocks"]
+        row = (await conn.execute(
+            select(blocks.c.block_number, blocks.c.block_hash).order_by(blocks.c.block_number.desc()).limit(1)
+        )).first()
+        return {"block_number": row[0], "block_hash": row[1]} if row else {"block_number": -1, "block_hash": None}
+
+    # ---------- 导入 ----------
+
+    @staticmethod
+    def verify(directory: str) -> Dict[str, Any]:
+        """读取清单并校验每个文件的 sha256，不一致时抛出 ValueError"""
+        with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported snapshot format: {manifest.get('format_version')}")
+        for name, meta in manifest["tables"].items():
+            actual = _sha256(os.path.join(directory, meta["file"]))
+            if actual != meta["sha256"]:
+                raise ValueError(f"checksum mismatch for {name}: {actual} != {meta['sha256']}")
+        return manifest
+
+    async def load(self, directory: str, replace: bool = False) -> Dict[str, Any]:
+        manifest = self.verify(directory)
+        tables = [t for t in self.tables() if t.name in manifest["tables"]]
+        started = time.perf_counter()
+        loaded: Dict[str, int] = {}
+
+        async with self.engine.begin() as conn:
+            if self._is_mysql():
+                await conn.execute(text("SET foreign_key_checks = 0"))
+                await conn.execute(text("SET unique_checks = 0"))
+
+            for table in reversed(tables):
+                if replace:
+                    await conn.execute(delete(table))
+                elif (await conn.execute(select(table).limit(1))).first() is not None:
+                    raise ValueError(f"table {table.name} is not empty, use --replace")
+
+            for table in tables:
+                indexes = self._rebuildable_indexes(table)
+                for index in indexes:
+                    await conn.run_sync(index.drop)
+                try:
+                    loaded[table.name] = await self._load_table(
+                        conn, table, directory, manifest["tables"][table.name]
+                    )
+                finally:
+                    for index in indexes:
+                        await conn.run_sync(index.create)
+
+            if self._is_mysql():
+                await conn.execute(text("SET unique_checks = 1"))
+                await conn.execute(text("SET foreign_key_checks = 1"))
+
+        elapsed = time.perf_counter() - started
+        total = sum(loaded.values())
+        return {
+            "rows": loaded,
+            "total_rows": total,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(total / elapsed, 1) if elapsed > 0 else None,
+            "chain": manifest.get("chain"),
+        }
+
+    @staticmethod
+    def _rebuildable_indexes(table: Table) -> List[Index]:
+        """导入期间可以先删除再重建的索引：非唯一，且首列不是外键列"""
+        fk_columns = {fk.parent.name for fk in table.foreign_keys}
+        return [
+            index for index in table.indexes
+            if not index.unique and list(index.columns)[0].name not in fk_columns
+        ]
+
+    @staticmethod
+    async def _load_table(conn: AsyncConnection, table: Table, directory: str, meta: Dict[str, Any]) -> int:
+        decode = _decoder(table)
+        batch: List[Dict[str, Any]] = []
+        rows = 0
+        with gzip.open(os.path.join(directory, meta["file"]), "rt", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                batch.append(decode(json.loads(line)))
+                if len(batch) >= settings.snapshot_batch_size:
+                    await conn.execute(table.insert(), batch)
+                    rows += len(batch)
+                    batch = []
+        if batch:
+            await conn.execute(table.insert(), batch)
+            rows += len(batch)
+        if rows != meta["rows"]:
+            raise ValueError(f"row count mismatch for {table.name}: {rows} != {meta['rows']}")
+        return rows
+
+
+async def _main(args: List[str]) -> Optional[int]:
+    from app.db.base import engine
+
+    service = SnapshotService(engine)
+    if len(args) >= 2 and args[0] == "dump":
+        manifest = await service.dump(args[1])
+        rows = sum(meta["rows"] for meta in manifest["tables"].values())
+        print(f"snapshot written to {args[1]}: {rows} rows, chain tip {manifest['chain']}")
+    elif len(args) >= 2 and args[0] == "load":
+        stats = await service.load(args[1], replace="--replace" in args[2:])
+        print(f"snapshot loaded from {args[1]}: {stats}")
+    else:
+        print("usage: python -m app.services.snapshot dump <dir> | load <dir> [--replace]")
+        return 2
+    return None
+
+
+if __name__ == "__main__":
+    # 导出：python -m app.services.snapshot dump /path/to/snapshot
+    # 导入：python -m app.services.snapshot load /path/to/snapshot [--replace]
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
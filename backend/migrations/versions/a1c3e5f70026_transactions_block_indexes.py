@@ -0,0 +1,30 @@
+"""transactions block_number / block_hash indexes
+
+Revision ID: a1c3e5f70026
+Revises: 
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f70026'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transactions_block_number_id', 'transactions', ['block_number', 'id'], unique=False)
+    op.create_index('ix_transactions_block_hash', 'transactions', ['block_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_block_hash', table_name='transactions')
+    op.drop_index('ix_transactions_block_number_id', table_name='transactions')
@@ -0,0 +1,32 @@
+"""transaction explorer filter indexes
+
+Revision ID: a7c9e1f30042
+Revises: f6b8d0e20040
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1f30042'
+down_revision: Union[str, Sequence[str], None] = 'f6b8d0e20040'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transactions_type_block_id', 'transactions', ['transaction_type', 'block_number', 'id'], unique=False)
+    op.create_index('ix_transactions_confirmed_at_id', 'transactions', ['confirmed_at', 'id'], unique=False)
+    op.create_index('ix_transactions_amount_id', 'transactions', ['amount', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_transactions_amount_id', table_name='transactions')
+    op.drop_index('ix_transactions_confirmed_at_id', table_name='transactions')
+    op.drop_index('ix_transactions_type_block_id', table_name='transactions')
@@ -0,0 +1,32 @@
+"""keyset pagination indexes for transaction pool and donations
+
+Revision ID: b2d4f6a80029
+Revises: a1c3e5f70026
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a80029'
+down_revision: Union[str, Sequence[str], None] = 'a1c3e5f70026'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transaction_pool_created_at_id', 'transaction_pool', ['created_at', 'id'], unique=False)
+    op.create_index('ix_donations_created_at_id', 'donations', ['created_at', 'id'], unique=False)
+    op.create_index('ix_donations_donor_created_at_id', 'donations', ['donor_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_donations_donor_created_at_id', table_name='donations')
+    op.drop_index('ix_donations_created_at_id', table_name='donations')
+    op.drop_index('ix_transaction_pool_created_at_id', table_name='transaction_pool')
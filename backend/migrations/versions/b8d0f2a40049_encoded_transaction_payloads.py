@@ -0,0 +1,68 @@
+"""encoded transaction payloads
+
+Revision ID: b8d0f2a40049
+Revises: a7c9e1f30042
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.payload_codec import encode_payload, payload_text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d0f2a40049'
+down_revision: Union[str, Sequence[str], None] = 'a7c9e1f30042'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('transactions', 'transaction_pool')
+BATCH_SIZE = 1000
+
+
+def _convert(table_name: str, source_type, target_type, convert) -> None:
+    """新增 data_new 列，按 id 分批转换 data 后替换原列"""
+    op.add_column(table_name, sa.Column('data_new', target_type, nullable=True))
+
+    table = sa.table(
+        table_name,
+        sa.column('id', sa.Integer()),
+        sa.column('data', source_type),
+        sa.column('data_new', target_type),
+    )
+    stmt = (
+        table.update()
+        .where(table.c.id == sa.bindparam('_id'))
+        .values(data_new=sa.bindparam('_data'))
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c.data)
+            .where(table.c.id > last_id, table.c.data.isnot(None))
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(stmt, [{'_id': row_id, '_data': convert(data)} for row_id, data in rows])
+        last_id = rows[-1][0]
+
+    op.drop_column(table_name, 'data')
+    op.alter_column(table_name, 'data_new', new_column_name='data', existing_type=target_type, existing_nullable=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name in TABLES:
+        _convert(table_name, sa.Text(), sa.LargeBinary(), lambda data: encode_payload(data) if data else None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name in TABLES:
+        _convert(table_name, sa.LargeBinary(), sa.Text(), payload_text)
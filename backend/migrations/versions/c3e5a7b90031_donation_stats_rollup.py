@@ -0,0 +1,43 @@
+"""donation_stats rollup table
+
+Revision ID: c3e5a7b90031
+Revises: b2d4f6a80029
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b90031'
+down_revision: Union[str, Sequence[str], None] = 'b2d4f6a80029'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'donation_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('donation_count', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('min_amount', sa.Float(), nullable=True),
+        sa.Column('max_amount', sa.Float(), nullable=True),
+        sa.Column('last_donation_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id'),
+    )
+    op.create_index(op.f('ix_donation_stats_id'), 'donation_stats', ['id'], unique=False)
+    # 建表后执行一次全量重算：python -m app.services.donation_stats
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_donation_stats_id'), table_name='donation_stats')
+    op.drop_table('donation_stats')
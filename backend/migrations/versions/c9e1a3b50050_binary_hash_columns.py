@@ -0,0 +1,83 @@
+"""binary hash and address columns
+
+Revision ID: c9e1a3b50050
+Revises: b8d0f2a40049
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.hex_binary import decode_hex, encode_hex
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e1a3b50050'
+down_revision: Union[str, Sequence[str], None] = 'b8d0f2a40049'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 表 -> [(列, 是否可空)]，均为原 String(64) 列
+COLUMNS = {
+    'blocks': [('block_hash', False), ('previous_hash', False), ('merkle_root', False), ('miner_address', False)],
+    'transactions': [('transaction_hash', False), ('from_address', False), ('to_address', False), ('block_hash', True)],
+    'transaction_pool': [('transaction_hash', False), ('from_address', False), ('to_address', False)],
+    'address_ledger': [('address', False), ('transaction_hash', False), ('counterparty', False)],
+    'address_balances': [('address', False)],
+    'donations': [('transaction_hash', True), ('block_hash', True)],
+    'projects': [('blockchain_address', True), ('blockchain_tx_hash', True)],
+    'users': [('wallet_address', False)],
+    'fund_usages': [('transaction_hash', True), ('block_hash', True)],
+    'project_updates': [('transaction_hash', True), ('block_hash', True)],
+}
+BATCH_SIZE = 1000
+
+
+def _rewrite(table_name: str, columns, convert) -> None:
+    """按 id 分批改写列内容（唯一索引保持不变：新旧取值的首字节不同，改写过程中不会互相冲突）"""
+    table = sa.table(table_name, sa.column('id', sa.Integer()), *(sa.column(name, sa.LargeBinary()) for name, _ in columns))
+    names = [name for name, _ in columns]
+    stmt = (
+        table.update()
+        .where(table.c.id == sa.bindparam('_id'))
+        .values({name: sa.bindparam(f'_{name}') for name in names})
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, *(table.c[name] for name in names))
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(stmt, [
+            {'_id': row[0], **{f'_{name}': convert(value) for name, value in zip(names, row[1:])}}
+            for row in rows
+        ])
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table_name, columns in COLUMNS.items():
+        # 先原样转为 VARBINARY（索引随列保留），再把十六进制文本改写为标记 + 原始字节
+        for name, nullable in columns:
+            op.alter_column(table_name, name, type_=sa.VARBINARY(65),
+                            existing_type=sa.String(length=64), existing_nullable=nullable)
+        _rewrite(table_name, columns,
+                 lambda value: encode_hex(bytes(value).decode('utf-8')) if value is not None else None)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table_name, columns in COLUMNS.items():
+        _rewrite(table_name, columns,
+                 lambda value: decode_hex(bytes(value)).encode('utf-8') if value is not None else None)
+        for name, nullable in columns:
+            op.alter_column(table_name, name, type_=sa.String(length=64),
+                            existing_type=sa.VARBINARY(65), existing_nullable=nullable)
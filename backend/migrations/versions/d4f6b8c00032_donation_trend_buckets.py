@@ -0,0 +1,41 @@
+"""donation_trend_buckets time series table
+
+Revision ID: d4f6b8c00032
+Revises: c3e5a7b90031
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8c00032'
+down_revision: Union[str, Sequence[str], None] = 'c3e5a7b90031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'donation_trend_buckets',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('granularity', sa.String(length=8), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('donation_count', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('total_gas_fee', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'granularity', 'bucket_start', name='uq_donation_trend_bucket'),
+    )
+    op.create_index(op.f('ix_donation_trend_buckets_id'), 'donation_trend_buckets', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_donation_trend_buckets_id'), table_name='donation_trend_buckets')
+    op.drop_table('donation_trend_buckets')
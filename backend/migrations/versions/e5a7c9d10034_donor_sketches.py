@@ -0,0 +1,39 @@
+"""donor_sketches hyperloglog table
+
+Revision ID: e5a7c9d10034
+Revises: d4f6b8c00032
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d10034'
+down_revision: Union[str, Sequence[str], None] = 'd4f6b8c00032'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'donor_sketches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=10), nullable=False),
+        sa.Column('sketch', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'period', name='uq_donor_sketch'),
+    )
+    op.create_index(op.f('ix_donor_sketches_id'), 'donor_sketches', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_donor_sketches_id'), table_name='donor_sketches')
+    op.drop_table('donor_sketches')
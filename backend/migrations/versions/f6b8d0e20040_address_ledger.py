@@ -0,0 +1,64 @@
+"""address_ledger and address_balances tables
+
+Revision ID: f6b8d0e20040
+Revises: e5a7c9d10034
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b8d0e20040'
+down_revision: Union[str, Sequence[str], None] = 'e5a7c9d10034'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'address_ledger',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('address', sa.String(length=64), nullable=False),
+        sa.Column('block_number', sa.Integer(), nullable=False),
+        sa.Column('transaction_id', sa.Integer(), nullable=False),
+        sa.Column('transaction_hash', sa.String(length=64), nullable=False),
+        sa.Column('transaction_type', sa.String(length=64), nullable=False),
+        sa.Column('direction', sa.String(length=8), nullable=False),
+        sa.Column('counterparty', sa.String(length=64), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('gas_fee', sa.Float(), nullable=True),
+        sa.Column('balance_after', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_address_ledger_id'), 'address_ledger', ['id'], unique=False)
+    op.create_index('ix_address_ledger_address_id', 'address_ledger', ['address', 'id'], unique=False)
+
+    op.create_table(
+        'address_balances',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('address', sa.String(length=64), nullable=False),
+        sa.Column('balance', sa.Float(), nullable=False),
+        sa.Column('total_in', sa.Float(), nullable=False),
+        sa.Column('total_out', sa.Float(), nullable=False),
+        sa.Column('tx_count', sa.Integer(), nullable=False),
+        sa.Column('last_block_number', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('address'),
+    )
+    op.create_index(op.f('ix_address_balances_id'), 'address_balances', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_address_balances_id'), table_name='address_balances')
+    op.drop_table('address_balances')
+    op.drop_index('ix_address_ledger_address_id', table_name='address_ledger')
+    op.drop_index(op.f('ix_address_ledger_id'), table_name='address_ledger')
+    op.drop_table('address_ledger')
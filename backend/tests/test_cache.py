@@ -0,0 +1,65 @@
+import asyncio
+
+from app.core.cache import AsyncTTLCache
+
+
+def test_invalidate_during_load_discards_the_stale_result():
+    async def run():
+        cache = AsyncTTLCache(maxsize=8, ttl=60)
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_loader():
+            started.set()
+            await release.wait()
+            return "stale"
+
+        task = asyncio.create_task(cache.get_or_load("k", slow_loader))
+        await started.wait()
+        cache.invalidate("k")
+        release.set()
+        assert await task == "stale"
+        assert cache.get("k") is None
+
+        async def fresh_loader():
+            return "fresh"
+
+        assert await cache.get_or_load("k", fresh_loader) == "fresh"
+        assert cache.get("k") == "fresh"
+
+    asyncio.run(run())
+
+
+def test_concurrent_misses_share_one_load():
+    async def run():
+        cache = AsyncTTLCache(maxsize=8, ttl=60)
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+        assert results == [1] * 5
+        assert calls == 1
+
+    asyncio.run(run())
+
+
+def test_invalidated_keys_leave_no_state_behind():
+    async def run():
+        cache = AsyncTTLCache(maxsize=4, ttl=60)
+
+        for key in range(1000):
+            async def loader(key=key):
+                return key
+
+            await cache.get_or_load(key, loader)
+            cache.invalidate(key)
+            cache.invalidate(("never-loaded", key))
+
+        assert len(cache) == 0
+        assert cache._inflight == {}
+
+    asyncio.run(run())
@@ -0,0 +1,42 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.db.models.donation import Donation, TransactionStatus
+from app.db.models.projects import Project, ProjectStatus
+from app.services.donation import DonationService
+
+AMOUNTS = [0.1, 0.1, 0.7]
+
+
+def test_confirm_block_donations_sums_amounts_as_decimal():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Project.__table__.create)
+            await conn.run_sync(Donation.__table__.create)
+
+        hashes = [f"{i:064x}" for i in range(1, len(AMOUNTS) + 1)]
+        async with AsyncSession(engine) as db:
+            db.add(Project(id=1, title="p", description="d", target_amount=0.9, current_amount=0.0,
+                           creator_id=1, status=ProjectStatus.ON_CHAIN.value))
+            db.add_all([
+                Donation(amount=amount, donor_id=1, project_id=1, transaction_hash=tx_hash,
+                         status=TransactionStatus.IN_POOL.value)
+                for amount, tx_hash in zip(AMOUNTS, hashes)
+            ])
+            await db.commit()
+
+            confirmed = await DonationService(db).confirm_block_donations(hashes, "ab" * 32, 7)
+            await db.commit()
+            project = (await db.execute(select(Project).where(Project.id == 1))).scalar_one()
+            result = len(confirmed), project.current_amount, project.status
+        await engine.dispose()
+        return result
+
+    count, current_amount, status = asyncio.run(run())
+    assert count == len(AMOUNTS)
+    # 0.1 + 0.1 + 0.7 以 float 累加为 0.8999999999999999，达不到目标金额
+    assert current_amount == 0.9
+    assert status == ProjectStatus.COMPLETED.value
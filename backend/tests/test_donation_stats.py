@@ -0,0 +1,66 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.db.models.donation_stats import DonationStat, PLATFORM_PROJECT_ID
+from app.services.donation_stats import DonationStatsService
+
+
+def _donation(project_id, amount, at):
+    return SimpleNamespace(project_id=project_id, amount=amount, confirmed_at=at)
+
+
+async def _stats(db):
+    result = await db.execute(select(DonationStat))
+    return {row.project_id: row for row in result.scalars().all()}
+
+
+def test_apply_confirmed_inserts_then_accumulates():
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(DonationStat.__table__.create)
+
+        async with AsyncSession(engine) as db:
+            service = DonationStatsService(db)
+            await service.apply_confirmed([
+                _donation(1, 10.0, datetime(2026, 10, 1, 8)),
+                _donation(2, 5.0, datetime(2026, 10, 1, 9)),
+            ])
+            await service.apply_confirmed([
+                _donation(1, 2.5, datetime(2026, 10, 2, 8)),
+                _donation(1, 30.0, datetime(2026, 10, 1, 7)),
+            ])
+            await db.commit()
+            stats = await _stats(db)
+        await engine.dispose()
+        return stats
+
+    stats = asyncio.run(run())
+    assert set(stats) == {PLATFORM_PROJECT_ID, 1, 2}
+
+    project = stats[1]
+    assert project.donation_count == 3
+    assert project.total_amount == 42.5
+    assert (project.min_amount, project.max_amount) == (2.5, 30.0)
+    assert project.last_donation_at.replace(tzinfo=None) == datetime(2026, 10, 2, 8)
+
+    platform = stats[PLATFORM_PROJECT_ID]
+    assert platform.donation_count == 4
+    assert platform.total_amount == 47.5
+    assert (platform.min_amount, platform.max_amount) == (2.5, 30.0)
+
+
+def test_mysql_upsert_accumulates_on_duplicate_key():
+    service = DonationStatsService(SimpleNamespace(get_bind=lambda: SimpleNamespace(dialect=mysql.dialect())))
+    stmt = service._upsert(
+        {"project_id": 1, "donation_count": 1, "total_amount": 3.0},
+        {"donation_count": DonationStat.donation_count + 1, "total_amount": DonationStat.total_amount + 3.0},
+    )
+    sql = str(stmt.compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE" in sql
+    assert "donation_count = (donation_stats.donation_count + %s)" in sql
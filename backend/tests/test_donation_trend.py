@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.core.upsert import upsert
+from app.db.models.donation_stats import PLATFORM_PROJECT_ID
+from app.db.models.donation_trend import DonationTrendBucket
+from app.services.donation_trend import DonationTrendService
+
+MINUTE = datetime(2026, 10, 19, 8, 30)
+
+
+def _donation(project_id, amount, gas_fee, at):
+    return SimpleNamespace(project_id=project_id, amount=amount, gas_fee=gas_fee, confirmed_at=at)
+
+
+def test_bucket_inserted_by_another_worker_is_accumulated_not_duplicated(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'trend.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(DonationTrendBucket.__table__.create)
+
+        # 另一个 worker 已经提交了同一个分钟桶
+        async with AsyncSession(engine) as other:
+            other.add(DonationTrendBucket(project_id=1, granularity="minute", bucket_start=MINUTE,
+                                          donation_count=2, total_amount=4.0, total_gas_fee=0.2))
+            await other.commit()
+
+        async with AsyncSession(engine) as db:
+            service = DonationTrendService(db)
+            await service.apply_confirmed([_donation(1, 10.0, 0.5, MINUTE.replace(second=5))])
+            await service.apply_confirmed([_donation(1, 1.0, 0.1, MINUTE.replace(second=40))])
+            await db.commit()
+
+            rows = (await db.execute(
+                select(DonationTrendBucket).order_by(DonationTrendBucket.project_id)
+            )).scalars().all()
+        await engine.dispose()
+        return rows
+
+    rows = asyncio.run(run())
+    assert [(r.project_id, r.granularity, r.bucket_start) for r in rows] == [
+        (PLATFORM_PROJECT_ID, "minute", MINUTE),
+        (1, "minute", MINUTE),
+    ]
+    platform, project = rows
+    assert (platform.donation_count, platform.total_amount) == (2, 11.0)
+    assert (project.donation_count, project.total_amount) == (4, 15.0)
+    assert round(project.total_gas_fee, 6) == 0.8
+
+
+def test_mysql_bucket_upsert_uses_on_duplicate_key_update():
+    stmt = upsert(
+        "mysql", DonationTrendBucket,
+        {"project_id": 1, "granularity": "minute", "bucket_start": MINUTE, "donation_count": 1},
+        {"donation_count": DonationTrendBucket.donation_count + 1},
+        [DonationTrendBucket.project_id, DonationTrendBucket.granularity, DonationTrendBucket.bucket_start],
+    )
+    sql = str(stmt.compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE donation_count = (donation_trend_buckets.donation_count + %s)" in sql
@@ -0,0 +1,58 @@
+from datetime import datetime
+from itertools import combinations
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.models.block_chain import Transaction
+from app.services.explorer import transaction_query
+
+SAMPLES = {
+    "transaction_type": "donation",
+    "start": datetime(2026, 1, 1),
+    "end": datetime(2026, 2, 1),
+    "min_amount": 1.0,
+    "max_amount": 100.0,
+    "from_block": 10,
+    "to_block": 20,
+    "after": (15, 100),
+}
+# 路由在不带区块范围时以链头为 to_block，因此“无筛选”由 ("to_block",) 覆盖；
+# 时间 / 金额的单侧边界由 transaction_query 补齐另一侧
+GROUPS = [
+    ("transaction_type",),
+    ("start", "end"),
+    ("start",),
+    ("end",),
+    ("min_amount", "max_amount"),
+    ("min_amount",),
+    ("max_amount",),
+    ("from_block", "to_block"),
+    ("from_block",),
+    ("to_block",),
+]
+COMBINATIONS = sorted({
+    tuple(sorted({name for group in combo for name in group}) + extra)
+    for size in range(1, 4)
+    for combo in combinations(GROUPS, size)
+    for extra in ([], ["after"])
+})
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://")
+    Transaction.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("names", COMBINATIONS, ids=lambda names: "+".join(names))
+def test_transaction_filters_use_an_index(engine, names):
+    """EXPLAIN QUERY PLAN 中出现 SCAN 即失败：SCAN ... USING INDEX 同样是整张索引的遍历，
+    只有 SEARCH 才算按筛选条件定位"""
+    filters = {name: SAMPLES[name] for name in names}
+    compiled = transaction_query(**filters).limit(20).compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        plan = [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+    assert not any(line.startswith("SCAN") for line in plan), plan
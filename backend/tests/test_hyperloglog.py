@@ -0,0 +1,38 @@
+import math
+import random
+
+import pytest
+
+from app.core.hyperloglog import DEFAULT_PRECISION, HyperLogLog
+
+# 相对标准误差约为 1.04 / sqrt(m)，估计应落在 3 sigma 以内
+BOUND = 3 * 1.04 / math.sqrt(1 << DEFAULT_PRECISION)
+
+
+@pytest.mark.parametrize("exact", [10, 100, 1000, 10000, 100000])
+def test_estimate_within_error_bound(exact):
+    rng = random.Random(exact)
+    ids = rng.sample(range(10 ** 9), exact)
+    sketch = HyperLogLog()
+    # 每个元素重复加入多次，模拟同一捐赠者多次捐赠
+    for donor_id in ids * 3:
+        sketch.add(donor_id)
+
+    estimate = HyperLogLog.from_bytes(sketch.to_bytes()).count()
+    assert abs(estimate - exact) / exact <= BOUND
+
+
+def test_merge_is_union():
+    half_a, half_b = HyperLogLog(), HyperLogLog()
+    half_a.update(range(0, 6000))
+    half_b.update(range(4000, 10000))
+    merged = HyperLogLog().merge(half_a).merge(half_b)
+    assert abs(merged.count() - 10000) / 10000 <= BOUND
+
+
+def test_serialization_round_trip():
+    sketch = HyperLogLog()
+    sketch.update(range(500))
+    restored = HyperLogLog.from_bytes(sketch.to_bytes())
+    assert restored.count() == sketch.count()
+    assert HyperLogLog.from_bytes(None).count() == 0
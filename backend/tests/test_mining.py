@@ -0,0 +1,52 @@
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models.block_chain import Block, Transaction, TransactionPool
+from app.services import mining
+from app.services.chain_state import chain_tip
+from app.services.search import explorer_search
+
+ADDRESS = "ab" * 20
+
+
+def _boom(*args, **kwargs):
+    raise RuntimeError("boom")
+
+
+def test_post_commit_failures_do_not_report_a_committed_block_as_failed(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "blockchain_difficulty", 1)
+    monkeypatch.setattr(mining, "publish_block_mined", _boom)
+    monkeypatch.setattr(explorer_search, "on_block_mined", _boom)
+    monkeypatch.setattr(explorer_search, "checked_at", 123.0)
+    monkeypatch.setattr(chain_tip, "on_pool_removed", _boom)
+    monkeypatch.setattr(chain_tip, "stale", False)
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'mining.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add(TransactionPool(transaction_hash="cd" * 32, from_address=ADDRESS, to_address=ADDRESS,
+                                   amount=1.0, gas_fee=0.1, data={"tx_type": "transfer"}, priority_score=1.0))
+            await db.commit()
+
+        async with AsyncSession(engine) as db:
+            result = await mining.MiningService(db).mine_block(ADDRESS)
+
+        async with AsyncSession(engine) as db:
+            blocks = (await db.execute(select(func.count()).select_from(Block))).scalar()
+            transactions = (await db.execute(select(func.count()).select_from(Transaction))).scalar()
+        await engine.dispose()
+        return result, blocks, transactions
+
+    result, blocks, transactions = asyncio.run(run())
+    assert result.success and result.transactions_count == 1
+    # 创世区块 + 新区块
+    assert (blocks, transactions) == (2, 1)
+    # 失败的增量更新让对应缓存失效，下次读取时重新加载
+    assert chain_tip.stale
+    assert explorer_search.checked_at == 0.0
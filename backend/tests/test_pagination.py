@@ -0,0 +1,111 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, event, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.core import pagination
+from app.core.config import settings
+from app.core.pagination import count_rows, decode_cursor, encode_cursor, paginate
+
+metadata = MetaData()
+items = Table(
+    "items", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(32), nullable=False),
+)
+
+ROWS = 250
+
+
+async def _setup():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(items.insert(), [{"id": i, "name": f"item-{i}"} for i in range(1, ROWS + 1)])
+
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return engine, statements
+
+
+def test_paginate_counts_in_sql_and_loads_only_the_page(monkeypatch):
+    async def run():
+        engine, statements = await _setup()
+        async with AsyncSession(engine) as db:
+            page, total = await paginate(db, select(items.c.id), 3, 20, items.c.id)
+        await engine.dispose()
+        return page, total, statements
+
+    monkeypatch.setattr(settings, "count_cache_threshold", 10 ** 9)
+    page, total, statements = asyncio.run(run())
+
+    assert total == ROWS
+    assert page == list(range(41, 61))
+    # 总数由数据库端 COUNT 得出，取页只有一条带 LIMIT 的查询，没有不带 LIMIT 的整表读取
+    assert len(statements) == 2
+    assert "count(*)" in statements[0].lower()
+    assert "limit" in statements[1].lower()
+
+
+def test_count_rows_caches_large_totals(monkeypatch):
+    async def run():
+        engine, statements = await _setup()
+        async with AsyncSession(engine) as db:
+            large = select(items).where(items.c.id > 0)
+            small = select(items).where(items.c.id <= 5)
+            results = [
+                await count_rows(db, large),
+                await count_rows(db, large),
+                await count_rows(db, small),
+                await count_rows(db, small),
+            ]
+        await engine.dispose()
+        return results, statements
+
+    monkeypatch.setattr(pagination, "_count_cache", pagination.LRUCache(maxsize=16))
+    monkeypatch.setattr(settings, "count_cache_threshold", 100)
+    results, statements = asyncio.run(run())
+
+    assert results == [ROWS, ROWS, 5, 5]
+    # 达到阈值的总数第二次命中缓存，未达阈值的每次都重新 COUNT
+    assert len(statements) == 3
+
+
+def _raw_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 19, 12, 30, 5)
+    cursor = encode_cursor([created_at, 42])
+    assert decode_cursor(cursor, (datetime, int)) == [created_at, 42]
+
+
+@pytest.mark.parametrize("payload, types", [
+    ([{"a": 1}], (int,)),
+    (["12"], (int,)),
+    ([True], (int,)),
+    ([1.5], (int,)),
+    ([{"dt": "not-a-date"}, 1], (datetime, int)),
+    ([{"dt": 1}, 1], (datetime, int)),
+    ([1, 1], (datetime, int)),
+    ([1], (int, int)),
+    ({"dt": "2026-10-19T00:00:00"}, (datetime,)),
+])
+def test_decode_cursor_rejects_mistyped_values(payload, types):
+    with pytest.raises(ValueError):
+        decode_cursor(_raw_cursor(payload), types)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("!!!not-base64", (int,))
@@ -0,0 +1,57 @@
+import importlib
+
+import pytest
+import sqlalchemy as sa
+
+from app.core.payload_codec import Payload, decode_payload, encode_payload, payload_text
+
+
+@pytest.mark.parametrize("value", [
+    {"project_id": 1, "note": "捐赠"},
+    [1, 2, 3],
+    '{"project_id": 1}',
+    {"blob": "x" * 4096},
+])
+def test_round_trip(value):
+    expected = decode_payload(value)
+    assert Payload(encode_payload(value)).value == expected
+
+
+def test_non_json_text_is_stored_as_a_string():
+    payload = Payload(encode_payload("plain note"))
+    assert payload.value == "plain note"
+    assert payload_text(payload) == '"plain note"'
+    assert decode_payload("plain note") == "plain note"
+
+
+def test_migration_converts_each_batch_with_one_executemany(monkeypatch):
+    pytest.importorskip("alembic")
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+
+    migration = importlib.import_module("migrations.versions.b8d0f2a40049_encoded_transaction_payloads")
+    monkeypatch.setattr(migration, "BATCH_SIZE", 10)
+    engine = sa.create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(sa.text("CREATE TABLE transactions (id INTEGER PRIMARY KEY, data TEXT)"))
+        conn.execute(
+            sa.text("INSERT INTO transactions (id, data) VALUES (:id, :data)"),
+            [{"id": i, "data": '{"n": %d}' % i if i % 7 else "not json"} for i in range(1, 26)],
+        )
+
+        updates = []
+
+        @sa.event.listens_for(conn, "before_cursor_execute")
+        def record(conn_, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE"):
+                updates.append(executemany)
+
+        with Operations.context(MigrationContext.configure(conn)):
+            migration._convert("transactions", sa.Text(), sa.LargeBinary(),
+                               lambda data: encode_payload(data) if data else None)
+
+        rows = conn.execute(sa.text("SELECT id, data FROM transactions ORDER BY id")).all()
+
+    assert updates == [True, True, True]
+    for row_id, data in rows:
+        assert Payload(data).value == ({"n": row_id} if row_id % 7 else "not json")
@@ -0,0 +1,99 @@
+import asyncio
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.db.models.block_chain import Transaction, TransactionPool
+from app.db.models.donation import Donation, TransactionStatus
+from app.db.models.donation_stats import DonationStat
+from app.db.models.donor_sketch import DonorSketch
+from app.db.models.projects import Project, ProjectStatus
+from app.services.donation import DonationService
+from app.services.replay import ReplayService
+
+TABLES = [Project, Donation, Transaction, TransactionPool, DonationStat, DonorSketch]
+ADDRESS = "ab" * 20
+
+
+def _hash(n):
+    return f"{n:064x}"
+
+
+def _transaction(n, block_number, transaction_type="donation", amount=0.0, data=None):
+    return Transaction(
+        transaction_hash=_hash(n), from_address=ADDRESS, to_address=ADDRESS, amount=amount,
+        transaction_type=transaction_type, block_hash=_hash(1000 + block_number),
+        block_number=block_number, gas_fee=0.0, data=data, is_confirmed=True,
+    )
+
+
+async def _seed(db):
+    db.add(Project(id=1, title="p", description="d", target_amount=100.0, creator_id=1,
+                   status=ProjectStatus.ON_CHAIN.value, blockchain_tx_hash=_hash(1),
+                   # 17 = 链上捐赠 10 + 链上不存在的捐赠 7
+                   current_amount=17.0))
+    db.add(_transaction(1, 1, "project_creation", data={"project_id": 1}))
+    db.add(_transaction(2, 2, amount=10.0))
+    db.add_all([
+        Donation(id=1, amount=10.0, donor_id=1, project_id=1, transaction_hash=_hash(2),
+                 status=TransactionStatus.CONFIRMED.value, block_hash=_hash(1002), block_number=2),
+        # 标记为已确认但链上没有交易：回放应改为 failed
+        Donation(id=2, amount=7.0, donor_id=2, project_id=1, transaction_hash=_hash(3),
+                 status=TransactionStatus.CONFIRMED.value, block_hash=_hash(1002), block_number=2),
+        # 仍在交易池：回放期间被打包进区块 3
+        Donation(id=3, amount=5.0, donor_id=3, project_id=1, transaction_hash=_hash(4),
+                 status=TransactionStatus.IN_POOL.value),
+    ])
+    db.add(TransactionPool(transaction_hash=_hash(4), from_address=ADDRESS, to_address=ADDRESS,
+                           amount=5.0, gas_fee=0.0, priority_score=1.0))
+    await db.commit()
+
+
+async def _mine_block_3(engine):
+    """与 MiningService 相同的写入：交易落库、移出交易池、确认捐赠并累加项目金额"""
+    async with AsyncSession(engine) as db:
+        db.add(_transaction(4, 3, amount=5.0))
+        await db.execute(delete(TransactionPool).where(TransactionPool.transaction_hash == _hash(4)))
+        await DonationService(db).confirm_block_donations([_hash(4)], _hash(1003), 3)
+        await db.commit()
+
+
+def test_apply_keeps_blocks_mined_after_the_scan(tmp_path, monkeypatch):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replay.db'}")
+        async with engine.begin() as conn:
+            for model in TABLES:
+                await conn.run_sync(model.__table__.create)
+        async with AsyncSession(engine) as db:
+            await _seed(db)
+
+        build_projects = ReplayService._build_projects
+
+        async def mine_then_build(self, db):
+            # 扫描已结束、尚未计算期望状态与应用时出块
+            await _mine_block_3(engine)
+            await build_projects(self, db)
+
+        monkeypatch.setattr(ReplayService, "_build_projects", mine_then_build)
+        report = await ReplayService(engine).run(apply=True)
+
+        async with AsyncSession(engine) as db:
+            donations = {d.id: d for d in (await db.execute(select(Donation))).scalars().all()}
+            project = (await db.execute(select(Project))).scalar_one()
+            stat = (await db.execute(
+                select(DonationStat).where(DonationStat.project_id == 1)
+            )).scalar_one()
+        await engine.dispose()
+        return report, donations, project, stat
+
+    report, donations, project, stat = asyncio.run(run())
+
+    assert report["applied"] and report["scan_tip"] == 2
+    assert report["diff"]["donations_phantom"] == 1
+    assert donations[2].status == TransactionStatus.FAILED.value
+    # 区块 3 确认的捐赠不在扫描范围内，保持出块写入的结果
+    assert donations[3].status == TransactionStatus.CONFIRMED.value
+    assert donations[3].block_number == 3
+    assert project.current_amount == 15.0
+    assert project.status == ProjectStatus.ON_CHAIN.value
+    assert (stat.donation_count, stat.total_amount) == (2, 15.0)
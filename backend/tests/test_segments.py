@@ -0,0 +1,73 @@
+import hashlib
+
+import pytest
+
+from app.core.segments import KIND_BLOCK, KIND_TRANSACTION, SegmentStore
+
+SEGMENT_BLOCKS = 10
+SEGMENTS = 6
+
+
+def _hash(prefix: str, n: int) -> str:
+    return hashlib.sha256(f"{prefix}-{n}".encode()).hexdigest()
+
+
+def _record(number: int) -> dict:
+    return {
+        "header": {"block_number": number, "block_hash": _hash("block", number)},
+        "transactions": [
+            {"transaction_hash": _hash("tx", number * 10 + i), "block_number": number} for i in range(3)
+        ],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    writer = SegmentStore(str(tmp_path))
+    for i in range(SEGMENTS):
+        start = i * SEGMENT_BLOCKS
+        end = start + SEGMENT_BLOCKS - 1
+        writer.write_segment(start, end, [_record(n) for n in range(start, end + 1)])
+    writer.close()
+
+    store = SegmentStore(str(tmp_path), max_open=2)
+    yield store
+    store.close()
+
+
+def test_lookup_by_hash(store):
+    assert store.find_block_number(KIND_BLOCK, _hash("block", 37)) == 37
+    assert store.find_transaction(_hash("tx", 372))["block_number"] == 37
+    assert store.find_transaction(_hash("tx", 9999)) is None
+
+
+def test_bloom_filter_skips_other_segments(store):
+    # 只有目标段（以及极少数误判段）会被打开
+    store.find_block_number(KIND_TRANSACTION, _hash("tx", 51))
+    assert store.open_segments == 1
+
+    store.close()
+    assert store.find_block_number(KIND_TRANSACTION, _hash("tx", 99999)) is None
+    assert store.open_segments <= 1
+
+
+def test_open_segments_are_bounded(store):
+    records = list(store.iter_blocks())
+    assert [r["header"]["block_number"] for r in records] == list(range(SEGMENTS * SEGMENT_BLOCKS))
+    assert store.open_segments == 2
+
+    # 被淘汰关闭的段再次访问时重新打开
+    assert store.read_block(3)["header"]["block_hash"] == _hash("block", 3)
+    assert store.open_segments == 2
+
+
+def test_bloom_backfilled_for_old_segments(tmp_path):
+    writer = SegmentStore(str(tmp_path))
+    writer.write_segment(0, 9, [_record(n) for n in range(10)])
+    writer.close()
+    (tmp_path / "seg-0000000000.blm").unlink()
+
+    store = SegmentStore(str(tmp_path))
+    assert store.find_transaction(_hash("tx", 42))["block_number"] == 4
+    assert (tmp_path / "seg-0000000000.blm").exists()
+    store.close()
@@ -0,0 +1,131 @@
+import multiprocessing
+import uuid
+
+import pytest
+
+from app.core.shared_state import SharedChainState
+
+WRITERS = 3
+READERS = 3
+INCREMENTS = 300
+
+mp = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+pytestmark = pytest.mark.skipif(mp is None, reason="需要 fork 启动方式")
+
+
+def _block_state(number: int) -> dict:
+    # 文本字段与计数由同一个区块号派生，读到混合了两次写入的负载即可发现
+    return {
+        "total_blocks": number + 1,
+        "total_transactions": 0,
+        "pending_pool_size": 0,
+        "difficulty": 2,
+        "latest_block_number": number,
+        "latest_transactions_count": number % 7,
+        "latest_block_hash": f"{number:064x}",
+        "latest_previous_hash": f"{number - 1 if number else 0:064x}",
+        "latest_miner_address": "矿工-" + "x" * (number % 50),
+        "latest_timestamp": f"2026-10-19T00:00:{number % 60:02d}",
+    }
+
+
+def _writer(name: str, start) -> None:
+    shared = SharedChainState(name)
+    start.wait()
+
+    def apply(state):
+        number = state["latest_block_number"] + 1
+        total = state["total_transactions"]
+        state.update(_block_state(number))
+        state["total_transactions"] = total + 1
+
+    for _ in range(INCREMENTS):
+        shared.update(apply)
+    shared.close()
+
+
+def _reader(name: str, start, stop, errors) -> None:
+    shared = SharedChainState(name)
+    start.wait()
+    last_seq = 0
+    last_number = -1
+    reads = 0
+    while not stop.is_set() or reads == 0:
+        state = shared.read()
+        if state is None:
+            continue
+        reads += 1
+        number = state["latest_block_number"]
+        expected = _block_state(number)
+        torn = [k for k, v in expected.items() if k != "total_transactions" and state[k] != v]
+        if torn:
+            errors.put(f"torn read at block {number}: {torn}")
+            break
+        if state["seq"] < last_seq or number < last_number:
+            errors.put(f"stale read: seq {state['seq']} < {last_seq} or block {number} < {last_number}")
+            break
+        last_seq, last_number = state["seq"], number
+    shared.close()
+
+
+@pytest.fixture
+def shared():
+    state = SharedChainState(f"test_chain_{uuid.uuid4().hex[:12]}")
+    state.write(_block_state(0))
+    yield state
+    state.unlink()
+    state.close()
+
+
+def test_concurrent_writers_and_readers(shared):
+    start = mp.Event()
+    stop = mp.Event()
+    errors = mp.Queue()
+    name = shared.name.rsplit("_v", 1)[0]
+
+    writers = [mp.Process(target=_writer, args=(name, start)) for _ in range(WRITERS)]
+    readers = [mp.Process(target=_reader, args=(name, start, stop, errors)) for _ in range(READERS)]
+    for process in writers + readers:
+        process.start()
+    start.set()
+    for process in writers:
+        process.join(60)
+    stop.set()
+    for process in readers:
+        process.join(60)
+
+    messages = []
+    while not errors.empty():
+        messages.append(errors.get())
+    assert not messages, messages
+    assert all(process.exitcode == 0 for process in writers + readers)
+
+    # 每次增量都在写者锁内读-改-写，没有丢失的更新
+    state = shared.read()
+    assert state["total_transactions"] == WRITERS * INCREMENTS
+    assert state["latest_block_number"] == WRITERS * INCREMENTS
+    assert state["latest_block_hash"] == f"{WRITERS * INCREMENTS:064x}"
+
+
+def test_conditional_write_rejects_moved_seq(shared):
+    seen = shared.seq
+    shared.update(lambda state: state.update(pending_pool_size=state["pending_pool_size"] + 1))
+
+    # 预热读取数据库期间有其他写者发布，预热结果不能覆盖共享段
+    assert shared.write(_block_state(5), expected_seq=seen) is None
+    assert shared.read()["pending_pool_size"] == 1
+
+    assert shared.write(_block_state(5), expected_seq=shared.seq) is not None
+    assert shared.read()["latest_block_number"] == 5
+
+
+def test_text_fields_are_not_truncated(shared):
+    state = _block_state(1)
+    state["latest_miner_address"] = "地" * 64
+    shared.write(state)
+    assert shared.read()["latest_miner_address"] == "地" * 64
+
+    state["latest_block_hash"] = "a" * 257
+    with pytest.raises(ValueError):
+        shared.write(state)
+    assert shared.read()["latest_miner_address"] == "地" * 64
@@ -0,0 +1,7 @@
+import http from "./http";
+
+// 驾驶舱聚合数据：链头、捐赠统计、项目状态、交易池、最新区块 / 捐赠等一次返回
+export async function getDashboard() {
+  const { data } = await http.get("/api/v1/dashboard");
+  return data;
+}
@@ -0,0 +1,22 @@
+import http from "./http";
+
+export type ChainEventTopic = "tx_accepted" | "block_mined" | "donation_confirmed";
+
+// 订阅后端 SSE 事件流（/api/v1/events），返回取消订阅函数
+// 服务端断开慢消费者时会先发送 dropped 事件，EventSource 随后自动重连
+export function subscribeEvents(
+  handlers: Partial<Record<ChainEventTopic | "dropped", (data: any) => void>>,
+) {
+  const topics = Object.keys(handlers).filter((t) => t !== "dropped");
+  const url = new URL("/api/v1/events", http.defaults.baseURL);
+  if (topics.length) url.searchParams.set("topics", topics.join(","));
+
+  const source = new EventSource(url.toString());
+  for (const [topic, handler] of Object.entries(handlers)) {
+    if (!handler) continue;
+    source.addEventListener(topic, (e) => {
+      handler(JSON.parse((e as MessageEvent).data || "{}"));
+    });
+  }
+  return () => source.close();
+}